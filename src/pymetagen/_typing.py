@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import typing
 
-import pandas as pd
 import polars as pl
 from polars.datatypes import DataType, DataTypeClass
 
+if typing.TYPE_CHECKING:
+    import pandas as pd
+
 DataFrameT = typing.Union[pl.DataFrame, pl.LazyFrame]
 Any = typing.Any
 Hashable = typing.Hashable
 
-OptionalPandasDataFrame: typing.TypeAlias = typing.Optional[pd.DataFrame]
+OptionalPandasDataFrame: typing.TypeAlias = typing.Optional["pd.DataFrame"]
 OptionalAnyValueDict: typing.TypeAlias = typing.Optional[dict[Hashable, Any]]
 
 PolarsDataType: typing.TypeAlias = typing.Union["DataTypeClass", "DataType"]
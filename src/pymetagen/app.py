@@ -7,17 +7,34 @@ This module contains the CLI application for the metagen package.
 from __future__ import annotations
 
 import tempfile
+from collections.abc import Callable
 from pathlib import Path
 from pprint import pprint
+from typing import Any
 
 import click
 
 from pymetagen import MetaGen, __version__
+from pymetagen.batch import (
+    BATCH_INDEX_FILE_NAME,
+    BatchResult,
+    expand_inputs,
+    run_batch,
+)
+from pymetagen.catalog import DatasetProfile, build_catalog
 from pymetagen.datatypes import (
+    MetaGenExcelEngine,
+    MetaGenExecutionMode,
     MetaGenSupportedFileExtension,
     MetaGenSupportedLoadingMode,
 )
+from pymetagen.exceptions import FileTypeUnsupportedError
+from pymetagen.metadata_table import ColumnMetadata, iter_metadata_records
+from pymetagen.partition_index import PARTITION_INDEX_DIR_NAME, PartitionRange
+from pymetagen.profiling import MetaGenProfiler
+from pymetagen.result_cache import default_result_cache_dir
 from pymetagen.utils import InspectionMode, map_string_to_list_inspection_modes
+from pymetagen.workbook import profile_workbook, write_workbook_metadata
 
 
 @click.group(
@@ -29,6 +46,96 @@ def cli():
     data."""
 
 
+def _parse_partitions(
+    ctx: click.Context, param: click.Parameter, values: tuple[str, ...]
+) -> dict[str, list[str]]:
+    partitions: dict[str, list[str]] = {}
+    for value in values:
+        key, separator, partition_value = value.partition("=")
+        if not key or not separator:
+            raise click.BadParameter(
+                f"'{value}' is not of the form key=value."
+            )
+        partitions.setdefault(key, []).append(partition_value)
+    return partitions
+
+
+def _parse_partition_ranges(
+    ctx: click.Context, param: click.Parameter, values: tuple[str, ...]
+) -> dict[str, PartitionRange]:
+    partition_ranges: dict[str, PartitionRange] = {}
+    for value in values:
+        key, separator, bounds = value.partition("=")
+        low, colon, high = bounds.partition(":")
+        if not key or not separator or not colon:
+            raise click.BadParameter(
+                f"'{value}' is not of the form key=low:high."
+            )
+        if key in partition_ranges:
+            raise click.BadParameter(f"Several ranges of partition '{key}'.")
+        partition_ranges[key] = PartitionRange(low or None, high or None)
+    return partition_ranges
+
+
+def _partition_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Options selecting the hive partitions of a directory of partitioned
+    parquet files, see :func:`_selected_partitions`.
+    """
+    command = click.option(
+        "--partition-range",
+        type=click.STRING,
+        multiple=True,
+        callback=_parse_partition_ranges,
+        help=(
+            "(optional) Inclusive range of the values of a hive partition to"
+            " read, as key=low:high, e.g. date=2024-10-10:2024-10-16. Either"
+            " bound can be left out. Numeric bounds are compared as numbers,"
+            " other bounds as strings. Can be given several times."
+        ),
+    )(command)
+    return click.option(
+        "--partition",
+        type=click.STRING,
+        multiple=True,
+        callback=_parse_partitions,
+        help=(
+            "(optional) Hive partition of a directory of partitioned parquet"
+            " files to read, as key=value, e.g. country=FR. Can be given"
+            " several times, values of the same key are alternatives. The"
+            " files of the other partitions are never opened."
+        ),
+    )(command)
+
+
+def _metagen_from_path(**options: Any) -> MetaGen:
+    """
+    :meth:`pymetagen.MetaGen.from_path`, reporting invalid options, e.g. an
+    unknown partition, as usage errors.
+    """
+    try:
+        return MetaGen.from_path(**options)
+    except ValueError as error:
+        raise click.UsageError(str(error))
+
+
+def _selected_partitions(
+    partition: dict[str, list[str]],
+    partition_range: dict[str, PartitionRange],
+) -> dict[str, Any] | None:
+    """
+    Partitions selected by the --partition and --partition-range options, see
+    :func:`pymetagen.partition_index.partition_filter`.
+    """
+    both = sorted(partition.keys() & partition_range.keys())
+    if both:
+        raise click.UsageError(
+            f"Partitions {both} are given by both --partition and"
+            " --partition-range."
+        )
+    return {**partition, **partition_range} or None
+
+
 @click.command(
     "metadata", context_settings={"help_option_names": ["-h", "--help"]}
 )
@@ -43,7 +150,11 @@ def cli():
         readable=True,
     ),
     required=True,
-    help="Input file path. Can be of type: .csv, .parquet, .xlsx, .json",
+    help=(
+        "Input file path. Can be of type: .csv, .parquet, .xlsx, .json,"
+        " .ndjson, .jsonl, and CSV compressed with gzip, zstd, bz2 or xz,"
+        " e.g. .csv.gz"
+    ),
 )
 @click.option(
     "-o",
@@ -79,6 +190,39 @@ def cli():
     required=False,
     help="(optional) Whether to use lazy or eager mode. Defaults to lazy.",
 )
+@click.option(
+    "--infer-schema-length",
+    type=click.IntRange(min=1),
+    default=100,
+    required=False,
+    help=(
+        "(optional) Number of rows of CSV and JSON input files read to infer"
+        " the data types of their columns. Defaults to 100."
+    ),
+)
+@click.option(
+    "--excel-engine",
+    type=click.Choice(MetaGenExcelEngine.values(), case_sensitive=False),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Engine reading Excel input files. Defaults to calamine if"
+        " the fastexcel package is installed, otherwise openpyxl."
+    ),
+)
+@click.option(
+    "--all-sheets",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Compute the metadata of every sheet of an Excel"
+        " input file, in parallel, instead of the first sheet only. The"
+        " metadata of each sheet is written to its own worksheet of an .xlsx"
+        " output, or to its own file, suffixed by the sheet name, in the"
+        " other formats. Defaults to False."
+    ),
+)
 @click.option(
     "-xfmt",
     "--extra-formats",
@@ -120,69 +264,404 @@ def cli():
     is_flag=True,
     help=("(optional flag) in force descriptions for all columns."),
 )
+@click.option(
+    "-x",
+    "--execution",
+    type=click.Choice(MetaGenExecutionMode.values(), case_sensitive=False),
+    callback=lambda ctx, param, value: value.lower(),
+    default=MetaGenExecutionMode.SEQUENTIAL.value,
+    required=False,
+    help=(
+        "(optional) Whether to compute each metric with its own query"
+        " (sequential), all metrics in a single query over the data (fused) or"
+        " one query per column collected in parallel batches (batched), one"
+        " query per batch of columns of the same data type for tables with"
+        " thousands of columns (wide), or by merging the statistics of chunks"
+        " of the data read one at a time (streaming). For parquet files, min,"
+        " max and number of nulls can be read from the file footers only"
+        " (footer). Defaults to sequential."
+    ),
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=32,
+    required=False,
+    help=(
+        "(optional) Number of column queries collected together in the"
+        " batched and wide execution modes. Defaults to 32."
+    ),
+)
+@click.option(
+    "--column-batch-size",
+    type=click.IntRange(min=1),
+    default=1024,
+    required=False,
+    help=(
+        "(optional) Number of columns of the same data type computed by a"
+        " single query in the wide execution mode. Defaults to 1024."
+    ),
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=100_000,
+    required=False,
+    help=(
+        "(optional) Number of rows read at a time in the streaming execution"
+        " mode. Defaults to 100000."
+    ),
+)
+@click.option(
+    "--approx-unique",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Estimate the number of unique values with a"
+        " HyperLogLog sketch instead of counting them exactly. The metadata"
+        " column is then named '# unique (approx)'. Defaults to False."
+    ),
+)
+@click.option(
+    "--approx-unique-error",
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    default=0.01,
+    required=False,
+    help=(
+        "(optional) Relative standard error of the approximate number of"
+        " unique values. Defaults to 0.01."
+    ),
+)
+@click.option(
+    "--quantiles",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Add the 25%, 50%, 75%, 95% and 99% quantiles of the"
+        " numeric columns, estimated with a KLL sketch. Defaults to False."
+    ),
+)
+@click.option(
+    "--quantile-error",
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    default=0.01,
+    required=False,
+    help=(
+        "(optional) Rank error of the estimated quantiles. Defaults to 0.01."
+    ),
+)
+@click.option(
+    "--max-unique-values",
+    type=click.IntRange(min=1),
+    default=10,
+    required=False,
+    help=(
+        "(optional) Unique values of a column are listed in the metadata only"
+        " when there are fewer than this number of them. Defaults to 10."
+    ),
+)
+@click.option(
+    "--stats-cache",
+    type=click.Path(
+        file_okay=True, dir_okay=False, path_type=Path, writable=True
+    ),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Path of a sidecar cache of the partial statistics of"
+        " every input file, used by the streaming execution mode. Only the"
+        " files that are new or have changed since the last run are read."
+    ),
+)
+@click.option(
+    "--sample-rows",
+    type=click.IntRange(min=1),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Compute the metadata on a random sample of this number"
+        " of rows. Counts are scaled to the whole data and reported with"
+        " their 95% confidence intervals."
+    ),
+)
+@click.option(
+    "--sample-fraction",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Compute the metadata on a random sample of this fraction"
+        " of the rows. Counts are scaled to the whole data and reported with"
+        " their 95% confidence intervals."
+    ),
+)
+@click.option(
+    "--random-seed",
+    type=click.INT,
+    default=None,
+    required=False,
+    help=(
+        "(optional) Seed for the random number generator when the metadata"
+        " is computed on a sample. Defaults to None."
+    ),
+)
+@click.option(
+    "--columns",
+    type=click.STRING,
+    multiple=True,
+    help=(
+        "(optional) Column to compute the metadata of, can be given several"
+        " times. Globs, e.g. 'price_*', and regular expressions starting with"
+        " '^' and ending with '$' are allowed. Only these columns are read."
+        " Defaults to all columns."
+    ),
+)
+@click.option(
+    "--metrics",
+    type=click.STRING,
+    multiple=True,
+    help=(
+        "(optional) Metric to compute, named as its metadata column, e.g."
+        " '# nulls', can be given several times. Defaults to all metrics."
+    ),
+)
+@click.option(
+    "--no-cache",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Always compute the metadata instead of returning the"
+        " metadata cached by a previous run on unchanged input with the same"
+        " options, and list the files of a directory of partitioned parquet"
+        " files again instead of refreshing its cached partition index. The"
+        " cache directory is $PYMETAGEN_CACHE_DIR, or pymetagen in the user"
+        " cache directory. Defaults to False."
+    ),
+)
+@click.option(
+    "--hash-content",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Identify unchanged input by the hash of its content"
+        " instead of its size and modification time. Defaults to False."
+    ),
+)
+@click.option(
+    "--profile",
+    type=click.Path(
+        file_okay=True, dir_okay=False, path_type=Path, writable=True
+    ),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Path of a JSON file to write the profile of the metadata"
+        " computation to: the wall time, rows scanned, peak memory of the"
+        " process so far and query plan of every metric and column. Disables"
+        " the metadata cache."
+    ),
+)
+@_partition_options
 def metadata(
     input: Path,
     output: Path | None,
     descriptions: Path | None,
     loading_mode: MetaGenSupportedLoadingMode,
+    infer_schema_length: int,
+    excel_engine: str | None,
+    all_sheets: bool,
     extra_formats: str | None,
     show_descriptions: bool,
     preview: bool,
     warning_description: bool,
+    execution: MetaGenExecutionMode,
+    batch_size: int,
+    column_batch_size: int,
+    chunk_size: int,
+    approx_unique: bool,
+    approx_unique_error: float,
+    quantiles: bool,
+    quantile_error: float,
+    max_unique_values: int,
+    stats_cache: Path | None,
+    sample_rows: int | None,
+    sample_fraction: float | None,
+    random_seed: int | None,
+    columns: tuple[str, ...],
+    metrics: tuple[str, ...],
+    no_cache: bool,
+    hash_content: bool,
+    profile: Path | None,
+    partition: dict[str, list[str]],
+    partition_range: dict[str, PartitionRange],
 ) -> None:
     """
     A tool to generate metadata for tabular data.
     """
+    if sample_rows is not None and sample_fraction is not None:
+        raise click.UsageError(
+            "--sample-rows and --sample-fraction are mutually exclusive."
+        )
+    if all_sheets:
+        _workbook_metadata(
+            input,
+            output,
+            excel_engine=excel_engine,
+            unsupported_options={
+                "--descriptions": descriptions,
+                "--extra-formats": extra_formats,
+                "--preview": preview,
+                "--stats-cache": stats_cache,
+                "--profile": profile,
+                "--partition": partition,
+                "--partition-range": partition_range,
+            },
+            execution=MetaGenExecutionMode(execution),
+            batch_size=batch_size,
+            column_batch_size=column_batch_size,
+            chunk_size=chunk_size,
+            approx_unique=approx_unique,
+            approx_unique_error=approx_unique_error,
+            quantiles=quantiles,
+            quantile_error=quantile_error,
+            max_number_of_unique_to_show=max_unique_values,
+            sample=sample_rows if sample_rows is not None else sample_fraction,
+            random_seed=random_seed,
+            columns=columns or None,
+            metrics=metrics or None,
+        )
+        return
+    profiler = MetaGenProfiler() if profile is not None else None
+    # printed metadata is shown column by column as soon as it is computed
+    progressive = output is None and not preview
     click.echo(f"Generating metadata for {input}...")
-    metagen = MetaGen.from_path(
+    metagen = _metagen_from_path(
         path=input,
         descriptions_path=descriptions,
         loading_mode=loading_mode,
-        compute_metadata=True,
+        compute_metadata=not progressive,
+        execution=MetaGenExecutionMode(execution),
+        batch_size=batch_size,
+        column_batch_size=column_batch_size,
+        chunk_size=chunk_size,
+        approx_unique=approx_unique,
+        approx_unique_error=approx_unique_error,
+        quantiles=quantiles,
+        quantile_error=quantile_error,
+        max_number_of_unique_to_show=max_unique_values,
+        stats_cache_path=stats_cache,
+        sample=sample_rows if sample_rows is not None else sample_fraction,
+        random_seed=random_seed,
+        columns=columns or None,
+        metrics=metrics or None,
+        result_cache_dir=(
+            None
+            if no_cache or profiler is not None
+            else default_result_cache_dir()
+        ),
+        hash_content=hash_content,
+        profiler=profiler,
+        infer_schema_length=infer_schema_length,
+        excel_engine=excel_engine,
+        partition_index_dir=(
+            None
+            if no_cache
+            else default_result_cache_dir() / PARTITION_INDEX_DIR_NAME
+        ),
+        partitions=_selected_partitions(partition, partition_range),
     )
-    metadata_by_output_format = metagen.metadata_by_output_format()
+    column_descriptions: dict[str, str] = {}
+    if progressive:
+        click.echo("Metadata:")
+        for record in metagen.iter_column_metadata():
+            click.echo(_format_column_metadata(record))
+            column_descriptions[record.name] = record.description
+    else:
+        column_descriptions = dict(
+            metagen._polars_metadata.select("Name", "Description").iter_rows()
+        )
+    if profiler is not None and profile is not None:
+        profiler.write(profile)
+        click.echo(f"Profile written to {profile}")
     if preview:
         click.echo(f"Opening Quick Look Preview for file: {input}")
         with tempfile.TemporaryDirectory() as tmpdirname:
             output = Path(tmpdirname) / f"{input.stem}-extract.csv"
             metagen.write_metadata(outpath=output)
             metagen.quick_look_preview(output)
-    elif output is None:
-        click.echo("Metadata:")
-        metagen.inspect_data(
-            data=metagen._polars_metadata,
-            tbl_cols=200,
-            tbl_rows=200,
-        )
-    elif extra_formats:
+    elif output is not None and extra_formats:
         splitted_formats = extra_formats.split(",")
         if output.suffix not in splitted_formats:
             splitted_formats.append(output.suffix)
         for output_format in splitted_formats:
             outpath = output.with_suffix(output_format)
-            metagen.write_metadata(
-                outpath=outpath,
-                metadata=metadata_by_output_format[output_format],
-            )
-    else:
+            metagen.write_metadata(outpath=outpath)
+    elif output is not None:
         metagen.write_metadata(outpath=output)
 
     if show_descriptions:
         click.echo("Column descriptions:")
-        pprint(
-            metagen._metadata[["Name", "Description"]]
-            .set_index("Name")
-            .to_dict()["Description"]
-        )
+        pprint(column_descriptions)
     if warning_description:
         message = (
             "Columns without descriptions: "
-            f"{metagen._metadata[metagen._metadata['Description'] == '']['Name'].to_list()}"
+            f"{[name for name, description in column_descriptions.items() if description == '']}"
             "Please add descriptions"
         )
         raise click.ClickException(message=message)
 
 
+def _workbook_metadata(
+    input: Path,
+    output: Path | None,
+    excel_engine: str | None,
+    unsupported_options: dict[str, object],
+    **options: Any,
+) -> None:
+    """
+    Compute the metadata of every sheet of an Excel file, and print or write
+    them.
+    """
+    used_options = [
+        option for option, value in unsupported_options.items() if value
+    ]
+    if used_options:
+        raise click.UsageError(
+            f"--all-sheets cannot be used with {', '.join(used_options)}."
+        )
+    click.echo(f"Generating metadata for every sheet of {input}...")
+    try:
+        metagens = profile_workbook(
+            input, excel_engine=excel_engine, **options
+        )
+    except FileTypeUnsupportedError as error:
+        raise click.UsageError(str(error))
+    if output is None:
+        for sheet_name, metagen in metagens.items():
+            click.echo(f"Metadata of sheet {sheet_name}:")
+            for record in iter_metadata_records(metagen._polars_metadata):
+                click.echo(_format_column_metadata(record))
+        return
+    for path in write_workbook_metadata(metagens, output):
+        click.echo(f"Metadata written to {path}")
+
+
+def _format_column_metadata(record: ColumnMetadata) -> str:
+    """
+    Metadata of a column on a single line, leaving out empty values.
+    """
+    values = ", ".join(
+        f"{key}: {value}"
+        for key, value in record.metadata.items()
+        if value is not None and value != ""
+    )
+    return f"{record.name} - {values}"
+
+
 @click.command(
     "inspect", context_settings={"help_option_names": ["-h", "--help"]}
 )
@@ -196,7 +675,11 @@ def metadata(
         readable=True,
     ),
     required=True,
-    help="Input file path. Can be of type: .csv, .parquet, .xlsx, .json",
+    help=(
+        "Input file path. Can be of type: .csv, .parquet, .xlsx, .json,"
+        " .ndjson, .jsonl, and CSV compressed with gzip, zstd, bz2 or xz,"
+        " e.g. .csv.gz"
+    ),
 )
 @click.option(
     "-o",
@@ -278,6 +761,7 @@ def metadata(
         " sample inspect mode option is activated. Defaults to False."
     ),
 )
+@_partition_options
 def inspect(
     input: Path,
     output: Path | None,
@@ -288,11 +772,17 @@ def inspect(
     inspection_mode: InspectionMode,
     random_seed: int,
     with_replacement: bool,
+    partition: dict[str, list[str]],
+    partition_range: dict[str, PartitionRange],
 ) -> None:
     """
     A tool to inspect a data set.
     """
-    metagen = MetaGen.from_path(path=input, loading_mode=loading_mode)
+    metagen = _metagen_from_path(
+        path=input,
+        loading_mode=loading_mode,
+        partitions=_selected_partitions(partition, partition_range),
+    )
     columns_length = metagen.columns_length
     metagen.extract_data(
         tbl_rows=number_rows,
@@ -332,7 +822,11 @@ def inspect(
         readable=True,
     ),
     required=True,
-    help="Input file path. Can be of type: .csv, .parquet, .xlsx, .json",
+    help=(
+        "Input file path. Can be of type: .csv, .parquet, .xlsx, .json,"
+        " .ndjson, .jsonl, and CSV compressed with gzip, zstd, bz2 or xz,"
+        " e.g. .csv.gz"
+    ),
 )
 @click.option(
     "-o",
@@ -403,6 +897,7 @@ def inspect(
         " head, tail, sample."
     ),
 )
+@_partition_options
 def extracts(
     input: Path,
     output: Path,
@@ -412,12 +907,18 @@ def extracts(
     with_replacement: bool,
     extra_formats: str | None,
     ignore_inspection_modes: str | None,
+    partition: dict[str, list[str]],
+    partition_range: dict[str, PartitionRange],
 ) -> None:
     """
     A tool to extract n number of rows from a data set. It can extract
     head, tail, random sample at the same time.
     """
-    metagen = MetaGen.from_path(path=input, loading_mode=loading_mode)
+    metagen = _metagen_from_path(
+        path=input,
+        loading_mode=loading_mode,
+        partitions=_selected_partitions(partition, partition_range),
+    )
     inspection_modes = map_string_to_list_inspection_modes(
         ignore_inspection_modes
     )
@@ -456,7 +957,11 @@ def extracts(
         readable=True,
     ),
     required=True,
-    help="Input file path. Can be of type: .csv, .parquet, .xlsx, .json",
+    help=(
+        "Input file path. Can be of type: .csv, .parquet, .xlsx, .json,"
+        " .ndjson, .jsonl, and CSV compressed with gzip, zstd, bz2 or xz,"
+        " e.g. .csv.gz"
+    ),
 )
 @click.option(
     "-t",
@@ -508,6 +1013,7 @@ def extracts(
         " Only works for OS operating systems). Defaults to False."
     ),
 )
+@_partition_options
 def filter(
     input: Path,
     table_name: str | None,
@@ -516,11 +1022,17 @@ def filter(
     loading_mode: MetaGenSupportedLoadingMode,
     eager: bool,
     preview: bool,
+    partition: dict[str, list[str]],
+    partition_range: dict[str, PartitionRange],
 ) -> None:
     """
     A tool to filter a data set.
     """
-    metagen = MetaGen.from_path(path=input, loading_mode=loading_mode)
+    metagen = _metagen_from_path(
+        path=input,
+        loading_mode=loading_mode,
+        partitions=_selected_partitions(partition, partition_range),
+    )
     table_name = table_name or input.stem
     metagen.filter_data(table_name, query, eager=eager)
     if output:
@@ -538,10 +1050,361 @@ def filter(
         metagen.inspect_data()
 
 
+@click.command(
+    "batch", context_settings={"help_option_names": ["-h", "--help"]}
+)
+@click.option(
+    "-i",
+    "--input",
+    "inputs",
+    type=click.STRING,
+    multiple=True,
+    help=(
+        "Input file path or glob pattern, e.g. 'drops/**/*.csv', can be given"
+        " several times."
+    ),
+)
+@click.option(
+    "--input-list",
+    type=click.Path(
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        path_type=Path,
+        readable=True,
+    ),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Path of a text file with one input file path or glob"
+        " pattern per line."
+    ),
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(
+        file_okay=False, dir_okay=True, path_type=Path, writable=True
+    ),
+    required=True,
+    help=(
+        "Output directory of the metadata files, one per input, and of their"
+        f" index, {BATCH_INDEX_FILE_NAME}."
+    ),
+)
+@click.option(
+    "-f",
+    "--format",
+    "output_format",
+    type=click.Choice(
+        [".csv", ".json", ".parquet", ".xlsx"], case_sensitive=False
+    ),
+    default=MetaGenSupportedFileExtension.JSON.value,
+    required=False,
+    help="(optional) Format of the metadata files. Defaults to .json.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Number of input files profiled in parallel, each by its"
+        " own process. Defaults to the number of cores."
+    ),
+)
+@click.option(
+    "--threads-per-worker",
+    type=click.IntRange(min=1),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Number of Polars threads of each worker process. Defaults"
+        " to the number of cores divided by the number of workers."
+    ),
+)
+@click.option(
+    "-m",
+    "--loading-mode",
+    type=click.Choice(["lazy", "eager"], case_sensitive=False),
+    callback=lambda ctx, param, value: value.lower(),
+    default="lazy",
+    required=False,
+    help="(optional) Whether to use lazy or eager mode. Defaults to lazy.",
+)
+@click.option(
+    "-x",
+    "--execution",
+    type=click.Choice(MetaGenExecutionMode.values(), case_sensitive=False),
+    callback=lambda ctx, param, value: value.lower(),
+    default=MetaGenExecutionMode.SEQUENTIAL.value,
+    required=False,
+    help=(
+        "(optional) Execution mode of the metadata computation of every"
+        " input, see the metadata command. Defaults to sequential."
+    ),
+)
+@click.option(
+    "--approx-unique",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Estimate the number of unique values with a"
+        " HyperLogLog sketch instead of counting them exactly. Defaults to"
+        " False."
+    ),
+)
+@click.option(
+    "--quantiles",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Add the 25%, 50%, 75%, 95% and 99% quantiles of the"
+        " numeric columns, estimated with a KLL sketch. Defaults to False."
+    ),
+)
+@click.option(
+    "--max-unique-values",
+    type=click.IntRange(min=1),
+    default=10,
+    required=False,
+    help=(
+        "(optional) Unique values of a column are listed in the metadata only"
+        " when there are fewer than this number of them. Defaults to 10."
+    ),
+)
+@click.option(
+    "--no-cache",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Always compute the metadata instead of returning the"
+        " metadata cached by a previous run on unchanged input with the same"
+        " options, and list the files of directories of partitioned parquet"
+        " files again instead of refreshing their cached partition indexes."
+        " Defaults to False."
+    ),
+)
+def batch(
+    inputs: tuple[str, ...],
+    input_list: Path | None,
+    output_dir: Path,
+    output_format: str,
+    workers: int | None,
+    threads_per_worker: int | None,
+    loading_mode: MetaGenSupportedLoadingMode,
+    execution: MetaGenExecutionMode,
+    approx_unique: bool,
+    quantiles: bool,
+    max_unique_values: int,
+    no_cache: bool,
+) -> None:
+    """
+    A tool to generate the metadata of many files in parallel.
+    """
+    paths = expand_inputs(inputs, input_list)
+    if not paths:
+        raise click.UsageError("No input files, give --input or --input-list.")
+
+    def echo_result(result: BatchResult) -> None:
+        if result.error is None:
+            click.echo(f"{result.input} -> {result.output}")
+        else:
+            click.echo(f"{result.input} failed: {result.error}", err=True)
+
+    click.echo(f"Generating metadata for {len(paths)} files...")
+    try:
+        results = run_batch(
+            paths,
+            output_dir,
+            output_format=output_format,
+            workers=workers,
+            threads_per_worker=threads_per_worker,
+            callback=echo_result,
+            loading_mode=loading_mode,
+            execution=MetaGenExecutionMode(execution),
+            approx_unique=approx_unique,
+            quantiles=quantiles,
+            max_number_of_unique_to_show=max_unique_values,
+            result_cache_dir=None if no_cache else default_result_cache_dir(),
+            partition_index_dir=(
+                None
+                if no_cache
+                else default_result_cache_dir() / PARTITION_INDEX_DIR_NAME
+            ),
+        )
+    except ValueError as error:
+        raise click.UsageError(str(error))
+    click.echo(f"Index written to {output_dir / BATCH_INDEX_FILE_NAME}")
+    failed = [result.input for result in results if result.error is not None]
+    if failed:
+        raise click.ClickException(
+            f"Metadata of {len(failed)} of {len(results)} files could not be"
+            f" computed: {failed}"
+        )
+
+
+@click.command(
+    "catalog", context_settings={"help_option_names": ["-h", "--help"]}
+)
+@click.argument(
+    "root",
+    type=click.Path(
+        exists=True, file_okay=False, dir_okay=True, path_type=Path
+    ),
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(
+        file_okay=False, dir_okay=True, path_type=Path, writable=True
+    ),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Output directory of the catalog, _catalog.parquet and"
+        " _catalog.json. Defaults to the root directory."
+    ),
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Number of datasets profiled in parallel, each by its own"
+        " process. Defaults to the number of cores."
+    ),
+)
+@click.option(
+    "--threads-per-worker",
+    type=click.IntRange(min=1),
+    default=None,
+    required=False,
+    help=(
+        "(optional) Number of Polars threads of each worker process. Defaults"
+        " to the number of cores divided by the number of workers."
+    ),
+)
+@click.option(
+    "--rebuild",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Profile every dataset again, instead of only the"
+        " datasets that are new or have changed since the catalog was built."
+        " Defaults to False."
+    ),
+)
+@click.option(
+    "-m",
+    "--loading-mode",
+    type=click.Choice(["lazy", "eager"], case_sensitive=False),
+    callback=lambda ctx, param, value: value.lower(),
+    default="lazy",
+    required=False,
+    help="(optional) Whether to use lazy or eager mode. Defaults to lazy.",
+)
+@click.option(
+    "-x",
+    "--execution",
+    type=click.Choice(MetaGenExecutionMode.values(), case_sensitive=False),
+    callback=lambda ctx, param, value: value.lower(),
+    default=MetaGenExecutionMode.SEQUENTIAL.value,
+    required=False,
+    help=(
+        "(optional) Execution mode of the metadata computation of every"
+        " dataset, see the metadata command. Defaults to sequential."
+    ),
+)
+@click.option(
+    "--approx-unique",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Estimate the number of unique values with a"
+        " HyperLogLog sketch instead of counting them exactly. Defaults to"
+        " False."
+    ),
+)
+@click.option(
+    "--quantiles",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help=(
+        "(optional flag) Add the 25%, 50%, 75%, 95% and 99% quantiles of the"
+        " numeric columns, estimated with a KLL sketch. Defaults to False."
+    ),
+)
+@click.option(
+    "--max-unique-values",
+    type=click.IntRange(min=1),
+    default=10,
+    required=False,
+    help=(
+        "(optional) Unique values of a column are listed in the metadata only"
+        " when there are fewer than this number of them. Defaults to 10."
+    ),
+)
+def catalog(
+    root: Path,
+    output_dir: Path | None,
+    workers: int | None,
+    threads_per_worker: int | None,
+    rebuild: bool,
+    loading_mode: MetaGenSupportedLoadingMode,
+    execution: MetaGenExecutionMode,
+    approx_unique: bool,
+    quantiles: bool,
+    max_unique_values: int,
+) -> None:
+    """
+    A tool to build the catalog of the datasets under a directory.
+    """
+
+    def echo_profile(profile: DatasetProfile) -> None:
+        if profile.error is None:
+            click.echo(f"{profile.dataset}: {len(profile.schema)} columns")
+        else:
+            click.echo(f"{profile.dataset} failed: {profile.error}", err=True)
+
+    click.echo(f"Building the catalog of {root}...")
+    profiles = build_catalog(
+        root,
+        output_dir,
+        workers=workers,
+        threads_per_worker=threads_per_worker,
+        rebuild=rebuild,
+        callback=echo_profile,
+        loading_mode=loading_mode,
+        execution=MetaGenExecutionMode(execution),
+        approx_unique=approx_unique,
+        quantiles=quantiles,
+        max_number_of_unique_to_show=max_unique_values,
+    )
+    profiled = sum(profile.profiled for profile in profiles)
+    failed = sum(profile.error is not None for profile in profiles)
+    click.echo(
+        f"{len(profiles)} datasets: {profiled} profiled,"
+        f" {len(profiles) - profiled} unchanged, {failed} failed. Catalog"
+        f" written to {output_dir or root}"
+    )
+
+
 cli.add_command(metadata)
 cli.add_command(inspect)
 cli.add_command(extracts)
 cli.add_command(filter)
+cli.add_command(batch)
+cli.add_command(catalog)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,251 @@
+"""
+Batch Profiling
+===============
+
+Metadata of many independent input files, computed in parallel by a pool of
+worker processes. Each worker runs :meth:`pymetagen.MetaGen.from_path` and
+writes the metadata of one input at a time, with its own Polars thread pool
+sized so that the workers together do not use more threads than there are
+cores. An index lists every input with its metadata file, or the error that
+prevented computing it.
+"""
+
+from __future__ import annotations
+
+import glob
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from pymetagen.dataloader import file_compression
+from pymetagen.datatypes import MetaGenSupportedFileExtension
+from pymetagen.metagen import MetaGen
+
+BATCH_INDEX_FILE_NAME = "metadata_index.csv"
+POLARS_MAX_THREADS_ENV_VAR = "POLARS_MAX_THREADS"
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of computing the metadata of one input of a batch.
+
+    Args:
+        input: path of the input.
+        output: path of its metadata file, None if it failed.
+        number_of_columns: number of columns of the input.
+        wall_time: time spent on the input, in seconds.
+        error: error message if the metadata could not be computed.
+    """
+
+    input: str
+    output: str | None
+    number_of_columns: int | None
+    wall_time: float
+    error: str | None = None
+
+
+def expand_inputs(
+    patterns: Iterable[str | Path], input_list: Path | str | None = None
+) -> list[Path]:
+    """
+    Paths of the inputs of a batch, in order and without duplicates.
+
+    Args:
+        patterns: paths or glob patterns, e.g. ``drops/*.csv`` or
+            ``drops/**/*.parquet``.
+        input_list: text file with one path or glob pattern per line. Blank
+            lines and lines starting with '#' are ignored.
+
+    Returns:
+        list of paths.
+    """
+    all_patterns = [str(pattern) for pattern in patterns]
+    if input_list is not None:
+        all_patterns.extend(
+            line.strip()
+            for line in Path(input_list).read_text().splitlines()
+            if line.strip() and not line.strip().startswith("#")
+        )
+
+    paths: dict[Path, None] = {}
+    for pattern in all_patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            paths.setdefault(Path(match), None)
+    return list(paths)
+
+
+def default_threads_per_worker(workers: int) -> int:
+    """
+    Number of Polars threads of each of `workers` processes sharing the
+    cores of the machine.
+    """
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def metadata_output_path(
+    path: Path, root: Path, output_dir: Path, output_format: str
+) -> Path:
+    """
+    Path of the metadata file of an input, e.g. ``sales_metadata.json`` for
+    ``sales.csv`` or ``sales.csv.gz``, at its path relative to `root` under
+    `output_dir`, so that inputs with the same name in different directories
+    do not overwrite each other's metadata.
+    """
+    relative = path.resolve().relative_to(root)
+    if file_compression(relative) is not None:
+        relative = relative.with_suffix("")
+    return (
+        output_dir
+        / relative.parent
+        / f"{relative.stem}_metadata{output_format}"
+    )
+
+
+def _set_polars_threads(threads: int) -> None:
+    # Polars sizes its thread pool the first time it is used, after the
+    # worker is started
+    os.environ[POLARS_MAX_THREADS_ENV_VAR] = str(threads)
+
+
+def process_pool(
+    workers: int, threads_per_worker: int | None = None
+) -> ProcessPoolExecutor:
+    """
+    Pool of `workers` processes with `threads_per_worker` Polars threads
+    each, defaulting to the cores shared by the workers.
+    """
+    threads_per_worker = threads_per_worker or default_threads_per_worker(
+        workers
+    )
+    # forked workers would inherit the thread pool of this process
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_set_polars_threads,
+        initargs=(threads_per_worker,),
+    )
+
+
+def _compute_metadata(
+    path: Path, output: Path, options: dict[str, Any]
+) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        metagen = MetaGen.from_path(path, **options)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        metagen.write_metadata(output)
+    except (Exception, pl.exceptions.PanicException) as error:
+        return BatchResult(
+            input=str(path),
+            output=None,
+            number_of_columns=None,
+            wall_time=time.perf_counter() - start,
+            error=f"{type(error).__name__}: {error}",
+        )
+    return BatchResult(
+        input=str(path),
+        output=str(output),
+        number_of_columns=metagen.columns_length,
+        wall_time=time.perf_counter() - start,
+    )
+
+
+def run_batch(
+    paths: Sequence[Path],
+    output_dir: Path | str,
+    output_format: str = MetaGenSupportedFileExtension.JSON.value,
+    workers: int | None = None,
+    threads_per_worker: int | None = None,
+    callback: Callable[[BatchResult], Any] | None = None,
+    **options: Any,
+) -> list[BatchResult]:
+    """
+    Compute and write the metadata of every input in a pool of worker
+    processes, and write the index of the batch, see
+    :data:`BATCH_INDEX_FILE_NAME`, in `output_dir`. An input whose metadata
+    cannot be computed is reported in the index and does not stop the batch.
+
+    Args:
+        paths: paths of the inputs, see :func:`expand_inputs`.
+        output_dir: directory of the metadata files and of the index.
+        output_format: extension of the metadata files, e.g. '.json'.
+        workers: number of worker processes, defaults to the number of
+            cores, and never more than the number of inputs.
+        threads_per_worker: size of the Polars thread pool of each worker,
+            defaults to the number of cores shared by the workers.
+        callback: function called with the result of every input as soon as
+            it is done.
+        options: keyword arguments of :meth:`pymetagen.MetaGen.from_path`.
+
+    Returns:
+        result of every input, in the order of `paths`.
+    """
+    output_format = MetaGenSupportedFileExtension.writable_extension(
+        output_format
+    ).value
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be a positive integer.")
+    if threads_per_worker is not None and threads_per_worker < 1:
+        raise ValueError("threads_per_worker must be a positive integer.")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results: dict[int, BatchResult] = {}
+    if paths:
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        root = Path(
+            os.path.commonpath([path.resolve().parent for path in paths])
+        )
+        outputs = [
+            metadata_output_path(path, root, output_dir, output_format)
+            for path in paths
+        ]
+        if len(set(outputs)) < len(outputs):
+            raise ValueError(
+                "Several inputs would write the same metadata file, e.g."
+                " 'sales.csv' and 'sales.parquet' in the same directory."
+            )
+        with process_pool(workers, threads_per_worker) as executor:
+            futures = {
+                executor.submit(
+                    _compute_metadata, path, output, options
+                ): index
+                for index, (path, output) in enumerate(zip(paths, outputs))
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if callback is not None:
+                    callback(result)
+
+    ordered_results = [results[index] for index in range(len(paths))]
+    write_batch_index(ordered_results, output_dir / BATCH_INDEX_FILE_NAME)
+    return ordered_results
+
+
+def write_batch_index(results: Sequence[BatchResult], path: Path) -> None:
+    """
+    Write the index of a batch, one row per input, as a CSV file.
+    """
+    pl.DataFrame(
+        [asdict(result) for result in results],
+        schema={
+            "input": pl.String,
+            "output": pl.String,
+            "number_of_columns": pl.Int64,
+            "wall_time": pl.Float64,
+            "error": pl.String,
+        },
+    ).write_csv(path)
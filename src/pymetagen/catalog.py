@@ -0,0 +1,356 @@
+"""
+Data Catalog
+============
+
+Catalog of the datasets under a root directory, e.g. a data lake: every
+single file, and every directory of hive partitioned parquet files, is
+profiled by :class:`pymetagen.MetaGen` in a pool of worker processes, see
+:func:`pymetagen.batch.process_pool`. The catalog records the schema, the
+number of rows and the metadata of the columns of every dataset, in a
+parquet table and in a JSON file.
+
+Every dataset is recorded with the fingerprint of its files, see
+:func:`pymetagen.result_cache.input_fingerprint`, and of the profiling
+options. Building the catalog again only profiles the datasets that are new,
+have changed or failed, and keeps the other entries of the existing catalog.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Callable
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from pymetagen.batch import process_pool
+from pymetagen.dataloader import data_file_extension, file_compression
+from pymetagen.datatypes import (
+    MetaGenCatalogColumn,
+    MetaGenMetadataColumn,
+    MetaGenSupportedFileExtension,
+)
+from pymetagen.metadata_table import metadata_table_to_dict
+from pymetagen.metagen import MetaGen
+from pymetagen.partition_index import is_hidden
+from pymetagen.result_cache import input_fingerprint, result_cache_key
+from pymetagen.utils import CustomEncoder, get_nested_path
+
+CATALOG_FILE_STEM = "_catalog"
+CATALOG_DATASET_EXTENSIONS = (
+    ".csv",
+    ".json",
+    ".jsonl",
+    ".ndjson",
+    ".parquet",
+    ".xlsx",
+)
+HIVE_PARTITION_PATTERN = re.compile(r"^[^=]+=[^=]*$")
+
+
+@dataclass
+class DatasetProfile:
+    """
+    Catalog entry of a dataset.
+
+    Args:
+        dataset: path of the dataset relative to the root of the catalog.
+        fingerprint: fingerprint of the files of the dataset and of the
+            profiling options.
+        row_count: number of rows, None if it failed.
+        schema: Polars data type of every column.
+        metadata: metadata table, see :mod:`pymetagen.metadata_table`, None
+            if it failed.
+        error: error message if the dataset could not be profiled.
+        profiled: whether the dataset was profiled by this build, False if
+            its entry was kept from the existing catalog.
+    """
+
+    dataset: str
+    fingerprint: str
+    row_count: int | None
+    schema: dict[str, str]
+    metadata: pl.DataFrame | None
+    error: str | None = None
+    profiled: bool = True
+
+
+def is_partitioned_dataset(directory: Path) -> bool:
+    """
+    Returns True if the directory holds a single dataset of parquet files,
+    i.e. it is named ``*.parquet`` or split in hive partitions, e.g.
+    ``year=2024``, and has parquet files, see
+    :func:`pymetagen.utils.get_nested_path`.
+    """
+    if directory.suffix != ".parquet" and not any(
+        child.is_dir() and HIVE_PARTITION_PATTERN.match(child.name)
+        for child in directory.iterdir()
+    ):
+        return False
+    return get_nested_path(directory).endswith(".parquet")
+
+
+def _is_dataset_file(name: str) -> bool:
+    extension = data_file_extension(name)
+    if file_compression(name) is not None:
+        return extension == MetaGenSupportedFileExtension.CSV.value
+    return extension in CATALOG_DATASET_EXTENSIONS
+
+
+def find_datasets(root: Path | str) -> list[Path]:
+    """
+    Datasets under a root directory, in order: the files with a supported
+    extension, including compressed CSV files, and the directories of
+    partitioned parquet files, whose files are not listed on their own.
+    Hidden files and directories, starting with '.' or '_', are ignored.
+    """
+    root = Path(root)
+    if is_partitioned_dataset(root):
+        return [root]
+
+    datasets = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = sorted(
+            subdirectory
+            for subdirectory in subdirectories
+            if not is_hidden(subdirectory)
+        )
+        for subdirectory in list(subdirectories):
+            if is_partitioned_dataset(Path(directory, subdirectory)):
+                datasets.append(Path(directory, subdirectory))
+                subdirectories.remove(subdirectory)
+        datasets.extend(
+            Path(directory, file)
+            for file in files
+            if not is_hidden(file) and _is_dataset_file(file)
+        )
+    return sorted(datasets)
+
+
+def dataset_fingerprint(path: Path, options: dict[str, Any]) -> str:
+    """
+    Fingerprint of the files of a dataset, their paths, sizes and
+    modification times, and of the options it is profiled with.
+    """
+    fingerprint = input_fingerprint(
+        path, partition_index_dir=options.get("partition_index_dir")
+    )
+    return result_cache_key(fingerprint, options)
+
+
+def _profile_dataset(
+    path: Path, dataset: str, fingerprint: str, options: dict[str, Any]
+) -> DatasetProfile:
+    try:
+        metagen = MetaGen.from_path(path, **options)
+        metadata = metagen.compute_polars_metadata()
+        row_count = metagen.column_statistics.row_count()
+    except (Exception, pl.exceptions.PanicException) as error:
+        return DatasetProfile(
+            dataset=dataset,
+            fingerprint=fingerprint,
+            row_count=None,
+            schema={},
+            metadata=None,
+            error=f"{type(error).__name__}: {error}",
+        )
+    return DatasetProfile(
+        dataset=dataset,
+        fingerprint=fingerprint,
+        row_count=row_count,
+        schema={
+            column: str(dtype)
+            for column, dtype in metagen.data_schema.schema.items()
+        },
+        metadata=metadata,
+    )
+
+
+def _catalog_value(column: MetaGenCatalogColumn, value: Any) -> pl.Expr:
+    dtype = MetaGenCatalogColumn.polars_dtypes()[column]
+    return pl.lit(value, dtype).alias(column.value)
+
+
+def catalog_table(profiles: list[DatasetProfile]) -> pl.DataFrame:
+    """
+    Catalog as a table with one row per column of every dataset, or a single
+    row without column name for a dataset that failed or has no columns.
+    """
+    if not profiles:
+        empty_profile = DatasetProfile("", "", None, {}, None)
+        return catalog_table([empty_profile]).clear()
+
+    name = MetaGenMetadataColumn.NAME.value
+    tables = []
+    for profile in profiles:
+        metadata = profile.metadata
+        if metadata is None or metadata.is_empty():
+            metadata = pl.DataFrame({name: [None]}, schema={name: pl.String})
+        tables.append(
+            metadata.select(
+                _catalog_value(MetaGenCatalogColumn.DATASET, profile.dataset),
+                _catalog_value(
+                    MetaGenCatalogColumn.FINGERPRINT, profile.fingerprint
+                ),
+                _catalog_value(
+                    MetaGenCatalogColumn.NUMBER_ROWS, profile.row_count
+                ),
+                pl.col(name),
+                pl.col(name)
+                .replace_strict(
+                    profile.schema, default=None, return_dtype=pl.String
+                )
+                .alias(MetaGenCatalogColumn.DATA_TYPE.value),
+                _catalog_value(MetaGenCatalogColumn.ERROR, profile.error),
+                pl.exclude(name),
+            )
+        )
+    return pl.concat(tables, how="diagonal_relaxed")
+
+
+def read_catalog(path: Path | str) -> dict[str, DatasetProfile]:
+    """
+    Entries of an existing catalog table, keyed by dataset. A missing or
+    unreadable catalog has no entries.
+    """
+    try:
+        table = pl.read_parquet(path)
+    except (OSError, pl.exceptions.ComputeError):
+        return {}
+
+    name = MetaGenMetadataColumn.NAME.value
+    profiles = {}
+    for (dataset,), rows in table.partition_by(
+        MetaGenCatalogColumn.DATASET.value, as_dict=True, maintain_order=True
+    ).items():
+        columns = rows.filter(pl.col(name).is_not_null())
+        profiles[str(dataset)] = DatasetProfile(
+            dataset=str(dataset),
+            fingerprint=rows[MetaGenCatalogColumn.FINGERPRINT.value][0],
+            row_count=rows[MetaGenCatalogColumn.NUMBER_ROWS.value][0],
+            schema=dict(
+                columns.select(
+                    name, MetaGenCatalogColumn.DATA_TYPE.value
+                ).iter_rows()
+            ),
+            metadata=(
+                columns.drop(MetaGenCatalogColumn.values())
+                if rows[MetaGenCatalogColumn.ERROR.value][0] is None
+                else None
+            ),
+            error=rows[MetaGenCatalogColumn.ERROR.value][0],
+            profiled=False,
+        )
+    return profiles
+
+
+def write_catalog_json(
+    root: Path, profiles: list[DatasetProfile], path: Path
+) -> None:
+    """
+    Write the catalog as a JSON file, with the metadata of the columns of
+    every dataset in the format of :meth:`pymetagen.MetaGen.write_metadata`.
+    """
+    catalog = {
+        "root": str(root),
+        "datasets": {
+            profile.dataset: {
+                "fingerprint": profile.fingerprint,
+                "row_count": profile.row_count,
+                "schema": profile.schema,
+                "error": profile.error,
+                "fields": (
+                    metadata_table_to_dict(profile.metadata)
+                    if profile.metadata is not None
+                    else {}
+                ),
+            }
+            for profile in profiles
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(catalog, f, indent=4, ensure_ascii=False, cls=CustomEncoder)
+
+
+def build_catalog(
+    root: Path | str,
+    output_dir: Path | str | None = None,
+    workers: int | None = None,
+    threads_per_worker: int | None = None,
+    rebuild: bool = False,
+    callback: Callable[[DatasetProfile], Any] | None = None,
+    **options: Any,
+) -> list[DatasetProfile]:
+    """
+    Build or update the catalog of the datasets under a root directory, and
+    write it as ``_catalog.parquet`` and ``_catalog.json`` in `output_dir`.
+
+    Args:
+        root: root directory of the datasets, see :func:`find_datasets`.
+        output_dir: directory of the catalog, defaults to `root`.
+        workers: number of worker processes, defaults to the number of
+            cores, and never more than the number of datasets to profile.
+        threads_per_worker: size of the Polars thread pool of each worker,
+            defaults to the number of cores shared by the workers.
+        rebuild: profile every dataset, even if unchanged since the existing
+            catalog was built.
+        callback: function called with the entry of every profiled dataset
+            as soon as it is done.
+        options: keyword arguments of :meth:`pymetagen.MetaGen.from_path`.
+
+    Returns:
+        entry of every dataset, in the order of the datasets.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be a positive integer.")
+    if threads_per_worker is not None and threads_per_worker < 1:
+        raise ValueError("threads_per_worker must be a positive integer.")
+    root = Path(root)
+    if not root.is_dir():
+        raise ValueError(f"{root} is not a directory.")
+    output_dir = Path(output_dir) if output_dir is not None else root
+    catalog_path = output_dir / f"{CATALOG_FILE_STEM}.parquet"
+
+    existing = {} if rebuild else read_catalog(catalog_path)
+    datasets = []
+    profiles: dict[str, DatasetProfile] = {}
+    to_profile = []
+    for path in find_datasets(root):
+        dataset = path.relative_to(root).as_posix()
+        fingerprint = dataset_fingerprint(path, options)
+        previous = existing.get(dataset)
+        datasets.append(dataset)
+        if (
+            previous is not None
+            and previous.fingerprint == fingerprint
+            and previous.error is None
+        ):
+            profiles[dataset] = previous
+        else:
+            to_profile.append((path, dataset, fingerprint))
+
+    if to_profile:
+        workers = min(workers or os.cpu_count() or 1, len(to_profile))
+        with process_pool(workers, threads_per_worker) as executor:
+            futures = [
+                executor.submit(_profile_dataset, *dataset, options)
+                for dataset in to_profile
+            ]
+            for future in as_completed(futures):
+                profile = future.result()
+                profiles[profile.dataset] = profile
+                if callback is not None:
+                    callback(profile)
+
+    results = [profiles[dataset] for dataset in datasets]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    temporary_path = catalog_path.with_suffix(".tmp")
+    catalog_table(results).write_parquet(temporary_path)
+    os.replace(temporary_path, catalog_path)
+    write_catalog_json(root, results, output_dir / f"{CATALOG_FILE_STEM}.json")
+    return results
@@ -0,0 +1,122 @@
+"""
+Column Statistics Store
+=======================
+
+Base facts about the columns of the data, shared by the metrics of
+:class:`pymetagen.MetaGen`: the row count, the number of nulls, the MetaGen
+data type and the HyperLogLog sketch of every column. Each fact is computed
+once, the first time a metric reads it, instead of once per metric.
+"""
+
+from __future__ import annotations
+
+import polars as pl
+
+from pymetagen._typing import ColumnName, DataFrameT
+from pymetagen.datatypes import dtype_to_metagen_type
+from pymetagen.metrics import ROW_COUNT_ALIAS, column_expression
+from pymetagen.sketches import HyperLogLog, hyperloglog_expression
+from pymetagen.utils import DataSchema, collect, get_data_schema
+
+
+class ColumnStatisticsStore:
+    """
+    Memoized base facts about the columns of the data.
+
+    The row count and the number of nulls of every column are computed
+    together, by a single query over the data, the first time one of them is
+    read. Sketches are computed column by column, when read.
+
+    The store must be reset whenever the data changes, see :meth:`reset`.
+
+    Args:
+        data: Polars DataFrame or LazyFrame.
+    """
+
+    def __init__(self, data: DataFrameT):
+        self.reset(data)
+
+    def reset(self, data: DataFrameT) -> None:
+        """
+        Forget every fact computed so far and read them from new data.
+        """
+        self.data = data
+        self._data_schema: DataSchema | None = None
+        self._row_count: int | None = None
+        self._null_counts: dict[ColumnName, int] = {}
+        self._metagen_types: dict[ColumnName, str] = {}
+        self._sketches: dict[tuple[ColumnName, int], HyperLogLog] = {}
+
+    @property
+    def data_schema(self) -> DataSchema:
+        if self._data_schema is None:
+            self._data_schema = get_data_schema(self.data)
+        return self._data_schema
+
+    def _compute_counts(self) -> None:
+        row_count, *null_counts = (
+            self.data.lazy()
+            .select(pl.len().alias(ROW_COUNT_ALIAS), pl.all().null_count())
+            .pipe(collect)
+            .row(0)
+        )
+        self._row_count = row_count
+        self._null_counts = dict(zip(self.data_schema.columns, null_counts))
+
+    def row_count(self) -> int:
+        """
+        Number of rows of the data.
+        """
+        if self._row_count is None:
+            self._compute_counts()
+        return self._row_count  # type: ignore[return-value]
+
+    def null_count(self, column: ColumnName) -> int:
+        """
+        Number of nulls of a column.
+        """
+        if self._row_count is None:
+            self._compute_counts()
+        return self._null_counts[column]
+
+    def is_all_null(self, column: ColumnName) -> bool:
+        """
+        Returns True if all values in the column are null, including when the
+        data has no rows.
+        """
+        return self.null_count(column) == self.row_count()
+
+    def metagen_type(self, column: ColumnName) -> str:
+        """
+        MetaGen data type of a column, see
+        :class:`pymetagen.datatypes.MetaGenDataType`.
+        """
+        if column not in self._metagen_types:
+            self._metagen_types[column] = dtype_to_metagen_type(
+                self.data_schema.schema[column]
+            )
+        return self._metagen_types[column]
+
+    def sketch_query(self, column: ColumnName, precision: int) -> pl.LazyFrame:
+        """
+        Query of the observations of the HyperLogLog sketch of a column, see
+        :meth:`sketch`.
+        """
+        values = column_expression(column, self.data_schema.schema[column])
+        return self.data.lazy().select(
+            hyperloglog_expression(values, precision)
+        )
+
+    def sketch(self, column: ColumnName, precision: int) -> HyperLogLog:
+        """
+        HyperLogLog sketch of the non-null values of a column.
+        """
+        key = (column, precision)
+        if key not in self._sketches:
+            observations = (
+                self.sketch_query(column, precision).pipe(collect).row(0)[0]
+            )
+            self._sketches[key] = HyperLogLog.from_observations(
+                observations, precision
+            )
+        return self._sketches[key]
@@ -5,17 +5,28 @@ Data Loader
 
 from __future__ import annotations
 
+import bz2
+import json
+import lzma
 import warnings
+from collections.abc import Callable, Mapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 import polars as pl
 from polars.datatypes.constants import N_INFER_DEFAULT
 
 from pymetagen._typing import DataFrameT
-from pymetagen.datatypes import MetaGenSupportedFileExtension
+from pymetagen.datatypes import (
+    MetaGenCompression,
+    MetaGenExcelEngine,
+    MetaGenSupportedFileExtension,
+)
 from pymetagen.exceptions import FileTypeUnsupportedError
-from pymetagen.utils import get_nested_path, selectively_update_dict
+from pymetagen.partition_index import partition_index
+from pymetagen.utils import selectively_update_dict
 
 POLARS_DEFAULT_READ_CSV_OPTIONS: dict[str, Any] = {
     "columns": None,
@@ -67,11 +78,83 @@ POLARS_DEFAULT_READ_EXCEL_OPTIONS: dict[str, Any] = {
     for key, value in POLARS_DEFAULT_READ_CSV_OPTIONS.items()
     if key in LIST_OF_EXCEL_OPTIONS_FROM_CSV_OPTIONS
 }
-POLARS_DEFAULT_READ_EXCEL_OPTIONS["engine"] = "openpyxl"
+
+
+def default_excel_engine() -> MetaGenExcelEngine:
+    """
+    Fastest Excel engine installed: calamine if the fastexcel package is
+    installed, otherwise openpyxl.
+    """
+    if find_spec("fastexcel") is not None:
+        return MetaGenExcelEngine.CALAMINE
+    return MetaGenExcelEngine.OPENPYXL
 
 
 POLARS_DEFAULT_READ_PARQUET_OPTIONS: dict[str, Any] = {}
 
+POLARS_DEFAULT_READ_NDJSON_OPTIONS: dict[str, Any] = {
+    "schema": None,
+    "schema_overrides": None,
+    "infer_schema_length": N_INFER_DEFAULT,
+    "low_memory": False,
+    "ignore_errors": False,
+}
+LIST_OF_JSON_OPTIONS_FROM_NDJSON_OPTIONS = [
+    "schema",
+    "schema_overrides",
+    "infer_schema_length",
+]
+
+# longest first line read to tell newline delimited JSON from JSON
+NDJSON_FIRST_LINE_MAX_SIZE = 2**20
+
+
+def is_newline_delimited_json(path: Path | str) -> bool:
+    """
+    Returns True if a JSON file is newline delimited, i.e. its first line is
+    a JSON value on its own, and False if it holds a single JSON array or a
+    value spanning several lines.
+    """
+    with open(path, "rb") as f:
+        first_line = f.readline(NDJSON_FIRST_LINE_MAX_SIZE).strip()
+    if first_line.startswith(b"["):
+        return False
+    try:
+        json.loads(first_line)
+    except ValueError:
+        return False
+    return True
+
+
+# compressions decompressed by the standard library as the file is read,
+# Polars decompresses the others itself
+PYTHON_DECOMPRESSORS: dict[MetaGenCompression, Callable[..., IO[bytes]]] = {
+    MetaGenCompression.BZ2: bz2.open,
+    MetaGenCompression.XZ: lzma.open,
+}
+
+
+def file_compression(path: Path | str) -> MetaGenCompression | None:
+    """
+    Compression of a file by its last extension, e.g. gzip for
+    ``sales.csv.gz``, None if it is not compressed.
+    """
+    try:
+        return MetaGenCompression(Path(path).suffix)
+    except ValueError:
+        return None
+
+
+def data_file_extension(path: Path | str) -> str:
+    """
+    Extension of a data file without its compression extension, e.g.
+    ``.csv`` for ``sales.csv.gz``.
+    """
+    path = Path(path)
+    if file_compression(path) is not None:
+        path = path.with_suffix("")
+    return path.suffix
+
 
 class DataLoader:
     def __init__(
@@ -79,6 +162,10 @@ class DataLoader:
         path: Path | str,
         polars_read_csv_options: None | dict[str, Any] = None,
         sheet_name: str | None = None,
+        polars_read_json_options: None | dict[str, Any] = None,
+        excel_engine: MetaGenExcelEngine | str | None = None,
+        partition_index_dir: Path | str | None = None,
+        partitions: Mapping[str, Any] | None = None,
         _default_read_csv_options: dict[
             str, Any
         ] = POLARS_DEFAULT_READ_CSV_OPTIONS,
@@ -88,15 +175,29 @@ class DataLoader:
         _default_read_parquet_options: dict[
             str, Any
         ] = POLARS_DEFAULT_READ_PARQUET_OPTIONS,
+        _default_read_json_options: dict[
+            str, Any
+        ] = POLARS_DEFAULT_READ_NDJSON_OPTIONS,
     ):
         self.path = Path(path)
+        self.compression = file_compression(self.path)
         self.polars_read_csv_options = _default_read_csv_options.copy()
         self._update_read_csv_polars_options(polars_read_csv_options)
         self.polars_read_excel_options: dict[str, Any] = (
             _default_read_excel_options.copy()
         )
         self._update_polars_read_excel_options(sheet_name)
+        self.polars_read_excel_options["engine"] = MetaGenExcelEngine(
+            excel_engine or default_excel_engine()
+        ).value
         self.polars_read_parquet_options = _default_read_parquet_options.copy()
+        self.partition_index_dir = partition_index_dir
+        self.partitions = partitions
+        self.polars_read_json_options = _default_read_json_options.copy()
+        if polars_read_json_options is not None:
+            self.polars_read_json_options = selectively_update_dict(
+                self.polars_read_json_options, polars_read_json_options
+            )
 
     def __call__(self):
         return self.load()
@@ -109,14 +210,33 @@ class DataLoader:
             MetaGenSupportedFileExtension.XLSX: self._load_excel_data,
             MetaGenSupportedFileExtension.PARQUET: self._load_parquet_data,
             MetaGenSupportedFileExtension.JSON: self._load_json_data,
+            MetaGenSupportedFileExtension.NDJSON: self._load_ndjson_data,
+            MetaGenSupportedFileExtension.JSONL: self._load_ndjson_data,
             MetaGenSupportedFileExtension.NONE: self._load_none_suffix,
         }
         try:
-            file_extension = MetaGenSupportedFileExtension(self.path.suffix)
+            file_extension = MetaGenSupportedFileExtension(
+                data_file_extension(self.path)
+            )
         except ValueError:
             raise FileTypeUnsupportedError(
                 f"File extension for {self.path} is not supported"
             )
+        if (
+            self.compression is not None
+            and file_extension != MetaGenSupportedFileExtension.CSV
+        ):
+            raise FileTypeUnsupportedError(
+                f"Only CSV files can be read compressed, not {self.path}"
+            )
+        if self.partitions and file_extension not in (
+            MetaGenSupportedFileExtension.PARQUET,
+            MetaGenSupportedFileExtension.NONE,
+        ):
+            raise FileTypeUnsupportedError(
+                "Partitions can only be selected in parquet files, not in"
+                f" {self.path}"
+            )
         return extension_mapping[file_extension]()
 
     def _update_polars_read_excel_options(
@@ -135,14 +255,73 @@ class DataLoader:
             self.polars_read_csv_options, polars_read_csv_options
         )
 
+    def _open_csv(self) -> AbstractContextManager[Path | IO[bytes]]:
+        """
+        Source of the CSV reader: the path of the file, or for bz2 and xz
+        compressed files, see :data:`PYTHON_DECOMPRESSORS`, a file object
+        decompressing the file as Polars reads it, so that no decompressed
+        copy is written to disk.
+        """
+        if self.compression not in PYTHON_DECOMPRESSORS:
+            return nullcontext(self.path)
+        return PYTHON_DECOMPRESSORS[self.compression](self.path, "rb")
+
     def _load_csv_data(self) -> DataFrameT:
-        return pl.read_csv(source=self.path, **self.polars_read_csv_options)
+        with self._open_csv() as source:
+            return pl.read_csv(source=source, **self.polars_read_csv_options)
 
     def _load_excel_data(self) -> pl.DataFrame:
         return pl.read_excel(
             source=self.path, **self.polars_read_excel_options
         )
 
+    def load_excel_sheets(
+        self, sheet_names: Sequence[str] | None = None
+    ) -> dict[str, pl.DataFrame]:
+        """
+        Read every sheet of an Excel file, or the sheets in `sheet_names`, in
+        a single pass over the workbook.
+
+        Returns:
+            data of every sheet keyed by sheet name, in workbook order. Empty
+            sheets have no columns.
+        """
+        options = {
+            **self.polars_read_excel_options,
+            "sheet_name": list(sheet_names) if sheet_names else None,
+            "raise_if_empty": False,
+        }
+        if sheet_names:
+            return pl.read_excel(source=self.path, **options)
+        return pl.read_excel(source=self.path, sheet_id=0, **options)
+
+    def _parquet_files(self) -> list[Path]:
+        """
+        The parquet file, or the files of a directory of partitioned parquet
+        files listed by its partition index, see
+        :mod:`pymetagen.partition_index`, so that Polars does not list the
+        directory tree again. Only the files of the selected partitions are
+        listed, the others are never opened.
+        """
+        if not self.path.is_dir():
+            if self.partitions:
+                raise FileTypeUnsupportedError(
+                    "Partitions can only be selected in a directory of"
+                    f" partitioned parquet files, not in {self.path}"
+                )
+            return [self.path]
+        index = partition_index(self.path, self.partition_index_dir)
+        files = index.paths(self.partitions)
+        if not files and self.partitions:
+            raise ValueError(
+                f"No partition of {self.path} matches {dict(self.partitions)}"
+            )
+        if not files:
+            raise FileTypeUnsupportedError(
+                f"Directory {self.path} does not contain any parquet files"
+            )
+        return files
+
     def _load_parquet_data(self) -> DataFrameT:
         """
         IMPORTANT:
@@ -151,15 +330,32 @@ class DataLoader:
         polars.
         """
         pl.enable_string_cache()
-        path = get_nested_path(self.path)
         return pl.read_parquet(
-            source=path,
+            source=self._parquet_files(),
             hive_partitioning=True,
             **self.polars_read_parquet_options,
         )
 
-    def _load_json_data(self):
-        raise NotImplementedError
+    def _load_json_data(self) -> DataFrameT:
+        """
+        JSON files holding one record per line are read as newline delimited
+        JSON, see :func:`is_newline_delimited_json`.
+        """
+        if is_newline_delimited_json(self.path):
+            return self._load_ndjson_data()
+        return pl.read_json(
+            source=self.path,
+            **{
+                key: value
+                for key, value in self.polars_read_json_options.items()
+                if key in LIST_OF_JSON_OPTIONS_FROM_NDJSON_OPTIONS
+            },
+        )
+
+    def _load_ndjson_data(self) -> DataFrameT:
+        return pl.read_ndjson(
+            source=self.path, **self.polars_read_json_options
+        )
 
     def _load_none_suffix(self):
         """
@@ -170,11 +366,6 @@ class DataLoader:
                 f"File {self.path} is not a directory"
             )
 
-        if ".parquet" not in get_nested_path(self.path):
-            raise FileTypeUnsupportedError(
-                f"Directory {self.path} does not contain any parquet files"
-            )
-
         return self._load_parquet_data()
 
 
@@ -184,11 +375,19 @@ class LazyDataLoader(DataLoader):
         path: Path | str,
         polars_read_csv_options: None | dict[str, Any] = None,
         sheet_name: str | None = None,
+        polars_read_json_options: None | dict[str, Any] = None,
+        excel_engine: MetaGenExcelEngine | str | None = None,
+        partition_index_dir: Path | str | None = None,
+        partitions: Mapping[str, Any] | None = None,
     ):
         super().__init__(
             path=path,
             polars_read_csv_options=polars_read_csv_options,
             sheet_name=sheet_name,
+            polars_read_json_options=polars_read_json_options,
+            excel_engine=excel_engine,
+            partition_index_dir=partition_index_dir,
+            partitions=partitions,
             _default_read_csv_options=POLARS_DEFAULT_LAZY_READ_CSV_OPTIONS,
         )
 
@@ -196,6 +395,14 @@ class LazyDataLoader(DataLoader):
         return super().load()
 
     def _load_csv_data(self) -> pl.LazyFrame:
+        """
+        Polars scans gzip and zstd compressed files itself. Its streaming
+        engine cannot scan file objects, so bz2 and xz compressed files are
+        read in full as they are decompressed, see
+        :data:`PYTHON_DECOMPRESSORS`.
+        """
+        if self.compression in PYTHON_DECOMPRESSORS:
+            return super()._load_csv_data().lazy()
         return pl.scan_csv(source=self.path, **self.polars_read_csv_options)
 
     def _load_excel_data(self) -> pl.DataFrame:
@@ -205,11 +412,23 @@ class LazyDataLoader(DataLoader):
         )
         return super()._load_excel_data()
 
+    def _load_json_data(self) -> DataFrameT:
+        if not is_newline_delimited_json(self.path):
+            warnings.warn(
+                "JSON files that are not newline delimited are not supported"
+                " in lazy mode, switching to full mode"
+            )
+        return super()._load_json_data()
+
+    def _load_ndjson_data(self) -> pl.LazyFrame:
+        return pl.scan_ndjson(
+            source=self.path, **self.polars_read_json_options
+        )
+
     def _load_parquet_data(self) -> pl.LazyFrame:
         pl.enable_string_cache()
-        path = get_nested_path(self.path)
         return pl.scan_parquet(
-            source=path,
+            source=self._parquet_files(),
             hive_partitioning=True,
             **self.polars_read_parquet_options,
         )
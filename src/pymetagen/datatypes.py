@@ -22,13 +22,23 @@ class MetaGenMetadataColumn(EnumListMixin, str, Enum):
     MAX = "Max"
     MEAN = "Mean"
     STD = "Std"
+    P25 = "25%"
+    MEDIAN = "50%"
+    P75 = "75%"
+    P95 = "95%"
+    P99 = "99%"
     MIN_LENGTH = "Min Length"
     MAX_LENGTH = "Max Length"
     NUMBER_NULLS = "# nulls"
     NUMBER_EMPTY_ZERO = "# empty/zero"
     NUMBER_POSITIVE = "# positive"
     NUMBER_NEGATIVE = "# negative"
+    NUMBER_NULLS_CI = "# nulls (95% CI)"
+    NUMBER_EMPTY_ZERO_CI = "# empty/zero (95% CI)"
+    NUMBER_POSITIVE_CI = "# positive (95% CI)"
+    NUMBER_NEGATIVE_CI = "# negative (95% CI)"
     NUMBER_UNIQUE = "# unique"
+    NUMBER_UNIQUE_APPROX = "# unique (approx)"
     VALUES = "Values"
 
     @classmethod
@@ -41,11 +51,94 @@ class MetaGenMetadataColumn(EnumListMixin, str, Enum):
             cls.NUMBER_POSITIVE: pl.Int64,
             cls.NUMBER_NEGATIVE: pl.Int64,
             cls.NUMBER_UNIQUE: pl.Int64,
+            cls.NUMBER_UNIQUE_APPROX: pl.Int64,
+        }
+
+    @classmethod
+    def polars_dtypes(cls) -> SchemaDict:
+        """
+        Polars data type of every column of the metadata table. The unique
+        values of the columns of the data are JSON encoded.
+        """
+        return {
+            **{
+                column: pl.String
+                for column in (
+                    cls.NAME,
+                    cls.LONG_NAME,
+                    cls.TYPE,
+                    cls.DESCRIPTION,
+                    cls.MIN,
+                    cls.MAX,
+                    cls.VALUES,
+                )
+            },
+            cls.MEAN: pl.Float64,
+            cls.STD: pl.Float64,
+            **{column: pl.Float64 for column in cls.quantile_columns()},
+            **cls.interger_dtypes(),
+            **{
+                column: pl.List(pl.Int64)
+                for column in cls.confidence_interval_columns().values()
+            },
+        }
+
+    @classmethod
+    def quantile_columns(cls) -> Mapping[MetaGenMetadataColumn, float]:
+        """
+        Quantile columns and the quantile each of them holds.
+        """
+        return {
+            cls.P25: 0.25,
+            cls.MEDIAN: 0.5,
+            cls.P75: 0.75,
+            cls.P95: 0.95,
+            cls.P99: 0.99,
+        }
+
+    @classmethod
+    def metric_columns(cls) -> list[MetaGenMetadataColumn]:
+        """
+        Columns of the metadata table computed from the data, which can be
+        selected with the `metrics` argument of :class:`pymetagen.MetaGen`.
+        """
+        return [
+            cls.MIN,
+            cls.MAX,
+            cls.STD,
+            *cls.quantile_columns(),
+            cls.MIN_LENGTH,
+            cls.MAX_LENGTH,
+            cls.NUMBER_NULLS,
+            cls.NUMBER_EMPTY_ZERO,
+            cls.NUMBER_POSITIVE,
+            cls.NUMBER_NEGATIVE,
+            cls.NUMBER_UNIQUE,
+            cls.VALUES,
+        ]
+
+    @classmethod
+    def confidence_interval_columns(
+        cls,
+    ) -> Mapping[MetaGenMetadataColumn, MetaGenMetadataColumn]:
+        """
+        Count columns estimated from a sample and the column holding the
+        confidence interval of each of them.
+        """
+        return {
+            cls.NUMBER_NULLS: cls.NUMBER_NULLS_CI,
+            cls.NUMBER_EMPTY_ZERO: cls.NUMBER_EMPTY_ZERO_CI,
+            cls.NUMBER_POSITIVE: cls.NUMBER_POSITIVE_CI,
+            cls.NUMBER_NEGATIVE: cls.NUMBER_NEGATIVE_CI,
         }
 
     @classmethod
     def pymetagen_columns(
-        cls, include_name_column: bool = False
+        cls,
+        include_name_column: bool = False,
+        approx_unique: bool = False,
+        quantiles: bool = False,
+        sampled: bool = False,
     ) -> list[MetaGenMetadataColumn]:
         columns = [
             cls.LONG_NAME,
@@ -54,13 +147,15 @@ class MetaGenMetadataColumn(EnumListMixin, str, Enum):
             cls.MIN,
             cls.MAX,
             cls.STD,
+            *(cls.quantile_columns() if quantiles else []),
             cls.MIN_LENGTH,
             cls.MAX_LENGTH,
             cls.NUMBER_NULLS,
             cls.NUMBER_EMPTY_ZERO,
             cls.NUMBER_POSITIVE,
             cls.NUMBER_NEGATIVE,
-            cls.NUMBER_UNIQUE,
+            *(cls.confidence_interval_columns().values() if sampled else []),
+            cls.NUMBER_UNIQUE_APPROX if approx_unique else cls.NUMBER_UNIQUE,
             cls.VALUES,
         ]
         if include_name_column:
@@ -83,9 +178,82 @@ class MetaGenSupportedLoadingMode(EnumListMixin, str, Enum):
     EAGER = "eager"
 
 
+class MetaGenExecutionMode(EnumListMixin, str, Enum):
+    """
+    MetaGen metadata execution modes.
+    options: sequential, fused, batched, wide, streaming, footer
+
+    - sequential: every metric is computed column by column, each with its
+      own query over the data.
+    - fused: every metric of every column is built as a Polars expression
+      and evaluated in a single query over the data.
+    - batched: one query per column, collected together in batches with
+      :func:`polars.collect_all` so the queries share their common subplans
+      and run in parallel.
+    - wide: the columns are grouped by data type and computed in batches of
+      columns, with one expression per metric expanded by Polars to every
+      column of a batch, for tables with thousands of columns.
+    - streaming: the data is read in chunks and mergeable partial statistics
+      of each chunk are combined, so the data is never held in memory as a
+      whole. The number of unique values is always approximate.
+    - footer: min, max and number of nulls are read from the row group
+      statistics in the footers of parquet files, without reading the data
+      except for the row groups missing them. The other metrics are not
+      computed.
+    """
+
+    SEQUENTIAL = "sequential"
+    FUSED = "fused"
+    BATCHED = "batched"
+    WIDE = "wide"
+    STREAMING = "streaming"
+    FOOTER = "footer"
+
+
+class MetaGenCatalogColumn(EnumListMixin, str, Enum):
+    """
+    Columns of the catalog table, see :mod:`pymetagen.catalog`, before the
+    columns of the metadata table.
+    """
+
+    DATASET = "Dataset"
+    FINGERPRINT = "Fingerprint"
+    NUMBER_ROWS = "# rows"
+    DATA_TYPE = "Data Type"
+    ERROR = "Error"
+
+    @classmethod
+    def polars_dtypes(cls) -> SchemaDict:
+        """
+        Polars data type of every column of the catalog table.
+        """
+        return {
+            cls.DATASET: pl.String,
+            cls.FINGERPRINT: pl.String,
+            cls.NUMBER_ROWS: pl.Int64,
+            cls.DATA_TYPE: pl.String,
+            cls.ERROR: pl.String,
+        }
+
+
+class MetaGenExcelEngine(EnumListMixin, str, Enum):
+    """
+    Engines reading Excel files:
+
+    - calamine: the Rust calamine reader of the fastexcel package, much
+      faster than openpyxl. Requires ``pip install pymetagen[excel]``.
+    - openpyxl: the pure Python openpyxl reader.
+    """
+
+    CALAMINE = "calamine"
+    OPENPYXL = "openpyxl"
+
+
 class MetaGenSupportedFileExtension(EnumListMixin, str, Enum):
     CSV = ".csv"
     JSON = ".json"
+    NDJSON = ".ndjson"
+    JSONL = ".jsonl"
     PARQUET = ".parquet"
     XLSX = ".xlsx"
     NONE = ""
@@ -99,6 +267,22 @@ class MetaGenSupportedFileExtension(EnumListMixin, str, Enum):
         raise ValueError("Extension cannot be empty.")
 
 
+class MetaGenCompression(EnumListMixin, str, Enum):
+    """
+    Compressions of CSV input files, by the extension following the file
+    extension, e.g. ``sales.csv.gz``:
+
+    - gzip and zstd: decompressed by Polars itself.
+    - bz2 and xz: decompressed by the Python standard library as the file is
+      read.
+    """
+
+    GZIP = ".gz"
+    ZSTD = ".zst"
+    BZ2 = ".bz2"
+    XZ = ".xz"
+
+
 class MetaGenDataType(str, Enum):
     string = "string"
     float = "float"
@@ -4,3 +4,7 @@ class FileTypeUnsupportedError(Exception):
 
 class LoadingModeUnsupportedError(Exception):
     pass
+
+
+class ExecutionModeUnsupportedError(Exception):
+    pass
@@ -0,0 +1,287 @@
+"""
+Metadata Table
+==============
+
+The metadata table of :class:`pymetagen.MetaGen` as a Polars DataFrame, one
+row per column of the data, built from the computed metrics without going
+through pandas. Every column of the table has a single Polars data type, see
+:meth:`MetaGenMetadataColumn.polars_dtypes`. The unique values of the columns
+of the data, of as many data types, are JSON encoded, and decoded back to
+Python values, e.g. dates, by the type of their column.
+
+pandas is only imported to convert the table to the pandas DataFrame
+returned by :meth:`pymetagen.MetaGen.compute_metadata`.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import re
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from pymetagen._typing import Any, ColumnName, Hashable
+from pymetagen.datatypes import MetaGenDataType, MetaGenMetadataColumn
+from pymetagen.utils import CustomEncoder
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+JSON_ENCODED_COLUMNS = [MetaGenMetadataColumn.VALUES]
+
+# str() of a timedelta, e.g. "-1 day, 23:59:59.500000"
+TIMEDELTA_PATTERN = re.compile(
+    r"(?:(?P<days>-?\d+) days?, )?"
+    r"(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+(?:\.\d+)?)"
+)
+
+
+@dataclass
+class ColumnMetadata:
+    """
+    Metadata of a column of the data, i.e. one row of the metadata table.
+
+    Args:
+        name: name of the column.
+        metadata: value of every other column of the metadata table, keyed by
+            its name, e.g. ``"# nulls"``, with decoded unique values.
+    """
+
+    name: ColumnName
+    metadata: dict[str, Any]
+
+    @property
+    def type(self) -> str:
+        """
+        MetaGen data type of the column.
+        """
+        return self.metadata[MetaGenMetadataColumn.TYPE.value]
+
+    @property
+    def description(self) -> str:
+        """
+        Description of the column, empty if not given.
+        """
+        return self.metadata.get(MetaGenMetadataColumn.DESCRIPTION.value, "")
+
+
+class ValuesEncoder(CustomEncoder):
+    """
+    JSON encoder of the unique values of a column, keeping the fractional
+    seconds of datetimes so that they are decoded back unchanged.
+    """
+
+    def default(self, obj: object):
+        if isinstance(obj, datetime.datetime):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+def parse_timedelta(value: str) -> datetime.timedelta:
+    """
+    Timedelta from its string representation, e.g. ``"1 day, 2:03:04"``.
+    """
+    match = TIMEDELTA_PATTERN.fullmatch(value)
+    if match is None:
+        raise ValueError(f"Invalid timedelta: {value!r}")
+    return datetime.timedelta(
+        days=int(match["days"] or 0),
+        hours=int(match["hours"]),
+        minutes=int(match["minutes"]),
+        seconds=float(match["seconds"]),
+    )
+
+
+VALUE_DECODERS: dict[str, Callable[[str], Any]] = {
+    MetaGenDataType.date.value: datetime.date.fromisoformat,
+    MetaGenDataType.datetime.value: datetime.datetime.fromisoformat,
+    MetaGenDataType.time.value: datetime.time.fromisoformat,
+    MetaGenDataType.duration.value: parse_timedelta,
+}
+
+
+def encode_values(values: list[Any] | None) -> str | None:
+    """
+    JSON encoding of the unique values of a column, None if not listed.
+    """
+    if values is None:
+        return None
+    return json.dumps(list(values), ensure_ascii=False, cls=ValuesEncoder)
+
+
+def decode_values(
+    values: str | None, metagen_type: str | None = None
+) -> list[Any] | None:
+    """
+    Unique values of a column from their JSON encoding.
+
+    Args:
+        values: JSON encoded values.
+        metagen_type: MetaGen data type of the column. The values of date,
+            datetime, time and duration columns, encoded as strings, are
+            decoded to the Python objects they were encoded from.
+
+    Returns:
+        unique values, None if not listed.
+    """
+    if values is None:
+        return None
+    decoded = json.loads(values)
+    decode = VALUE_DECODERS.get(metagen_type)  # type: ignore[arg-type]
+    if decode is None:
+        return decoded
+    return [None if value is None else decode(value) for value in decoded]
+
+
+def _decoded_values(table: pl.DataFrame, column: str) -> list[Any]:
+    types = (
+        table[MetaGenMetadataColumn.TYPE.value]
+        if MetaGenMetadataColumn.TYPE.value in table.columns
+        else [None] * table.height
+    )
+    return [
+        decode_values(values, metagen_type)
+        for values, metagen_type in zip(table[column], types)
+    ]
+
+
+def build_metadata_table(
+    metadata: dict[Hashable, dict[Hashable, Any]],
+    columns: Sequence[ColumnName],
+    metadata_columns: Sequence[MetaGenMetadataColumn],
+) -> pl.DataFrame:
+    """
+    Build the metadata table from the metadata dictionary, i.e.
+    ``{metric: {column: value}}``.
+
+    Args:
+        metadata: metadata dictionary.
+        columns: columns of the data, one row of the table each.
+        metadata_columns: columns of the table, after the name column.
+
+    Returns:
+        metadata table, with the name of the columns of the data in its
+        first column.
+    """
+    dtypes = MetaGenMetadataColumn.polars_dtypes()
+    series = [
+        pl.Series(MetaGenMetadataColumn.NAME.value, columns, dtype=pl.String)
+    ]
+    for metadata_column in metadata_columns:
+        values_by_column = metadata.get(metadata_column, {})
+        values = [values_by_column.get(column) for column in columns]
+        if metadata_column in JSON_ENCODED_COLUMNS:
+            values = [encode_values(value) for value in values]
+        series.append(
+            pl.Series(
+                metadata_column.value,
+                values,
+                dtype=dtypes[metadata_column],
+                strict=False,
+            )
+        )
+    return pl.DataFrame(series)
+
+
+def _list_columns(table: pl.DataFrame) -> list[str]:
+    return [
+        column
+        for column, dtype in table.schema.items()
+        if isinstance(dtype, pl.List)
+    ]
+
+
+def flat_metadata_table(table: pl.DataFrame) -> pl.DataFrame:
+    """
+    Metadata table with its list columns, e.g. confidence intervals, and its
+    unique values written as text, for the formats without nested data, i.e.
+    CSV and Excel. The unique values are written as Python lists, e.g.
+    ``[datetime.date(2024, 1, 1), None]``.
+    """
+    return table.with_columns(
+        *(
+            pl.format(
+                "[{}]",
+                pl.col(column).cast(pl.List(pl.String)).list.join(", "),
+            ).alias(column)
+            for column in _list_columns(table)
+        ),
+        *(
+            pl.Series(
+                column.value,
+                [
+                    None if values is None else repr(values)
+                    for values in _decoded_values(table, column.value)
+                ],
+                dtype=pl.String,
+            )
+            for column in JSON_ENCODED_COLUMNS
+            if column.value in table.columns
+        ),
+    )
+
+
+def iter_metadata_records(table: pl.DataFrame) -> Iterator[ColumnMetadata]:
+    """
+    Rows of the metadata table as :class:`ColumnMetadata` records, with
+    decoded unique values.
+    """
+    name = MetaGenMetadataColumn.NAME.value
+    encoded = [column.value for column in JSON_ENCODED_COLUMNS]
+    for row in table.iter_rows(named=True):
+        column = row.pop(name)
+        metagen_type = row.get(MetaGenMetadataColumn.TYPE.value)
+        yield ColumnMetadata(
+            name=column,
+            metadata={
+                key: (
+                    decode_values(value, metagen_type)
+                    if key in encoded
+                    else value
+                )
+                for key, value in row.items()
+            },
+        )
+
+
+def metadata_table_to_dict(
+    table: pl.DataFrame,
+) -> dict[Hashable, dict[Hashable, Any]]:
+    """
+    Metadata table as a dictionary of the metadata of every column of the
+    data, i.e. ``{column: {metadata column: value}}``, with decoded unique
+    values.
+    """
+    return {
+        record.name: record.metadata  # type: ignore[misc]
+        for record in iter_metadata_records(table)
+    }
+
+
+def metadata_table_to_pandas(table: pl.DataFrame) -> pd.DataFrame:
+    """
+    Metadata table as a pandas DataFrame indexed by column name, with
+    decoded unique values and None for missing values.
+    """
+    import pandas as pd
+
+    metadata = table.to_pandas()
+    object_columns: dict[str, list[Any]] = {
+        column.value: _decoded_values(table, column.value)
+        for column in JSON_ENCODED_COLUMNS
+        if column.value in table.columns
+    }
+    object_columns.update(
+        {column: table[column].to_list() for column in _list_columns(table)}
+    )
+    for column, values in object_columns.items():
+        metadata[column] = pd.Series(
+            values, index=metadata.index, dtype=object
+        )
+    return metadata.replace(float("nan"), None).set_index(
+        MetaGenMetadataColumn.NAME.value
+    )
@@ -9,13 +9,14 @@ from __future__ import annotations
 
 import json
 import subprocess
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
 from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import numpy as np
-import pandas as pd
 import polars as pl
+from polars.datatypes.constants import N_INFER_DEFAULT
 
 from pymetagen._typing import (
     Any,
@@ -26,27 +27,80 @@ from pymetagen._typing import (
     OptionalAnyValueDict,
     OptionalPandasDataFrame,
 )
+from pymetagen.column_statistics import ColumnStatisticsStore
 from pymetagen.dataloader import DataLoader, LazyDataLoader
 from pymetagen.datatypes import (
     MetaGenDataType,
+    MetaGenExcelEngine,
+    MetaGenExecutionMode,
     MetaGenMetadataColumn,
     MetaGenSupportedFileExtension,
     MetaGenSupportedLoadingMode,
-    dtype_to_metagen_type,
 )
 from pymetagen.exceptions import (
+    ExecutionModeUnsupportedError,
     FileTypeUnsupportedError,
     LoadingModeUnsupportedError,
 )
+from pymetagen.metadata_table import (
+    ColumnMetadata,
+    build_metadata_table,
+    flat_metadata_table,
+    iter_metadata_records,
+    metadata_table_to_dict,
+    metadata_table_to_pandas,
+)
+from pymetagen.metrics import (
+    ROW_COUNT_ALIAS,
+    column_expression,
+    column_group_metric_expressions,
+    column_group_metric_values,
+    dtype_groups,
+    metadata_from_column_values,
+    metadata_from_metric_values,
+    metric_expressions,
+    resolve_metrics,
+    unique_values_expression,
+)
+from pymetagen.parquet_statistics import (
+    footer_partial_statistics,
+    parquet_files,
+)
+from pymetagen.profiling import MetaGenProfiler, ProfileRecord
+from pymetagen.result_cache import (
+    MetadataResultCache,
+    input_fingerprint,
+    result_cache_key,
+)
+from pymetagen.sampling import sample_size, scale_sampled_metadata
+from pymetagen.sketches import (
+    hyperloglog_precision,
+    kll_k,
+)
+from pymetagen.statistics import (
+    PartialColumnStatistics,
+    merge_partial_statistics,
+    metadata_from_partial_statistics,
+    quantile_metadata,
+    quantile_sketches,
+    streaming_partial_statistics,
+)
+from pymetagen.stats_cache import PartialStatisticsCache
 from pymetagen.utils import (
     CustomDecoder,
     CustomEncoder,
+    DataSchema,
     InspectionMode,
     collect,
     extract_data,
     get_data_schema,
+    sample,
+    select_columns,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class MetaGen:
     """
@@ -64,6 +118,69 @@ class MetaGen:
         loading_mode: Loading mode to use.
                      See :class:`pymetagen.datatypes.MetaGenSupportedLoadingModes`
                      for supported modes.
+        execution: Execution mode used to compute the metadata.
+                   See :class:`pymetagen.datatypes.MetaGenExecutionMode`
+                   for supported modes.
+        batch_size: Number of queries collected together by the batched and
+                    wide execution modes.
+        column_batch_size: Number of columns of the same data type computed
+                           by a single query in the wide execution mode.
+        chunk_size: Number of rows in a chunk of the streaming execution
+                    mode.
+        approx_unique: Flag for estimating the number of unique values with
+                       a HyperLogLog sketch instead of counting them exactly.
+                       The metadata column is then named '# unique (approx)'.
+                       Always set by the streaming execution mode.
+        approx_unique_error: Relative standard error of the approximate number
+                             of unique values. Determines the sketch size.
+        quantiles: Flag for adding the 25%, 50%, 75%, 95% and 99% quantiles of
+                   the numeric columns, estimated with a KLL sketch.
+        quantile_error: Rank error of the estimated quantiles, e.g. 0.01 for
+                        quantiles within one percentile of the exact ones.
+                        Determines the sketch size.
+        max_number_of_unique_to_show: Unique values of a column are listed in
+                                      the metadata only when there are fewer
+                                      than this number of them.
+        sample: Compute the metadata on a random sample of the data, of this
+                number of rows if an integer or of this fraction of the rows
+                if a float. Count metrics are scaled to the whole data and
+                reported with their 95% confidence intervals.
+        random_seed: Seed of the random sample.
+        columns: Names of the columns to compute the metadata of, all of them
+                 if not given. Globs, e.g. 'price_*', and regular expressions
+                 starting with '^' and ending with '$' are allowed. The other
+                 columns are projected out of the data before any query.
+        metrics: Metrics to compute, as metadata columns or their names, e.g.
+                 '# nulls', all of them if not given. See
+                 :meth:`pymetagen.datatypes.MetaGenMetadataColumn.metric_columns`.
+        path: Path the data was loaded from. Required by the footer execution
+              mode, which reads the statistics of the parquet files in it.
+        stats_cache_path: Path of a sidecar cache of the partial statistics
+                          of every file in `path`, used by the streaming
+                          execution mode. Only the files that are new or have
+                          changed since the cache was written are read.
+        result_cache_dir: Directory of an on-disk cache of metadata tables,
+                          keyed by the fingerprint of the files in `path` and
+                          the options above. A table computed before for
+                          unchanged files is returned without reading them.
+        hash_content: Flag for fingerprinting the files in `path` by the hash
+                      of their content instead of their size and modification
+                      time.
+        profiler: Profiler recording the wall time, rows scanned, peak
+                  memory of the process so far and query plan of every
+                  metric and column computed.
+                  See :class:`pymetagen.profiling.MetaGenProfiler`.
+        partition_index_dir: Directory of the persisted indexes of the
+                             parquet files of partitioned datasets, see
+                             :mod:`pymetagen.partition_index`, used to list
+                             the files in `path`.
+        partitions: Hive partitions of the files in `path` the data was
+                    loaded from, see
+                    :func:`pymetagen.partition_index.partition_filter`.
+        load_options: Options the data was loaded from `path` with, e.g.
+                      the `infer_schema_length` and `excel_engine` of
+                      :meth:`from_path`. Part of the key of the result
+                      cache, as they determine the loaded data.
     """
 
     def __init__(
@@ -72,20 +189,104 @@ class MetaGen:
         descriptions: dict[ColumnName, ColumnSimpleMetadata] | None = None,
         compute_metadata: bool = False,
         loading_mode: MetaGenSupportedLoadingMode | None = None,
+        execution: MetaGenExecutionMode = MetaGenExecutionMode.SEQUENTIAL,
+        batch_size: int = 32,
+        column_batch_size: int = 1024,
+        chunk_size: int = 100_000,
+        approx_unique: bool = False,
+        approx_unique_error: float = 0.01,
+        max_number_of_unique_to_show: int = 10,
+        quantiles: bool = False,
+        quantile_error: float = 0.01,
+        sample: int | float | None = None,
+        random_seed: int | None = None,
+        columns: Sequence[str] | None = None,
+        metrics: Sequence[MetaGenMetadataColumn | str] | None = None,
+        path: Path | str | None = None,
+        stats_cache_path: Path | str | None = None,
+        result_cache_dir: Path | str | None = None,
+        hash_content: bool = False,
+        profiler: MetaGenProfiler | None = None,
+        partition_index_dir: Path | str | None = None,
+        partitions: Mapping[str, Any] | None = None,
+        load_options: Mapping[str, Any] | None = None,
     ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if column_batch_size < 1:
+            raise ValueError("column_batch_size must be a positive integer.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        if stats_cache_path is not None and (
+            path is None or execution != MetaGenExecutionMode.STREAMING
+        ):
+            raise ValueError(
+                "stats_cache_path requires the path of the data and the"
+                f" {MetaGenExecutionMode.STREAMING.value} execution mode."
+            )
+        if result_cache_dir is not None and path is None:
+            raise ValueError("result_cache_dir requires the path of the data.")
+        if max_number_of_unique_to_show < 1:
+            raise ValueError(
+                "max_number_of_unique_to_show must be a positive integer."
+            )
+
+        if columns is not None:
+            data = data.select(
+                select_columns(get_data_schema(data).columns, columns)
+            )
         self.data = data
+        self.path = Path(path) if path is not None else None
+        self.stats_cache_path = (
+            Path(stats_cache_path) if stats_cache_path is not None else None
+        )
         self.data_schema = get_data_schema(self.data)
         self.columns = self.data_schema.columns
         self.columns_length = self.data_schema.length
         self.descriptions = descriptions or {}
-        if compute_metadata:
-            self.pandas_metadata = self._metadata
-
+        self.execution = execution
+        self.batch_size = batch_size
+        self.column_batch_size = column_batch_size
+        self.chunk_size = chunk_size
+        self.max_number_of_unique_to_show = max_number_of_unique_to_show
+        self.approx_unique_error = approx_unique_error
+        self.approx_unique = (
+            approx_unique or execution == MetaGenExecutionMode.STREAMING
+        )
+        self.approx_unique_precision = (
+            hyperloglog_precision(approx_unique_error)
+            if self.approx_unique
+            else None
+        )
+        self.metrics = (
+            resolve_metrics(metrics) if metrics is not None else None
+        )
+        self.quantiles = quantiles or any(
+            metric in MetaGenMetadataColumn.quantile_columns()
+            for metric in self.metrics or []
+        )
+        self.quantile_error = quantile_error
+        self.sample = sample
+        self.random_seed = random_seed
+        self.quantile_k = kll_k(quantile_error) if self.quantiles else None
+        self.result_cache = (
+            MetadataResultCache(result_cache_dir)
+            if result_cache_dir is not None
+            else None
+        )
+        self.hash_content = hash_content
+        self.profiler = profiler
+        self.partition_index_dir = partition_index_dir
+        self.partitions = partitions
+        self.load_options = dict(load_options or {})
+        self.column_statistics = ColumnStatisticsStore(self.data)
         self.loading_mode = loading_mode or (
             MetaGenSupportedLoadingMode.LAZY
             if isinstance(self.data, pl.LazyFrame)
             else MetaGenSupportedLoadingMode.EAGER
         )
+        if compute_metadata:
+            self.polars_metadata = self._polars_metadata
 
     @classmethod
     def from_path(
@@ -94,6 +295,27 @@ class MetaGen:
         loading_mode: MetaGenSupportedLoadingMode = MetaGenSupportedLoadingMode.LAZY,
         descriptions_path: Path | None = None,
         compute_metadata: bool = False,
+        execution: MetaGenExecutionMode = MetaGenExecutionMode.SEQUENTIAL,
+        batch_size: int = 32,
+        column_batch_size: int = 1024,
+        chunk_size: int = 100_000,
+        approx_unique: bool = False,
+        approx_unique_error: float = 0.01,
+        max_number_of_unique_to_show: int = 10,
+        quantiles: bool = False,
+        quantile_error: float = 0.01,
+        sample: int | float | None = None,
+        random_seed: int | None = None,
+        columns: Sequence[str] | None = None,
+        metrics: Sequence[MetaGenMetadataColumn | str] | None = None,
+        stats_cache_path: Path | str | None = None,
+        result_cache_dir: Path | str | None = None,
+        hash_content: bool = False,
+        profiler: MetaGenProfiler | None = None,
+        infer_schema_length: int | None = N_INFER_DEFAULT,
+        excel_engine: MetaGenExcelEngine | str | None = None,
+        partition_index_dir: Path | str | None = None,
+        partitions: Mapping[str, Any] | None = None,
     ) -> MetaGen:
         """
         Generate metadata from a file.
@@ -126,6 +348,55 @@ class MetaGen:
             loadin_mode: Loading mode to use. See :class:`pymetagen.datatypes.MetaGenSupportedLoadingModes` for supported
                 modes.
             compute_metadata: Flag for computing metadata on instantiation.
+            execution: Execution mode used to compute the metadata. See
+                :class:`pymetagen.datatypes.MetaGenExecutionMode` for supported
+                modes.
+            batch_size: Number of queries collected together by the batched
+                and wide execution modes.
+            column_batch_size: Number of columns of the same data type
+                computed by a single query in the wide execution mode.
+            chunk_size: Number of rows in a chunk of the streaming execution
+                mode.
+            approx_unique: Flag for estimating the number of unique values
+                with a HyperLogLog sketch instead of counting them exactly.
+            approx_unique_error: Relative standard error of the approximate
+                number of unique values.
+            max_number_of_unique_to_show: Unique values of a column are listed
+                in the metadata only when there are fewer than this number of
+                them.
+            quantiles: Flag for adding the 25%, 50%, 75%, 95% and 99%
+                quantiles of the numeric columns, estimated with a KLL sketch.
+            quantile_error: Rank error of the estimated quantiles.
+            sample: Number of rows, if an integer, or fraction of the rows,
+                if a float, of a random sample the metadata is computed on.
+            random_seed: Seed of the random sample.
+            columns: Names, globs or regular expressions of the columns to
+                compute the metadata of. Only these columns are read.
+            metrics: Metrics to compute, all of them if not given.
+            stats_cache_path: Path of a sidecar cache of the partial
+                statistics of every file in `path`, used by the streaming
+                execution mode to only read new or changed files.
+            result_cache_dir: Directory of an on-disk cache of metadata
+                tables, returned without reading the data when the file and
+                options are unchanged.
+            hash_content: Flag for fingerprinting the file by the hash of its
+                content instead of its size and modification time.
+            profiler: Profiler recording every metric and column computed.
+            infer_schema_length: Number of rows of CSV and JSON files read to
+                infer the data types of their columns, None to read all rows.
+            excel_engine: Engine reading Excel files, see
+                :class:`pymetagen.datatypes.MetaGenExcelEngine`. Defaults to
+                calamine if fastexcel is installed, otherwise openpyxl.
+            partition_index_dir: Directory of the persisted indexes of the
+                parquet files of partitioned datasets, refreshed
+                incrementally instead of listing the whole directory tree on
+                every run, see :mod:`pymetagen.partition_index`.
+            partitions: Hive partitions of a directory of partitioned
+                parquet files to load, pruned when listing the files so that
+                the files of the other partitions are never opened. Maps
+                every partition key to a value, a list of values or a
+                :class:`pymetagen.partition_index.PartitionRange`, e.g.
+                ``{"country": ["FR", "DE"], "year": PartitionRange(2020)}``.
         """
         mode_mapping = {
             MetaGenSupportedLoadingMode.LAZY: LazyDataLoader,
@@ -138,7 +409,15 @@ class MetaGen:
                 f"Mode {loading_mode} is not supported. Supported modes are: "
                 f"{MetaGenSupportedLoadingMode.values()}"
             )
-        data = loader_class(path)()
+        read_options = {"infer_schema_length": infer_schema_length}
+        data = loader_class(
+            path,
+            polars_read_csv_options=read_options,
+            polars_read_json_options=read_options,
+            excel_engine=excel_engine,
+            partition_index_dir=partition_index_dir,
+            partitions=partitions,
+        )()
 
         if descriptions_path is not None:
             func_map: dict[
@@ -163,19 +442,46 @@ class MetaGen:
             descriptions=descriptions,
             compute_metadata=compute_metadata,
             loading_mode=loading_mode,
+            execution=execution,
+            batch_size=batch_size,
+            column_batch_size=column_batch_size,
+            chunk_size=chunk_size,
+            approx_unique=approx_unique,
+            approx_unique_error=approx_unique_error,
+            max_number_of_unique_to_show=max_number_of_unique_to_show,
+            quantiles=quantiles,
+            quantile_error=quantile_error,
+            sample=sample,
+            random_seed=random_seed,
+            columns=columns,
+            metrics=metrics,
+            path=path,
+            stats_cache_path=stats_cache_path,
+            result_cache_dir=result_cache_dir,
+            hash_content=hash_content,
+            profiler=profiler,
+            partition_index_dir=partition_index_dir,
+            partitions=partitions,
+            load_options={
+                "infer_schema_length": infer_schema_length,
+                "excel_engine": excel_engine,
+            },
         )
 
     @cached_property
-    def _metadata(self):
-        return self.compute_metadata().reset_index()
+    def _polars_metadata(self) -> pl.DataFrame:
+        return self.compute_polars_metadata()
+
+    @cached_property
+    def _metadata(self) -> pd.DataFrame:
+        return metadata_table_to_pandas(self._polars_metadata).reset_index()
 
     @property
-    def _polars_metadata(self):
-        return pl.DataFrame(
-            data=self._metadata.to_dict("list"),
-            strict=False,
-            schema_overrides=MetaGenMetadataColumn.interger_dtypes(),
-        )
+    def pandas_metadata(self) -> pd.DataFrame:
+        """
+        Metadata table as a pandas DataFrame, converted on first access.
+        """
+        return self._metadata
 
     @staticmethod
     def _load_descriptions_from_json(
@@ -187,18 +493,534 @@ class MetaGen:
     def _load_descriptions_from_csv(
         path: Path,
     ) -> dict[ColumnName, ColumnSimpleMetadata]:
-        descriptions: dict[ColumnName, ColumnSimpleMetadata] = (
-            pd.read_csv(path).set_index("column_name").to_dict(orient="index")  # type: ignore[assignment]
-        )
+        descriptions: dict[ColumnName, ColumnSimpleMetadata] = {}
+        for row in pl.read_csv(path).iter_rows(named=True):
+            descriptions[row.pop("column_name")] = row  # type: ignore[assignment]
         return descriptions
 
-    def compute_metadata(self) -> pd.DataFrame:
+    def compute_metadata(
+        self, sample: int | float | None = None
+    ) -> pd.DataFrame:
+        """
+        Compute the metadata table of the data as a pandas DataFrame, see
+        :meth:`compute_polars_metadata`.
+
+        Args:
+            sample: Compute the metadata on a random sample of the data, of
+                this number of rows if an integer or of this fraction of the
+                rows if a float. Defaults to the `sample` of the instance.
+
+        Returns:
+            metadata table, indexed by column name.
+        """
+        return metadata_table_to_pandas(self.compute_polars_metadata(sample))
+
+    def compute_polars_metadata(
+        self, sample: int | float | None = None
+    ) -> pl.DataFrame:
+        """
+        Compute the metadata table of the data as a Polars DataFrame, with the
+        column names in its first column, ``Name``, and the unique values of
+        the columns JSON encoded, see :mod:`pymetagen.metadata_table`.
+
+        Args:
+            sample: Compute the metadata on a random sample of the data, of
+                this number of rows if an integer or of this fraction of the
+                rows if a float. Defaults to the `sample` of the instance.
+
+        Returns:
+            metadata table.
+        """
+        sample = self.sample if sample is None else sample
+        result_cache = self.result_cache
+        cache_key = self._result_cache_key(sample)
+        cached_metadata = self._cached_metadata(cache_key)
+        if cached_metadata is not None:
+            return cached_metadata
+
+        if self.profiler is not None and self.profiler.number_of_rows is None:
+            self.profiler.number_of_rows = self.column_statistics.row_count()
+        if sample is None:
+            metadata = self._compute_metadata_values()
+        else:
+            metadata = self._compute_sampled_metadata(sample)
+        metadata_table = self._metadata_table(
+            metadata, sampled=sample is not None
+        )
+
+        if result_cache is not None and cache_key is not None:
+            result_cache.put(cache_key, metadata_table)
+        return metadata_table
+
+    def iter_column_metadata(
+        self, sample: int | float | None = None
+    ) -> Iterator[ColumnMetadata]:
+        """
+        Compute the metadata batch of columns by batch of columns, yielding
+        the metadata of every column as soon as its batch is computed,
+        instead of computing the whole metadata table first. A batch is one
+        column in the sequential execution mode, `batch_size` columns in the
+        fused and batched modes and `column_batch_size` columns in the wide
+        mode. The streaming and footer modes read every column at once.
+
+        With a sample, every batch is computed on its own random sample of
+        the rows, the same rows if `random_seed` is set. Metadata tables in
+        the result cache are read from it, but the metadata computed batch by
+        batch is not added to it.
+
+        Args:
+            sample: Compute the metadata on a random sample of the data, see
+                :meth:`compute_polars_metadata`.
+
+        Yields:
+            metadata of every column, in the order of the columns of the
+            data.
+        """
+        if sample is None and "_polars_metadata" in self.__dict__:
+            yield from iter_metadata_records(self._polars_metadata)
+            return
+        cached_metadata = self._cached_metadata(
+            self._result_cache_key(self.sample if sample is None else sample)
+        )
+        if cached_metadata is not None:
+            yield from iter_metadata_records(cached_metadata)
+            return
+
+        batch_sizes = {
+            MetaGenExecutionMode.SEQUENTIAL: 1,
+            MetaGenExecutionMode.FUSED: self.batch_size,
+            MetaGenExecutionMode.BATCHED: self.batch_size,
+            MetaGenExecutionMode.WIDE: self.column_batch_size,
+        }
+        batch_size = batch_sizes.get(self.execution, self.columns_length)
+        if batch_size >= self.columns_length:
+            yield from iter_metadata_records(
+                self.compute_polars_metadata(sample)
+            )
+            return
+
+        for start in range(0, self.columns_length, batch_size):
+            subset = self._column_subset(
+                self.columns[start : start + batch_size]
+            )
+            yield from iter_metadata_records(
+                subset.compute_polars_metadata(sample)
+            )
+
+    def _column_subset(self, columns: Sequence[ColumnName]) -> MetaGen:
+        """
+        MetaGen of some of the columns of the data, with the same options,
+        without result cache.
+        """
+        return MetaGen(
+            data=self.data.select(pl.col(column) for column in columns),
+            descriptions=self.descriptions,
+            loading_mode=self.loading_mode,
+            execution=self.execution,
+            batch_size=self.batch_size,
+            column_batch_size=self.column_batch_size,
+            chunk_size=self.chunk_size,
+            approx_unique=self.approx_unique,
+            approx_unique_error=self.approx_unique_error,
+            max_number_of_unique_to_show=self.max_number_of_unique_to_show,
+            quantiles=self.quantiles,
+            quantile_error=self.quantile_error,
+            sample=self.sample,
+            random_seed=self.random_seed,
+            metrics=self.metrics,
+            profiler=self.profiler,
+        )
+
+    def _cached_metadata(self, cache_key: str | None) -> pl.DataFrame | None:
+        """
+        Metadata table of a key in the result cache, None if not cached.
+        """
+        if self.result_cache is None or cache_key is None:
+            return None
+        return self.result_cache.get(cache_key)
+
+    def _result_cache_key(self, sample: int | float | None) -> str | None:
+        """
+        Key of the metadata table in the result cache, None if it cannot be
+        cached: without a cache, or for a sample drawn without a seed.
+        """
+        if self.result_cache is None or (
+            sample is not None and self.random_seed is None
+        ):
+            return None
+        options = {
+            "loading_mode": self.loading_mode,
+            "load_options": self.load_options,
+            "schema": {
+                column: str(dtype)
+                for column, dtype in self.data_schema.schema.items()
+            },
+            "descriptions": self.descriptions,
+            "execution": self.execution,
+            "chunk_size": self.chunk_size,
+            "column_batch_size": self.column_batch_size,
+            "approx_unique_precision": self.approx_unique_precision,
+            "max_number_of_unique_to_show": self.max_number_of_unique_to_show,
+            "quantile_k": self.quantile_k,
+            "metrics": self.metrics,
+            "sample": sample,
+            "random_seed": self.random_seed,
+        }
+        fingerprint = input_fingerprint(
+            self.path,  # type: ignore[arg-type]
+            hash_content=self.hash_content,
+            partition_index_dir=self.partition_index_dir,
+            partitions=self.partitions,
+        )
+        return result_cache_key(fingerprint, options)
+
+    def _compute_metadata_values(
+        self,
+    ) -> dict[Hashable, dict[Hashable, Any]]:
+        execution_mapping: dict[
+            MetaGenExecutionMode,
+            Callable[[], dict[Hashable, dict[Hashable, Any]]],
+        ] = {
+            MetaGenExecutionMode.SEQUENTIAL: self._compute_sequential_metadata,
+            MetaGenExecutionMode.FUSED: self._compute_fused_metadata,
+            MetaGenExecutionMode.BATCHED: self._compute_batched_metadata,
+            MetaGenExecutionMode.WIDE: self._compute_wide_metadata,
+            MetaGenExecutionMode.STREAMING: self._compute_streaming_metadata,
+            MetaGenExecutionMode.FOOTER: self._compute_footer_metadata,
+        }
+        try:
+            compute = execution_mapping[self.execution]
+        except KeyError:
+            raise ExecutionModeUnsupportedError(
+                f"Execution mode {self.execution} is not supported. Supported"
+                f" modes are: {MetaGenExecutionMode.values()}"
+            )
+
+        metadata = compute()
+        if self.quantiles and self.execution not in (
+            MetaGenExecutionMode.STREAMING,
+            MetaGenExecutionMode.FOOTER,
+        ):
+            metadata.update(self._compute_quantile_metadata())
+        return metadata
+
+    def _compute_sampled_metadata(
+        self, rows_or_fraction: int | float
+    ) -> dict[Hashable, dict[Hashable, Any]]:
+        """
+        Compute the metadata of a random sample of the data, with the count
+        metrics scaled to the whole data.
+        """
+        if self.execution == MetaGenExecutionMode.FOOTER:
+            raise ExecutionModeUnsupportedError(
+                f"Execution mode {MetaGenExecutionMode.FOOTER.value} reads"
+                " the statistics of every file and cannot be sampled."
+            )
+        number_of_rows = self.column_statistics.row_count()
+        size = sample_size(number_of_rows, rows_or_fraction)
+        sampled = MetaGen(
+            data=self.data.pipe(
+                sample, tbl_rows=size, random_seed=self.random_seed
+            ),
+            execution=self.execution,
+            batch_size=self.batch_size,
+            column_batch_size=self.column_batch_size,
+            chunk_size=self.chunk_size,
+            approx_unique=self.approx_unique,
+            approx_unique_error=self.approx_unique_error,
+            max_number_of_unique_to_show=self.max_number_of_unique_to_show,
+            quantiles=self.quantiles,
+            quantile_error=self.quantile_error,
+            metrics=self.metrics,
+            profiler=self.profiler,
+        )
+        return scale_sampled_metadata(
+            sampled._compute_metadata_values(), size, number_of_rows
+        )
+
+    def _compute_quantile_metadata(
+        self,
+    ) -> dict[Hashable, dict[Hashable, Any]]:
+        """
+        Estimate the quantiles of the numeric columns with KLL sketches, built
+        from the data read chunk by chunk instead of sorting every column.
+        The streaming execution mode builds the sketches with its partial
+        statistics.
+        """
+        with self._profile("quantiles", self.columns, self.data.lazy()):
+            sketches = quantile_sketches(
+                self.data,
+                self.data_schema,
+                k=self.quantile_k,  # type: ignore[arg-type]
+                chunk_size=self.chunk_size,
+            )
+        metadata: dict[Hashable, dict[Hashable, Any]] = {
+            column: {} for column in MetaGenMetadataColumn.quantile_columns()
+        }
+        for column in self.columns:
+            for metric, value in quantile_metadata(
+                sketches.get(column)
+            ).items():
+                metadata[metric][column] = value
+        return metadata
+
+    def _compute_fused_metadata(self) -> dict[Hashable, dict[Hashable, Any]]:
+        """
+        Compute every metric of every column in a single query over the data.
+        """
+        query = self.data.lazy().select(
+            metric_expressions(
+                self.data_schema,
+                max_number_of_unique_to_show=self.max_number_of_unique_to_show,
+                approx_unique_precision=self.approx_unique_precision,
+                metrics=self.metrics,
+            )
+        )
+        with self._profile(self._metrics_label(), self.columns, query):
+            metric_values = query.pipe(collect).row(0, named=True)
+        return metadata_from_metric_values(
+            metric_values,
+            self.data_schema,
+            max_number_of_unique_to_show=self.max_number_of_unique_to_show,
+            approx_unique_precision=self.approx_unique_precision,
+            metrics=self.metrics,
+        )
+
+    def _compute_batched_metadata(
+        self,
+    ) -> dict[Hashable, dict[Hashable, Any]]:
+        """
+        Compute the metrics with one query per column. The queries are
+        collected together, `batch_size` at a time, so Polars can share their
+        common subplans and run them on its thread pool while the number of
+        results held in memory stays bounded.
+        """
+        data = self.data.lazy()
+        queries = [
+            data.select(
+                metric_expressions(
+                    DataSchema(schema={column: dtype}),
+                    max_number_of_unique_to_show=(
+                        self.max_number_of_unique_to_show
+                    ),
+                    approx_unique_precision=self.approx_unique_precision,
+                    metrics=self.metrics,
+                )
+            )
+            for column, dtype in self.data_schema.schema.items()
+        ]
+
+        metric_values: dict[str, Any] = {}
+        for start in range(0, len(queries), self.batch_size):
+            batch = queries[start : start + self.batch_size]
+            with self._profile(
+                self._metrics_label(),
+                self.columns[start : start + self.batch_size],
+                batch,
+            ):
+                for result in pl.collect_all(batch):
+                    metric_values.update(result.row(0, named=True))
+
+        return metadata_from_metric_values(
+            metric_values,
+            self.data_schema,
+            max_number_of_unique_to_show=self.max_number_of_unique_to_show,
+            approx_unique_precision=self.approx_unique_precision,
+            metrics=self.metrics,
+        )
+
+    def _compute_wide_metadata(self) -> dict[Hashable, dict[Hashable, Any]]:
+        """
+        Compute the metrics of the columns grouped by data type. A group is
+        computed `column_batch_size` columns at a time, with a single
+        expression per metric expanded by Polars to every column of the
+        batch, so the number of expressions built and planned does not grow
+        with the number of columns. Each query only reads the columns of its
+        batch, and the queries are collected together, `batch_size` at a
+        time, like in the batched execution mode.
+        """
+        data = self.data.lazy()
+        batches = []
+        for dtype, columns in dtype_groups(self.data_schema).items():
+            for start in range(0, len(columns), self.column_batch_size):
+                batch = columns[start : start + self.column_batch_size]
+                expressions = column_group_metric_expressions(
+                    batch,
+                    dtype,
+                    max_number_of_unique_to_show=(
+                        self.max_number_of_unique_to_show
+                    ),
+                    approx_unique_precision=self.approx_unique_precision,
+                    metrics=self.metrics,
+                )
+                query = data.select(
+                    pl.len().alias(ROW_COUNT_ALIAS), *expressions.values()
+                )
+                batches.append((batch, list(expressions), query))
+
+        row_count = 0
+        columns_values: dict[ColumnName, dict[MetaGenMetadataColumn, Any]] = {}
+        for start in range(0, len(batches), self.batch_size):
+            collected = batches[start : start + self.batch_size]
+            queries = [query for _, _, query in collected]
+            with self._profile(
+                self._metrics_label(),
+                [column for batch, _, _ in collected for column in batch],
+                queries,
+            ):
+                results = pl.collect_all(queries)
+            for (batch, metrics, _), result in zip(collected, results):
+                row_count, *row = result.row(0)
+                columns_values.update(
+                    column_group_metric_values(row, batch, metrics)
+                )
+
+        return metadata_from_column_values(
+            columns_values,
+            self.data_schema,
+            row_count,
+            max_number_of_unique_to_show=self.max_number_of_unique_to_show,
+            approx_unique_precision=self.approx_unique_precision,
+            metrics=self.metrics,
+        )
+
+    def _compute_streaming_metadata(
+        self,
+    ) -> dict[Hashable, dict[Hashable, Any]]:
+        """
+        Compute the metrics chunk by chunk, `chunk_size` rows at a time, and
+        merge the partial statistics of the chunks. A LazyFrame is read on the
+        Polars streaming engine, so memory is bounded by the chunk size and
+        not by the size of the data.
+        """
+        if self.stats_cache_path is not None:
+            partials = self._cached_partial_statistics()
+        else:
+            partials = self._streaming_partial_statistics(self.data)
+        return metadata_from_partial_statistics(partials, self.data_schema)
+
+    def _streaming_partial_statistics(
+        self, data: DataFrameT
+    ) -> dict[ColumnName, PartialColumnStatistics]:
+        with self._profile(
+            self._metrics_label(), self.columns, data.lazy()
+        ) as record:
+            partials = streaming_partial_statistics(
+                data,
+                self.data_schema,
+                precision=self.approx_unique_precision,  # type: ignore[arg-type]
+                max_number_of_unique_to_show=self.max_number_of_unique_to_show,
+                chunk_size=self.chunk_size,
+                quantile_k=self.quantile_k,
+            )
+            if record is not None and partials:
+                record.rows_scanned = next(iter(partials.values())).count
+        return partials
+
+    def _cached_partial_statistics(
+        self,
+    ) -> dict[ColumnName, PartialColumnStatistics]:
+        """
+        Partial statistics of the data merged file by file, reading only the
+        files missing from the statistics cache, or changed since.
+        Partitioned parquet datasets are cached per file, any other file as a
+        whole.
+        """
+        assert self.path is not None and self.stats_cache_path is not None
+        path, stats_cache_path = self.path, self.stats_cache_path
+
+        cache = PartialStatisticsCache(
+            stats_cache_path,
+            self.data_schema,
+            precision=self.approx_unique_precision,  # type: ignore[arg-type]
+            max_number_of_unique_to_show=self.max_number_of_unique_to_show,
+            quantile_k=self.quantile_k,
+        )
+        is_parquet = path.suffix in (
+            MetaGenSupportedFileExtension.PARQUET.value,
+            MetaGenSupportedFileExtension.NONE.value,
+        )
+        files = (
+            parquet_files(path, self.partition_index_dir, self.partitions)
+            if is_parquet
+            else [path]
+        )
+
+        files_partials = []
+        for file in files:
+            partials = cache.get(file)
+            if partials is None:
+                data = (
+                    self._scan_parquet_file(file) if is_parquet else self.data
+                )
+                partials = self._streaming_partial_statistics(data)
+                cache.put(file, partials)
+            files_partials.append(partials)
+
+        cache.save()
+        partials = merge_partial_statistics(files_partials)
+        if not partials:
+            partials = self._streaming_partial_statistics(self.data.clear())
+        return partials
+
+    def _scan_parquet_file(self, path: Path) -> pl.LazyFrame:
+        """
+        Scan a single file of a partitioned parquet dataset, with its hive
+        partition columns, in the schema of the whole dataset.
+        """
+        return (
+            pl.scan_parquet(path, hive_partitioning=True)
+            .select(self.columns)
+            .cast(self.data_schema.schema)  # type: ignore[arg-type]
+        )
+
+    def _compute_footer_metadata(self) -> dict[Hashable, dict[Hashable, Any]]:
+        """
+        Compute min, max and number of nulls from the row group statistics
+        in the footers of the parquet files the data was loaded from. Only the
+        row groups of the columns without statistics are read. The other
+        metrics are left empty.
+        """
+        if (
+            self.path is None
+            or self.path.suffix
+            not in (
+                MetaGenSupportedFileExtension.PARQUET.value,
+                MetaGenSupportedFileExtension.NONE.value,
+            )
+            or not parquet_files(
+                self.path, self.partition_index_dir, self.partitions
+            )
+        ):
+            raise ExecutionModeUnsupportedError(
+                f"Execution mode {MetaGenExecutionMode.FOOTER.value} requires"
+                " the path of the parquet files the data was loaded from, use"
+                " MetaGen.from_path and do not filter or extract the data in"
+                " place."
+            )
+        with self._profile(
+            self._metrics_label(), self.columns, rows_scanned=0
+        ):
+            partials = footer_partial_statistics(
+                self.path,
+                self.data_schema,
+                self.partition_index_dir,
+                self.partitions,
+            )
+        return metadata_from_partial_statistics(partials, self.data_schema)
+
+    def _compute_sequential_metadata(
+        self,
+    ) -> dict[Hashable, dict[Hashable, Any]]:
+        """
+        Compute every metric column by column, each with its own query over
+        the data.
+        """
         columns_to_drop = [
             "25%",
             "50%",
             "75%",
         ]
-        pymetagen_columns = MetaGenMetadataColumn.pymetagen_columns()
         assert_msg = (
             "Internal error: while calculating '{}' metadata."
             " Number of columns in metadata table does not match number of"
@@ -206,7 +1028,6 @@ class MetaGen:
         )
 
         metadata: dict[Hashable, dict[Hashable, Any]] = {}
-        columns = self.columns
         length_of_columns = self.columns_length
 
         simple_metadata = self._get_simple_metadata(
@@ -216,60 +1037,132 @@ class MetaGen:
             assert len(data) == length_of_columns, assert_msg.format(column)
         metadata.update(simple_metadata)
 
-        number_of_null_and_zeros = self._number_of_null_and_zeros(
-            metadata[MetaGenMetadataColumn.TYPE]
-        )
-        assert (
-            len(number_of_null_and_zeros) == length_of_columns
-        ), assert_msg.format("null and zeros")
-        metadata[MetaGenMetadataColumn.NUMBER_EMPTY_ZERO] = (
-            number_of_null_and_zeros
-        )
+        if self._computes(MetaGenMetadataColumn.NUMBER_EMPTY_ZERO):
+            number_of_null_and_zeros = self._number_of_null_and_zeros()
+            assert (
+                len(number_of_null_and_zeros) == length_of_columns
+            ), assert_msg.format("null and zeros")
+            metadata[MetaGenMetadataColumn.NUMBER_EMPTY_ZERO] = (
+                number_of_null_and_zeros
+            )
 
-        number_of_positive_values = self._number_of_positive_values(
-            metadata[MetaGenMetadataColumn.TYPE]
-        )
-        assert (
-            len(number_of_positive_values) == length_of_columns
-        ), assert_msg.format("positive values")
-        metadata[MetaGenMetadataColumn.NUMBER_POSITIVE] = (
-            number_of_positive_values
-        )
+        if self._computes(MetaGenMetadataColumn.NUMBER_POSITIVE):
+            number_of_positive_values = self._number_of_positive_values()
+            assert (
+                len(number_of_positive_values) == length_of_columns
+            ), assert_msg.format("positive values")
+            metadata[MetaGenMetadataColumn.NUMBER_POSITIVE] = (
+                number_of_positive_values
+            )
 
-        number_of_negative_values = self._number_of_negative_values(
-            metadata[MetaGenMetadataColumn.TYPE]
-        )
-        assert (
-            len(number_of_negative_values) == length_of_columns
-        ), assert_msg.format("negative values")
-        metadata[MetaGenMetadataColumn.NUMBER_NEGATIVE] = (
-            number_of_negative_values
-        )
+        if self._computes(MetaGenMetadataColumn.NUMBER_NEGATIVE):
+            number_of_negative_values = self._number_of_negative_values()
+            assert (
+                len(number_of_negative_values) == length_of_columns
+            ), assert_msg.format("negative values")
+            metadata[MetaGenMetadataColumn.NUMBER_NEGATIVE] = (
+                number_of_negative_values
+            )
 
-        minimal_string_length = self._minimal_string_length(metadata["Type"])
-        assert (
-            len(minimal_string_length) == length_of_columns
-        ), assert_msg.format("minimal string length")
-        metadata[MetaGenMetadataColumn.MIN_LENGTH] = minimal_string_length
+        if self._computes(MetaGenMetadataColumn.MIN_LENGTH):
+            minimal_string_length = self._minimal_string_length()
+            assert (
+                len(minimal_string_length) == length_of_columns
+            ), assert_msg.format("minimal string length")
+            metadata[MetaGenMetadataColumn.MIN_LENGTH] = minimal_string_length
+
+        if self._computes(MetaGenMetadataColumn.MAX_LENGTH):
+            maximal_string_length = self._maximal_string_length()
+            assert (
+                len(maximal_string_length) == length_of_columns
+            ), assert_msg.format("maximal string length")
+            metadata[MetaGenMetadataColumn.MAX_LENGTH] = maximal_string_length
+
+        if self._computes(MetaGenMetadataColumn.NUMBER_UNIQUE):
+            number_of_unique_counts = self._number_of_unique_counts()
+            assert (
+                len(number_of_unique_counts) == length_of_columns
+            ), assert_msg.format("number of unique counts")
+            metadata[MetaGenMetadataColumn.NUMBER_UNIQUE] = (
+                number_of_unique_counts
+            )
+
+        if self._computes(MetaGenMetadataColumn.VALUES):
+            number_of_unique_values = self._number_of_unique_values()
+            assert (
+                len(number_of_unique_values) == length_of_columns
+            ), assert_msg.format("number of unique values")
+            metadata[MetaGenMetadataColumn.VALUES] = number_of_unique_values
 
-        maximal_string_length = self._maximal_string_length(metadata["Type"])
-        assert (
-            len(maximal_string_length) == length_of_columns
-        ), assert_msg.format("maximal string length")
-        metadata[MetaGenMetadataColumn.MAX_LENGTH] = maximal_string_length
+        return metadata
 
-        number_of_unique_counts = self._number_of_unique_counts()
-        assert (
-            len(number_of_unique_counts) == length_of_columns
-        ), assert_msg.format("number of unique counts")
-        metadata[MetaGenMetadataColumn.NUMBER_UNIQUE] = number_of_unique_counts
+    def _profile(
+        self,
+        metric: str,
+        columns: Sequence[ColumnName],
+        query: pl.LazyFrame | Sequence[pl.LazyFrame] | None = None,
+        rows_scanned: int | None = None,
+    ) -> AbstractContextManager[ProfileRecord | None]:
+        """
+        Profile a step of the computation with the profiler, if any, see
+        :meth:`pymetagen.profiling.MetaGenProfiler.profile`. A step without a
+        query scans no rows, unless `rows_scanned` is given.
+        """
+        if self.profiler is None:
+            return nullcontext()
+        if query is None and rows_scanned is None:
+            rows_scanned = 0
+        return self.profiler.profile(metric, columns, query, rows_scanned)
+
+    def _metrics_label(self) -> str:
+        """
+        Name of the metrics computed together by a single query.
+        """
+        if self.metrics is None:
+            return "all metrics"
+        return ", ".join(metric.value for metric in self.metrics)
 
-        number_of_unique_values = self._number_of_unique_values()
-        assert (
-            len(number_of_unique_values) == length_of_columns
-        ), assert_msg.format("number of unique values")
-        metadata[MetaGenMetadataColumn.VALUES] = number_of_unique_values
+    def _computes(self, metric: MetaGenMetadataColumn) -> bool:
+        """
+        Returns True if the metric was requested, see the `metrics` argument.
+        """
+        return self.metrics is None or metric in self.metrics
 
+    def _metadata_table(
+        self,
+        metadata: dict[Hashable, dict[Hashable, Any]],
+        sampled: bool = False,
+    ) -> pl.DataFrame:
+        """
+        Build the metadata table from the computed metrics and the column
+        descriptions.
+        """
+        columns = self.columns
+        pymetagen_columns = MetaGenMetadataColumn.pymetagen_columns(
+            approx_unique=self.approx_unique,
+            quantiles=self.quantiles,
+            sampled=sampled,
+        )
+        if self.metrics is not None:
+            intervals = MetaGenMetadataColumn.confidence_interval_columns()
+            shown = {
+                MetaGenMetadataColumn.LONG_NAME,
+                MetaGenMetadataColumn.TYPE,
+                MetaGenMetadataColumn.DESCRIPTION,
+                *self.metrics,
+                *(intervals[m] for m in self.metrics if m in intervals),
+            }
+            if MetaGenMetadataColumn.NUMBER_UNIQUE in self.metrics:
+                shown.add(MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX)
+            pymetagen_columns = [
+                column for column in pymetagen_columns if column in shown
+            ]
+        for quantile_column in MetaGenMetadataColumn.quantile_columns():
+            metadata.setdefault(quantile_column, {})
+        if self.approx_unique:
+            metadata[MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX] = (
+                metadata.pop(MetaGenMetadataColumn.NUMBER_UNIQUE, {})
+            )
         metadata[MetaGenMetadataColumn.DESCRIPTION] = {}
         metadata[MetaGenMetadataColumn.LONG_NAME] = {}
         for column in columns:
@@ -283,18 +1176,16 @@ class MetaGen:
                 description_data.get("long_name", "")
             )
 
-        full_metadata = pd.DataFrame(
-            data=metadata,
-        ).replace(np.nan, None)
-        full_metadata.index.name = MetaGenMetadataColumn.NAME.value
-        return full_metadata[pymetagen_columns].rename(
-            columns=MetaGenMetadataColumn.as_dict()
-        )
+        return build_metadata_table(metadata, columns, pymetagen_columns)
 
     def metadata_by_output_format(
         self,
     ) -> dict[str, pd.DataFrame | dict[Hashable, Any]]:
-        metadata = self.compute_metadata()
+        """
+        Metadata table as pandas DataFrames and a dictionary, as written by
+        each output format when given to :meth:`write_metadata`.
+        """
+        metadata = self._metadata.set_index(MetaGenMetadataColumn.NAME.value)
         return {
             MetaGenSupportedFileExtension.PARQUET.value: metadata,
             MetaGenSupportedFileExtension.CSV.value: metadata.reset_index(),
@@ -308,177 +1199,234 @@ class MetaGen:
         self, columns_to_drop: list[str] | None = None
     ) -> dict[Hashable, Any]:
         columns_to_drop = columns_to_drop or []
-        table = (
-            self.data.with_columns(pl.col(pl.Categorical).cast(pl.Utf8))
-            .pipe(collect)
-            .describe()
-            .to_pandas()
-            .convert_dtypes()
-        )
-        description_col = table.columns[0]
-        metadata_table = (
-            table.rename(columns={description_col: "Name"})
-            .set_index("Name")
-            .T.drop(columns=columns_to_drop)
-            .rename(
-                columns={
-                    "null_count": MetaGenMetadataColumn.NUMBER_NULLS,
-                    "min": MetaGenMetadataColumn.MIN,
-                    "max": MetaGenMetadataColumn.MAX,
-                    "mean": MetaGenMetadataColumn.MEAN,
-                    "std": MetaGenMetadataColumn.STD,
-                }
-            )
-            .astype(
-                {
-                    MetaGenMetadataColumn.NUMBER_NULLS: int,
-                    MetaGenMetadataColumn.MIN: str,
-                    MetaGenMetadataColumn.MAX: str,
-                }
-            )
-            .to_dict()
+        query = self.data.lazy().with_columns(
+            pl.col(pl.Categorical).cast(pl.Utf8)
         )
-
-        types_: dict[Hashable, str] = {}
-        for col, type_ in self.data_schema.schema.items():
-            types_[col] = dtype_to_metagen_type(type_)
-        metadata_table[MetaGenMetadataColumn.TYPE] = types_
+        with self._profile("describe", self.columns, query):
+            described = query.pipe(collect).describe()
+        statistic_names = {
+            "null_count": MetaGenMetadataColumn.NUMBER_NULLS,
+            "min": MetaGenMetadataColumn.MIN,
+            "max": MetaGenMetadataColumn.MAX,
+            "mean": MetaGenMetadataColumn.MEAN,
+            "std": MetaGenMetadataColumn.STD,
+        }
+        statistics = described.get_column(described.columns[0]).to_list()
+        metadata_table: dict[Hashable, Any] = {
+            statistic_names.get(statistic, statistic): {}
+            for statistic in statistics
+            if statistic not in columns_to_drop
+        }
+        for col in self.columns:
+            values = described.get_column(col)
+            finite_values = values.drop_nulls()
+            if (
+                values.dtype.is_float()
+                and (
+                    finite_values.is_finite()
+                    & (finite_values.round() == finite_values)
+                ).all()
+            ):
+                # statistics of whole numbers are shown as integers
+                values = values.cast(pl.Int64)
+            for statistic, value in zip(statistics, values.to_list()):
+                if statistic in columns_to_drop:
+                    continue
+                metric = statistic_names.get(statistic, statistic)
+                if metric == MetaGenMetadataColumn.NUMBER_NULLS:
+                    value = int(value)
+                elif metric in (
+                    MetaGenMetadataColumn.MIN,
+                    MetaGenMetadataColumn.MAX,
+                ):
+                    value = None if value is None else str(value)
+                metadata_table[metric][col] = value
+
+        metadata_table[MetaGenMetadataColumn.TYPE] = {
+            col: self.column_statistics.metagen_type(col)
+            for col in self.columns
+        }
 
         return metadata_table
 
-    def _number_of_null_and_zeros(
-        self, types: dict[Hashable, MetaGenDataType]
-    ) -> dict[Hashable, int]:
+    def _number_of_null_and_zeros(self) -> dict[Hashable, int]:
         nulls: dict[Hashable, int] = {}
         for col in self.columns:
-            data = self.data.pipe(collect).select(col)
-            null_count = data.null_count().row(0)[0]
-            zero_count = (
-                data.filter(pl.col(col) == 0).shape[0]
-                if types[col] in MetaGenDataType.numeric_data_types()
-                else 0
-            )
-            nulls[col] = zero_count + null_count
+            query = (
+                self.data.lazy().select((pl.col(col) == 0).sum())
+                if self._is_numeric(col)
+                else None
+            )
+            with self._profile(
+                MetaGenMetadataColumn.NUMBER_EMPTY_ZERO.value, [col], query
+            ):
+                zero_count = (
+                    query.pipe(collect).item() if query is not None else 0
+                )
+                nulls[col] = zero_count + self.column_statistics.null_count(
+                    col
+                )
         return nulls
 
-    def _number_of_positive_values(
-        self, types: dict[Hashable, MetaGenDataType]
-    ) -> dict[Hashable, int | None]:
+    def _number_of_positive_values(self) -> dict[Hashable, int | None]:
         pos: dict[Hashable, int | None] = {}
         for col in self.columns:
-            pos_count = (
-                self.data.filter(pl.col(col) > 0).pipe(collect).shape[0]
-                if types[col] in MetaGenDataType.numeric_data_types()
+            query = (
+                self.data.lazy().select((pl.col(col) > 0).sum())
+                if self._is_numeric(col)
                 else None
             )
-            pos[col] = pos_count
+            with self._profile(
+                MetaGenMetadataColumn.NUMBER_POSITIVE.value, [col], query
+            ):
+                pos[col] = (
+                    query.pipe(collect).item() if query is not None else None
+                )
         return pos
 
-    def _number_of_negative_values(
-        self, types: dict[Hashable, MetaGenDataType]
-    ) -> dict[Hashable, int | None]:
+    def _number_of_negative_values(self) -> dict[Hashable, int | None]:
         neg: dict[Hashable, int | None] = {}
         for col in self.columns:
-            neg_count = (
-                self.data.filter(pl.col(col) < 0).pipe(collect).shape[0]
-                if types[col] in MetaGenDataType.numeric_data_types()
+            query = (
+                self.data.lazy().select((pl.col(col) < 0).sum())
+                if self._is_numeric(col)
                 else None
             )
-            neg[col] = neg_count
+            with self._profile(
+                MetaGenMetadataColumn.NUMBER_NEGATIVE.value, [col], query
+            ):
+                neg[col] = (
+                    query.pipe(collect).item() if query is not None else None
+                )
         return neg
 
-    def _minimal_string_length(
-        self, types: dict[Hashable, MetaGenDataType]
-    ) -> dict[Hashable, int | None]:
+    def _minimal_string_length(self) -> dict[Hashable, int | None]:
         min_str_length: dict[Hashable, int | None] = {}
         for col in self.columns:
-            if types[col] in MetaGenDataType.categorical_data_types():
+            query = (
+                self.data.lazy().select(
+                    pl.col(col).cast(pl.Utf8).str.len_bytes().min()
+                )
+                if self._is_string(col)
+                else None
+            )
+            with self._profile(
+                MetaGenMetadataColumn.MIN_LENGTH.value, [col], query
+            ):
                 min_str_length[col] = (
-                    self.data.with_columns(
-                        pl.col(col)
-                        .cast(pl.Utf8)
-                        .str.len_bytes()
-                        .alias(f"{col}_len")
-                    )
-                    .select(f"{col}_len")
-                    .min()
-                    .pipe(collect)
-                    .row(0)[0]
+                    query.pipe(collect).item() if query is not None else None
                 )
-            else:
-                min_str_length[col] = None
         return min_str_length
 
-    def _maximal_string_length(
-        self, types: dict[Hashable, MetaGenDataType]
-    ) -> dict[Hashable, int | None]:
+    def _maximal_string_length(self) -> dict[Hashable, int | None]:
         max_str_length: dict[Hashable, int | None] = {}
         for col in self.columns:
-            if types[col] in MetaGenDataType.categorical_data_types():
+            query = (
+                self.data.lazy().select(
+                    pl.col(col).cast(pl.Utf8).str.len_bytes().max()
+                )
+                if self._is_string(col)
+                else None
+            )
+            with self._profile(
+                MetaGenMetadataColumn.MAX_LENGTH.value, [col], query
+            ):
                 max_str_length[col] = (
-                    self.data.with_columns(
-                        pl.col(col)
-                        .cast(pl.Utf8)
-                        .str.len_bytes()
-                        .alias(f"{col}_len")
-                    )
-                    .select(f"{col}_len")
-                    .max()
-                    .pipe(collect)
-                    .row(0)[0]
+                    query.pipe(collect).item() if query is not None else None
                 )
-            else:
-                max_str_length[col] = None
         return max_str_length
 
+    def _is_numeric(self, col: str) -> bool:
+        return (
+            self.column_statistics.metagen_type(col)
+            in MetaGenDataType.numeric_data_types()
+        )
+
+    def _is_string(self, col: str) -> bool:
+        return (
+            self.column_statistics.metagen_type(col)
+            in MetaGenDataType.categorical_data_types()
+        )
+
     def _is_column_all_null(self, col: str) -> bool:
         """
         Returns True if all values in the column are null.
         """
-        df = self.data.select(col).pipe(collect)
-        return df.null_count().row(0)[0] == len(df)
+        return self.column_statistics.is_all_null(col)
 
     def _number_of_unique_counts(self) -> dict[Hashable, int]:
         unique_counts: dict[Hashable, int] = {}
         for col in self.columns:
-            if not self._is_column_all_null(col):
-                unique_counts[col] = (
-                    self.data.select(col).pipe(collect).n_unique()
+            query: pl.LazyFrame | None
+            if self._is_column_all_null(col):
+                query = None
+            elif self.approx_unique_precision is not None:
+                query = self.column_statistics.sketch_query(
+                    col, self.approx_unique_precision
                 )
             else:
-                unique_counts[col] = 1
+                query = self.data.lazy().select(col)
+            with self._profile(
+                MetaGenMetadataColumn.NUMBER_UNIQUE.value, [col], query
+            ):
+                if self.approx_unique_precision is not None:
+                    unique_counts[col] = self._approximate_unique_count(
+                        col, self.approx_unique_precision
+                    )
+                elif query is not None:
+                    unique_counts[col] = query.pipe(collect).n_unique()
+                else:
+                    unique_counts[col] = 1
 
         return unique_counts
 
+    def _approximate_unique_count(self, col: str, precision: int) -> int:
+        """
+        Estimates the number of unique values of a column, counting null as
+        a value, with a HyperLogLog sketch of the given precision.
+        """
+        if self._is_column_all_null(col):
+            return 1
+        sketch = self.column_statistics.sketch(col, precision)
+        return sketch.estimate() + (self.column_statistics.null_count(col) > 0)
+
     def _number_of_unique_values(
-        self, max_number_of_unique_to_show: int = 10
+        self, max_number_of_unique_to_show: int | None = None
     ) -> dict[Hashable, list[Any] | list[None] | None]:
+        """
+        Returns the sorted unique values of each column, or None for columns
+        with `max_number_of_unique_to_show` or more unique values.
+
+        At most `max_number_of_unique_to_show` unique values are sorted and
+        brought back from Polars, whatever the number of unique values.
+        """
+        max_number_of_unique_to_show = (
+            max_number_of_unique_to_show or self.max_number_of_unique_to_show
+        )
         unique_values: dict[Hashable, list[Any] | list[None] | None] = {}
-        for col in self.columns:
-            if not self._is_column_all_null(col):
-                values = (
-                    self.data.select(col).pipe(collect).unique()[col].to_list()
+        for col, dtype in self.data_schema.schema.items():
+            if self._is_column_all_null(col):
+                with self._profile(MetaGenMetadataColumn.VALUES.value, [col]):
+                    unique_values[col] = [None]
+                continue
+            query = self.data.lazy().select(
+                unique_values_expression(
+                    column_expression(col, dtype),
+                    dtype,
+                    max_number_of_unique_to_show,
                 )
-                try:
-                    values.sort(
-                        key=lambda e: (e is None, e)
-                    )  # allow None to be sorted
-                except Exception:
-                    # if we couldn't sort, just return the values as is
-                    pass
-                unique_values[col] = values
-            else:
-                unique_values[col] = [None]
-
-        unique_values = {
-            col: (
-                _list
-                if _list is not None
-                and len(_list) < max_number_of_unique_to_show
-                else None
             )
-            for col, _list in unique_values.items()
-        }
+            with self._profile(
+                MetaGenMetadataColumn.VALUES.value, [col], query
+            ):
+                values: list[Any] = query.pipe(collect).item().to_list()
+                if not values:
+                    unique_values[col] = [None]
+                elif len(values) < max_number_of_unique_to_show:
+                    unique_values[col] = values
+                else:
+                    unique_values[col] = None
+
         return unique_values
 
     def write_metadata(
@@ -524,7 +1472,11 @@ class MetaGen:
     def _write_excel_metadata(
         self, output_path: Path, metadata: OptionalPandasDataFrame
     ) -> None:
-        metadata = metadata if metadata is not None else self._metadata
+        if metadata is None:
+            flat_metadata_table(self._polars_metadata).write_excel(
+                workbook=output_path, worksheet="Fields"
+            )
+            return
         metadata.to_excel(
             excel_writer=output_path,
             sheet_name="Fields",
@@ -534,7 +1486,9 @@ class MetaGen:
     def _write_csv_metadata(
         self, output_path: Path, metadata: OptionalPandasDataFrame
     ) -> None:
-        metadata = metadata if metadata is not None else self._metadata
+        if metadata is None:
+            flat_metadata_table(self._polars_metadata).write_csv(output_path)
+            return
         metadata.to_csv(output_path, index=False)
 
     def _write_json_metadata(
@@ -543,8 +1497,7 @@ class MetaGen:
         if metadata is not None:
             metadata_dict = metadata
         else:
-            _metadata = self.compute_metadata()
-            metadata_dict = _metadata.to_dict(orient="index")
+            metadata_dict = metadata_table_to_dict(self._polars_metadata)
 
         json_to_dump: dict[str, dict[Hashable, Any]] = {
             "fields": metadata_dict
@@ -604,7 +1557,9 @@ class MetaGen:
     def _write_parquet_metadata(
         self, output_path: Path, metadata: OptionalPandasDataFrame
     ) -> None:
-        metadata = metadata if metadata is not None else self._metadata
+        if metadata is None:
+            self._polars_metadata.write_parquet(output_path)
+            return
         metadata.to_parquet(output_path)
 
     def inspect_data(
@@ -644,7 +1599,7 @@ class MetaGen:
             with_replacement=with_replacement,
         )
         if inplace:
-            self.data = data
+            self._replace_data(data)
         return data
 
     def quick_look_preview(
@@ -694,10 +1649,24 @@ class MetaGen:
             sql_query = sql_query.read_text()
         else:
             sql_query = str(sql_query)
-        self.data = self._filter_by_sql_query(
-            sql_query, eager=eager, table_name=table_name
+        self._replace_data(
+            self._filter_by_sql_query(
+                sql_query, eager=eager, table_name=table_name
+            )
         )
 
+    def _replace_data(self, data: DataFrameT) -> None:
+        """
+        Replace the data by a subset of it. The subset no longer matches the
+        files it was loaded from, so their cached metadata, cached partial
+        statistics and parquet footers are not used anymore.
+        """
+        self.data = data
+        self.column_statistics.reset(data)
+        self.result_cache = None
+        self.stats_cache_path = None
+        self.path = None
+
     def write_data(
         self, outpath: str | Path, data: DataFrameT | None = None
     ) -> None:
@@ -753,6 +1722,8 @@ class MetaGen:
 
 
 def json_metadata_to_pandas(path: Path | str) -> pd.DataFrame:
+    import pandas as pd
+
     with open(path) as f:
         metadata = json.load(f)
     metadata = metadata["fields"]
@@ -0,0 +1,583 @@
+"""
+Metric Expressions
+==================
+
+Polars expressions for the per-column metrics of the metadata table. All the
+expressions of all the columns can be evaluated in a single ``select`` over
+the data, so the data is only scanned once.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from typing import Any
+
+import polars as pl
+
+from pymetagen._typing import ColumnName, Hashable, PolarsDataType
+from pymetagen.datatypes import (
+    MetaGenDataType,
+    MetaGenMetadataColumn,
+    dtype_to_metagen_type,
+)
+from pymetagen.sketches import HyperLogLog, hyperloglog_expression
+from pymetagen.utils import DataSchema
+
+ROW_COUNT_ALIAS = "__pymetagen_row_count__"
+COLUMN_METRICS = [
+    MetaGenMetadataColumn.NUMBER_NULLS,
+    MetaGenMetadataColumn.MIN,
+    MetaGenMetadataColumn.MAX,
+    MetaGenMetadataColumn.MEAN,
+    MetaGenMetadataColumn.STD,
+    MetaGenMetadataColumn.MIN_LENGTH,
+    MetaGenMetadataColumn.MAX_LENGTH,
+    MetaGenMetadataColumn.NUMBER_EMPTY_ZERO,
+    MetaGenMetadataColumn.NUMBER_POSITIVE,
+    MetaGenMetadataColumn.NUMBER_NEGATIVE,
+    MetaGenMetadataColumn.NUMBER_UNIQUE,
+    MetaGenMetadataColumn.VALUES,
+]
+
+
+def metric_alias(metric: MetaGenMetadataColumn, column: ColumnName) -> str:
+    """
+    Name of the output column holding the value of a metric for a column.
+    """
+    return f"{metric.value}:{column}"
+
+
+def resolve_metrics(
+    metrics: Iterable[MetaGenMetadataColumn | str],
+) -> list[MetaGenMetadataColumn]:
+    """
+    Validate a selection of metrics, given as metadata columns or their
+    names, e.g. ``"# nulls"``. '# unique (approx)' selects '# unique'.
+
+    Args:
+        metrics: metrics to compute.
+
+    Returns:
+        selected metrics, in the order of the metadata table.
+    """
+    selected = set()
+    for metric in metrics:
+        try:
+            column = MetaGenMetadataColumn(metric)
+        except ValueError:
+            column = None
+        if column == MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX:
+            column = MetaGenMetadataColumn.NUMBER_UNIQUE
+        if column not in MetaGenMetadataColumn.metric_columns():
+            raise ValueError(
+                f"Unknown metric {metric!r}. Supported metrics are:"
+                f" {[m.value for m in MetaGenMetadataColumn.metric_columns()]}"
+            )
+        selected.add(column)
+    return [
+        metric
+        for metric in MetaGenMetadataColumn.metric_columns()
+        if metric in selected
+    ]
+
+
+def skip_min_max(dtype: PolarsDataType) -> bool:
+    """
+    Returns True if min and max cannot be computed for the data type, same
+    rule as :meth:`polars.DataFrame.describe`.
+    """
+    return dtype.is_nested() or dtype in (pl.Null, pl.Object, pl.Unknown)
+
+
+def has_numeric_min_max(dtype: PolarsDataType) -> bool:
+    """
+    Returns True if :meth:`polars.DataFrame.describe` reports min and max of
+    the data type as floats.
+    """
+    return (
+        dtype.is_numeric()
+        or dtype.is_nested()
+        or dtype in (pl.Null, pl.Boolean)
+    )
+
+
+def has_mean(dtype: PolarsDataType) -> bool:
+    """
+    Returns True if :meth:`polars.DataFrame.describe` reports the mean of the
+    data type.
+    """
+    return dtype.is_numeric() or dtype == pl.Boolean
+
+
+def whole_numbers(*numbers: Any) -> bool:
+    """
+    Returns True if every number that is not None is a finite whole number.
+    """
+    return all(
+        float(number).is_integer() for number in numbers if number is not None
+    )
+
+
+def column_expression(
+    column: ColumnName | Sequence[ColumnName], dtype: PolarsDataType
+) -> pl.Expr:
+    """
+    Expression selecting a column, or several columns of the same data type,
+    with categorical columns cast to strings so that they are compared,
+    sorted and hashed by value.
+    """
+    col = pl.col(column)
+    if dtype == pl.Categorical:
+        col = col.cast(pl.Utf8)
+    return col
+
+
+def unique_values_expression(
+    column: str | pl.Expr,
+    dtype: PolarsDataType,
+    max_number_of_unique_to_show: int = 10,
+) -> pl.Expr:
+    """
+    Polars expression aggregating a column into a sorted list of at most
+    `max_number_of_unique_to_show` of its unique values, nulls last.
+
+    The list is cut before sorting, so at most that many values are sorted
+    and brought back to Python. If the list is full, the column has at least
+    `max_number_of_unique_to_show` unique values and the list should be
+    discarded.
+
+    Args:
+        column: column name or expression.
+        dtype: Polars data type of the column.
+        max_number_of_unique_to_show: maximum number of unique values kept.
+
+    Returns:
+        expression aggregating into a list of unique values.
+    """
+    col = pl.col(column) if isinstance(column, str) else column
+    unique_values = col.unique().head(max_number_of_unique_to_show)
+    if dtype == pl.Boolean:
+        # nulls_last is not supported when sorting booleans
+        unique_values = unique_values.sort_by(
+            [unique_values.is_null(), unique_values]
+        )
+    elif dtype not in (pl.Null, pl.Object):
+        unique_values = unique_values.sort(nulls_last=True)
+    return unique_values.implode()
+
+
+def column_metric_expressions(
+    column: ColumnName | Sequence[ColumnName],
+    dtype: PolarsDataType,
+    max_number_of_unique_to_show: int = 10,
+    approx_unique_precision: int | None = None,
+    metrics: Collection[MetaGenMetadataColumn] | None = None,
+) -> dict[MetaGenMetadataColumn, pl.Expr]:
+    """
+    Build a Polars expression for every metric of a column. Each expression
+    aggregates the column into a single value. Given several columns of the
+    same data type, each expression is expanded by Polars to every column.
+
+    Args:
+        column: name of the column, or names of columns of the same data type.
+        dtype: Polars data type of the column.
+        max_number_of_unique_to_show: maximum number of unique values kept
+            for the 'Values' metric.
+        approx_unique_precision: if given, the '# unique' metric aggregates
+            into HyperLogLog observations of this precision instead of an
+            exact count, see :func:`pymetagen.sketches.hyperloglog_expression`.
+        metrics: metrics to build expressions for, all of them if not given.
+            The number of nulls is always built, the formatting of the other
+            metrics depends on it.
+
+    Returns:
+        dictionary of metric to expression.
+    """
+    col = column_expression(column, dtype)
+    metagen_type = dtype_to_metagen_type(dtype)
+    is_numeric = metagen_type in MetaGenDataType.numeric_data_types()
+    is_string = metagen_type in MetaGenDataType.categorical_data_types()
+    null = pl.lit(None)
+
+    string_length = col.cast(pl.Utf8).str.len_bytes()
+    expressions = {
+        MetaGenMetadataColumn.NUMBER_NULLS: col.null_count(),
+        MetaGenMetadataColumn.MIN: null if skip_min_max(dtype) else col.min(),
+        MetaGenMetadataColumn.MAX: null if skip_min_max(dtype) else col.max(),
+        MetaGenMetadataColumn.MEAN: col.mean() if has_mean(dtype) else null,
+        MetaGenMetadataColumn.STD: col.std() if dtype.is_numeric() else null,
+        MetaGenMetadataColumn.MIN_LENGTH: (
+            string_length.min() if is_string else null
+        ),
+        MetaGenMetadataColumn.MAX_LENGTH: (
+            string_length.max() if is_string else null
+        ),
+        MetaGenMetadataColumn.NUMBER_EMPTY_ZERO: (
+            col.null_count() + (col == 0).sum()
+            if is_numeric
+            else col.null_count()
+        ),
+        MetaGenMetadataColumn.NUMBER_POSITIVE: (
+            (col > 0).sum() if is_numeric else null
+        ),
+        MetaGenMetadataColumn.NUMBER_NEGATIVE: (
+            (col < 0).sum() if is_numeric else null
+        ),
+        MetaGenMetadataColumn.NUMBER_UNIQUE: (
+            col.n_unique()
+            if approx_unique_precision is None
+            else hyperloglog_expression(col, approx_unique_precision)
+        ),
+        MetaGenMetadataColumn.VALUES: unique_values_expression(
+            col, dtype, max_number_of_unique_to_show
+        ),
+    }
+    return {
+        metric: expressions[metric] for metric in computed_metrics(metrics)
+    }
+
+
+def computed_metrics(
+    metrics: Collection[MetaGenMetadataColumn] | None = None,
+) -> list[MetaGenMetadataColumn]:
+    """
+    Metrics computed for every column, in the order of
+    :func:`column_metric_expressions`: the selected metrics, and always the
+    number of nulls, or all of them if none are selected. The mean and the
+    standard deviation are also computed with the min or the max, which are
+    formatted according to them, see :func:`column_metadata`.
+    """
+    required = {MetaGenMetadataColumn.NUMBER_NULLS}
+    if metrics is not None and (
+        MetaGenMetadataColumn.MIN in metrics
+        or MetaGenMetadataColumn.MAX in metrics
+    ):
+        required |= {MetaGenMetadataColumn.MEAN, MetaGenMetadataColumn.STD}
+    return [
+        metric
+        for metric in COLUMN_METRICS
+        if metrics is None or metric in metrics or metric in required
+    ]
+
+
+def dtype_groups(
+    data_schema: DataSchema,
+) -> dict[PolarsDataType, list[ColumnName]]:
+    """
+    Columns of the schema grouped by data type, in the order of the schema.
+    """
+    groups: dict[PolarsDataType, list[ColumnName]] = {}
+    for column, dtype in data_schema.schema.items():
+        groups.setdefault(dtype, []).append(column)
+    return groups
+
+
+def column_group_metric_expressions(
+    columns: Sequence[ColumnName],
+    dtype: PolarsDataType,
+    max_number_of_unique_to_show: int = 10,
+    approx_unique_precision: int | None = None,
+    metrics: Collection[MetaGenMetadataColumn] | None = None,
+) -> dict[MetaGenMetadataColumn, pl.Expr]:
+    """
+    Build the expressions of every metric of a group of columns of the same
+    data type, a single expression per metric expanded by Polars to every
+    column, so the number of expressions built does not grow with the number
+    of columns.
+
+    The metrics that do not apply to the data type, e.g. the string lengths
+    of a numeric column, are null literals and are left out.
+
+    Args:
+        columns: names of columns of the same data type.
+        dtype: Polars data type of the columns.
+        max_number_of_unique_to_show: maximum number of unique values kept
+            for the 'Values' metric.
+        approx_unique_precision: precision of the HyperLogLog sketch used for
+            the '# unique' metric. Exact counts are used if not given.
+        metrics: metrics to build expressions for, all of them if not given.
+
+    Returns:
+        dictionary of metric to expression, aliased as :func:`metric_alias`.
+    """
+    return {
+        metric: expression.name.prefix(metric_alias(metric, ""))
+        for metric, expression in column_metric_expressions(
+            list(columns),
+            dtype,
+            max_number_of_unique_to_show,
+            approx_unique_precision,
+            metrics,
+        ).items()
+        if not expression.meta.is_literal()
+    }
+
+
+def column_group_metric_values(
+    row: Sequence[Any],
+    columns: Sequence[ColumnName],
+    metrics: Sequence[MetaGenMetadataColumn],
+) -> dict[ColumnName, dict[MetaGenMetadataColumn, Any]]:
+    """
+    Raw metric values of every column of a group from the single row of
+    evaluated :func:`column_group_metric_expressions`. Polars expands every
+    expression to the columns in their order, so the values are read by
+    position, one slice of the row per metric.
+
+    Args:
+        row: values of the row, in the order of `metrics`.
+        columns: names of the columns of the group.
+        metrics: metrics of the expressions, in the order they were
+            evaluated.
+
+    Returns:
+        dictionary of column to dictionary of metric to raw value.
+    """
+    if len(row) != len(metrics) * len(columns):
+        raise ValueError(
+            f"Expected {len(metrics) * len(columns)} metric values, got"
+            f" {len(row)}."
+        )
+    values: dict[ColumnName, dict[MetaGenMetadataColumn, Any]] = {
+        column: {} for column in columns
+    }
+    for index, metric in enumerate(metrics):
+        metric_row = row[index * len(columns) : (index + 1) * len(columns)]
+        for column, value in zip(columns, metric_row):
+            values[column][metric] = value
+    return values
+
+
+def metric_expressions(
+    data_schema: DataSchema,
+    max_number_of_unique_to_show: int = 10,
+    approx_unique_precision: int | None = None,
+    metrics: Collection[MetaGenMetadataColumn] | None = None,
+) -> list[pl.Expr]:
+    """
+    Build the expressions of every metric of every column in the schema, plus
+    the row count of the data.
+
+    Args:
+        data_schema: schema of the data.
+        max_number_of_unique_to_show: maximum number of unique values kept
+            for the 'Values' metric.
+        approx_unique_precision: precision of the HyperLogLog sketch used for
+            the '# unique' metric. Exact counts are used if not given.
+        metrics: metrics to build expressions for, all of them if not given.
+
+    Returns:
+        list of aliased expressions, see :func:`metric_alias`.
+    """
+    expressions = [pl.len().alias(ROW_COUNT_ALIAS)]
+    for column, dtype in data_schema.schema.items():
+        expressions.extend(
+            expression.alias(metric_alias(metric, column))
+            for metric, expression in column_metric_expressions(
+                column,
+                dtype,
+                max_number_of_unique_to_show,
+                approx_unique_precision,
+                metrics,
+            ).items()
+        )
+    return expressions
+
+
+def column_metadata(
+    values: dict[MetaGenMetadataColumn, Any],
+    dtype: PolarsDataType,
+    row_count: int,
+    max_number_of_unique_to_show: int = 10,
+) -> dict[MetaGenMetadataColumn, Any]:
+    """
+    Format the raw metric values of a column as reported in the metadata
+    table: min and max as strings, as :meth:`polars.DataFrame.describe` does,
+    and the unique values only when there are fewer than
+    `max_number_of_unique_to_show` of them, in which case they also give the
+    exact number of unique values.
+
+    As in :meth:`pymetagen.MetaGen.compute_metadata` with the sequential
+    execution mode, a numeric min and max are written as integers when the
+    min, max, mean and standard deviation are all whole numbers, and as
+    floats otherwise. The mean is only used for this and is dropped.
+
+    Args:
+        values: raw metric values of the column. 'Values' holds at most
+            `max_number_of_unique_to_show` unique values, or None if there
+            are known to be more.
+        dtype: Polars data type of the column.
+        row_count: number of rows in the data.
+        max_number_of_unique_to_show: unique values are only reported when
+            there are fewer than this number of them.
+
+    Returns:
+        dictionary of metric to formatted value.
+    """
+    values = dict(values)
+    mean = values.pop(MetaGenMetadataColumn.MEAN, None)
+    as_integers = (
+        has_numeric_min_max(dtype)
+        # the mean is unknown, e.g. in parquet footers
+        and (mean is not None or not has_mean(dtype))
+        and whole_numbers(
+            values.get(MetaGenMetadataColumn.MIN),
+            values.get(MetaGenMetadataColumn.MAX),
+            mean,
+            values.get(MetaGenMetadataColumn.STD),
+        )
+    )
+    for metric in (MetaGenMetadataColumn.MIN, MetaGenMetadataColumn.MAX):
+        value = values.get(metric)
+        if value is None:
+            continue
+        if as_integers:
+            values[metric] = str(int(value))
+        elif has_numeric_min_max(dtype):
+            values[metric] = str(float(value))
+        else:
+            values[metric] = str(value)
+
+    all_nulls = values[MetaGenMetadataColumn.NUMBER_NULLS] == row_count
+    if all_nulls and MetaGenMetadataColumn.NUMBER_UNIQUE in values:
+        values[MetaGenMetadataColumn.NUMBER_UNIQUE] = 1
+    if MetaGenMetadataColumn.VALUES not in values:
+        return values
+
+    unique_values = values[MetaGenMetadataColumn.VALUES]
+    if all_nulls:
+        values[MetaGenMetadataColumn.VALUES] = [None]
+    elif (
+        unique_values is None
+        or len(unique_values) >= max_number_of_unique_to_show
+    ):
+        values[MetaGenMetadataColumn.VALUES] = None
+    elif MetaGenMetadataColumn.NUMBER_UNIQUE in values:
+        # every unique value is known, so the count is exact
+        values[MetaGenMetadataColumn.NUMBER_UNIQUE] = len(unique_values)
+
+    return values
+
+
+def metadata_from_column_metadata(
+    columns_metadata: Mapping[ColumnName, Mapping[MetaGenMetadataColumn, Any]],
+    data_schema: DataSchema,
+) -> dict[Hashable, dict[Hashable, Any]]:
+    """
+    Pivot the metadata of each column into the metadata dictionary used by
+    :meth:`pymetagen.MetaGen.compute_metadata`, i.e.
+    ``{metric: {column: value}}``, adding the type of each column.
+    """
+    metadata: dict[Hashable, dict[Hashable, Any]] = {
+        MetaGenMetadataColumn.TYPE: {}
+    }
+    types = {
+        dtype: dtype_to_metagen_type(dtype)
+        for dtype in dtype_groups(data_schema)
+    }
+    for column, dtype in data_schema.schema.items():
+        metadata[MetaGenMetadataColumn.TYPE][column] = types[dtype]
+        for metric, value in columns_metadata[column].items():
+            metadata.setdefault(metric, {})[column] = value
+
+    return metadata
+
+
+def metadata_from_metric_values(
+    metric_values: Mapping[str, Any],
+    data_schema: DataSchema,
+    max_number_of_unique_to_show: int = 10,
+    approx_unique_precision: int | None = None,
+    metrics: Collection[MetaGenMetadataColumn] | None = None,
+) -> dict[Hashable, dict[Hashable, Any]]:
+    """
+    Turn the result of evaluating :func:`metric_expressions` into the metadata
+    dictionary used by :meth:`pymetagen.MetaGen.compute_metadata`, i.e.
+    ``{metric: {column: value}}``.
+
+    Args:
+        metric_values: the single row of evaluated metric expressions, as a
+            dictionary.
+        data_schema: schema of the data.
+        max_number_of_unique_to_show: unique values are only reported when
+            there are fewer than this number of them.
+        approx_unique_precision: precision of the HyperLogLog sketch used for
+            the '# unique' metric, if any.
+        metrics: metrics the expressions were built for, all of them if not
+            given.
+
+    Returns:
+        dictionary of metric to dictionary of column to value.
+    """
+    row_count = metric_values.get(ROW_COUNT_ALIAS, 0)
+    selected = computed_metrics(metrics)
+    columns_values = {
+        column: {
+            metric: metric_values[metric_alias(metric, column)]
+            for metric in selected
+        }
+        for column in data_schema.columns
+    }
+    return metadata_from_column_values(
+        columns_values,
+        data_schema,
+        row_count,
+        max_number_of_unique_to_show=max_number_of_unique_to_show,
+        approx_unique_precision=approx_unique_precision,
+        metrics=metrics,
+    )
+
+
+def metadata_from_column_values(
+    columns_values: Mapping[ColumnName, Mapping[MetaGenMetadataColumn, Any]],
+    data_schema: DataSchema,
+    row_count: int,
+    max_number_of_unique_to_show: int = 10,
+    approx_unique_precision: int | None = None,
+    metrics: Collection[MetaGenMetadataColumn] | None = None,
+) -> dict[Hashable, dict[Hashable, Any]]:
+    """
+    Turn the raw metric values of every column into the metadata dictionary
+    used by :meth:`pymetagen.MetaGen.compute_metadata`, i.e.
+    ``{metric: {column: value}}``.
+
+    Args:
+        columns_values: raw metric values of every column. Metrics missing
+            from the values of a column, e.g. not applicable to its data
+            type, are None.
+        data_schema: schema of the data.
+        row_count: number of rows in the data.
+        max_number_of_unique_to_show: unique values are only reported when
+            there are fewer than this number of them.
+        approx_unique_precision: precision of the HyperLogLog sketch used for
+            the '# unique' metric, if any.
+        metrics: metrics the values were computed for, all of them if not
+            given.
+
+    Returns:
+        dictionary of metric to dictionary of column to value.
+    """
+    selected = computed_metrics(metrics)
+    columns_metadata: dict[ColumnName, dict[MetaGenMetadataColumn, Any]] = {}
+    for column, dtype in data_schema.schema.items():
+        column_values = columns_values[column]
+        values: dict[MetaGenMetadataColumn, Any] = {
+            metric: column_values.get(metric) for metric in selected
+        }
+        if (
+            approx_unique_precision is not None
+            and MetaGenMetadataColumn.NUMBER_UNIQUE in values
+        ):
+            sketch = HyperLogLog.from_observations(
+                values[MetaGenMetadataColumn.NUMBER_UNIQUE],
+                approx_unique_precision,
+            )
+            has_nulls = values[MetaGenMetadataColumn.NUMBER_NULLS] > 0
+            values[MetaGenMetadataColumn.NUMBER_UNIQUE] = (
+                sketch.estimate() + has_nulls
+            )
+        columns_metadata[column] = column_metadata(
+            values, dtype, row_count, max_number_of_unique_to_show
+        )
+
+    return metadata_from_column_metadata(columns_metadata, data_schema)
@@ -0,0 +1,220 @@
+"""
+Parquet Statistics
+==================
+
+Partial statistics of the columns of parquet files read from their footers.
+Every row group of a parquet file usually stores the minimum, maximum and
+number of nulls of each of its columns, so these metrics can be computed
+without reading the data. Only the row groups of the columns whose footer
+statistics are missing are read.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from pymetagen._typing import ColumnName, PolarsDataType
+from pymetagen.metrics import column_expression, skip_min_max
+from pymetagen.partition_index import hive_partitions, partition_index
+from pymetagen.statistics import (
+    PartialColumnStatistics,
+    merge_partial_statistics,
+)
+from pymetagen.utils import DataSchema
+
+
+def parquet_files(
+    path: Path | str,
+    partition_index_dir: Path | str | None = None,
+    partitions: Mapping[str, Any] | None = None,
+) -> list[Path]:
+    """
+    List the parquet files of a parquet file or of a directory of
+    partitioned parquet files, see :mod:`pymetagen.partition_index`.
+
+    Args:
+        path: path of the parquet file or directory.
+        partition_index_dir: directory of the persisted partition indexes,
+            see :func:`pymetagen.partition_index.partition_index`.
+        partitions: selected hive partitions of a directory, see
+            :func:`pymetagen.partition_index.partition_filter`.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return partition_index(path, partition_index_dir).paths(partitions)
+    return [path] if path.exists() else []
+
+
+def footer_statistics(
+    statistics: Any, number_of_rows: int
+) -> PartialColumnStatistics | None:
+    """
+    Partial statistics of a column chunk from the statistics stored in the
+    footer of its row group.
+
+    Args:
+        statistics: pyarrow statistics of the column chunk, if any.
+        number_of_rows: number of rows of the row group.
+
+    Returns:
+        count, null count, min and max of the column chunk, or None if the
+        footer does not hold them.
+    """
+    if statistics is None or not statistics.has_null_count:
+        return None
+    all_nulls = statistics.null_count == number_of_rows
+    if not statistics.has_min_max and not all_nulls:
+        return None
+    return PartialColumnStatistics(
+        count=number_of_rows,
+        null_count=statistics.null_count,
+        minimum=None if all_nulls else statistics.min,
+        maximum=None if all_nulls else statistics.max,
+        zero_count=None,
+        sketch=None,
+        values=None,
+    )
+
+
+def scanned_statistics(
+    data: pl.DataFrame, column: ColumnName, dtype: PolarsDataType
+) -> PartialColumnStatistics:
+    """
+    Count, null count, min and max of a column, computed from its data.
+    """
+    col = column_expression(column, dtype)
+    null = pl.lit(None)
+    count, null_count, minimum, maximum = data.select(
+        pl.len().alias("count"),
+        col.null_count().alias("null_count"),
+        (null if skip_min_max(dtype) else col.min()).alias("minimum"),
+        (null if skip_min_max(dtype) else col.max()).alias("maximum"),
+    ).row(0)
+    return PartialColumnStatistics(
+        count=count,
+        null_count=null_count,
+        minimum=minimum,
+        maximum=maximum,
+        zero_count=None,
+        sketch=None,
+        values=None,
+    )
+
+
+def partition_statistics(
+    value: str | None, dtype: PolarsDataType, number_of_rows: int
+) -> PartialColumnStatistics:
+    """
+    Statistics of a hive partition column within one file, where every row
+    holds the partition value.
+    """
+    data = pl.DataFrame(
+        {"partition": pl.Series([value], dtype=pl.Utf8).cast(dtype)}
+    )
+    statistics = scanned_statistics(data, "partition", dtype)
+    statistics.count = number_of_rows
+    statistics.null_count *= number_of_rows
+    return statistics
+
+
+def file_footer_statistics(
+    path: Path | str, data_schema: DataSchema
+) -> dict[ColumnName, PartialColumnStatistics]:
+    """
+    Partial statistics of every column of a parquet file, read from the
+    footer of each of its row groups.
+
+    The row groups of a column are only read when their footer has no
+    statistics for it, or when the column is nested, since parquet stores
+    statistics for the leaves of nested columns only. Hive partition
+    columns are computed from the partition values in the path.
+
+    Args:
+        path: path of the parquet file.
+        data_schema: schema of the data, hive partition columns included.
+
+    Returns:
+        dictionary of column to partial statistics, holding count, null
+        count, min and max only.
+    """
+    # only the footer execution mode reads footers, keep pyarrow out of the
+    # import of pymetagen
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    partitions = hive_partitions(path)
+
+    row_groups_statistics = []
+    for index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(index)
+        column_chunks = {
+            row_group.column(i).path_in_schema: row_group.column(i)
+            for i in range(row_group.num_columns)
+        }
+
+        row_group_statistics: dict[ColumnName, PartialColumnStatistics] = {}
+        for column, dtype in data_schema.schema.items():
+            if column not in column_chunks and column in partitions:
+                row_group_statistics[column] = partition_statistics(
+                    partitions[column], dtype, row_group.num_rows
+                )
+                continue
+
+            statistics = None
+            if column in column_chunks and not dtype.is_nested():
+                statistics = footer_statistics(
+                    column_chunks[column].statistics, row_group.num_rows
+                )
+            if statistics is None:
+                data = pl.from_arrow(
+                    parquet_file.read_row_group(index, columns=[column])
+                )
+                statistics = scanned_statistics(
+                    data, column, dtype  # type: ignore[arg-type]
+                )
+            row_group_statistics[column] = statistics
+        row_groups_statistics.append(row_group_statistics)
+
+    return merge_partial_statistics(row_groups_statistics)
+
+
+def footer_partial_statistics(
+    path: Path | str,
+    data_schema: DataSchema,
+    partition_index_dir: Path | str | None = None,
+    partitions: Mapping[str, Any] | None = None,
+) -> dict[ColumnName, PartialColumnStatistics]:
+    """
+    Partial statistics of every column of a parquet file or of a directory
+    of partitioned parquet files, read from the footers of every file.
+
+    Args:
+        path: path of the parquet file or directory.
+        data_schema: schema of the data, hive partition columns included.
+        partition_index_dir: directory of the persisted partition indexes,
+            see :func:`parquet_files`.
+        partitions: selected hive partitions, see :func:`parquet_files`.
+
+    Returns:
+        dictionary of column to partial statistics, holding count, null
+        count, min and max only.
+    """
+    files = parquet_files(path, partition_index_dir, partitions)
+    if not files:
+        raise FileNotFoundError(f"No parquet files found in {path}")
+
+    partials = merge_partial_statistics(
+        file_footer_statistics(file, data_schema) for file in files
+    )
+    for column in data_schema.columns:
+        # files without any row group
+        partials.setdefault(
+            column,
+            PartialColumnStatistics(zero_count=None, sketch=None, values=None),
+        )
+    return partials
@@ -0,0 +1,408 @@
+"""
+Partition Index
+===============
+
+Index of the parquet files of a directory of partitioned parquet files: the
+path, size and modification time of every file, and the values of its hive
+partitions, e.g. ``year=2024``. The index is built by a single walk of the
+directory tree, and the data loaders read the files it lists instead of
+globbing the tree, and Polars listing it, again.
+
+The index can be persisted as a manifest, a parquet file with one row per
+directory, and refreshed incrementally: a directory whose modification time
+is unchanged keeps its recorded files and subdirectories and is not listed
+again. Adding, removing or renaming a file changes the modification time of
+its directory, but rewriting a file in place does not, so files rewritten in
+place are only picked up by rebuilding the index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path, PurePath, PurePosixPath
+from typing import Any
+from urllib.parse import unquote
+
+import polars as pl
+
+from pymetagen._typing import ColumnName
+from pymetagen.datatypes import MetaGenSupportedFileExtension
+
+HIVE_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+PARTITION_INDEX_DIR_NAME = "partition_index"
+PARTITION_INDEX_SUFFIX = ".parquet"
+
+PARTITION_INDEX_SCHEMA: dict[str, Any] = {
+    "directory": pl.String,
+    "mtime_ns": pl.Int64,
+    "subdirectories": pl.List(pl.String),
+    "files": pl.List(
+        pl.Struct({"name": pl.String, "size": pl.Int64, "mtime_ns": pl.Int64})
+    ),
+}
+
+
+def hive_partitions(path: PurePath | str) -> dict[ColumnName, str | None]:
+    """
+    Values of the hive partitions of a file, e.g.
+    ``/data/year=2024/month=01/part-0.parquet`` gives
+    ``{"year": "2024", "month": "01"}``.
+    """
+    partitions: dict[ColumnName, str | None] = {}
+    for part in PurePath(path).parent.parts:
+        key, separator, value = part.partition("=")
+        if separator:
+            value = unquote(value)
+            partitions[key] = (
+                None if value == HIVE_DEFAULT_PARTITION else value
+            )
+    return partitions
+
+
+def is_hidden(name: str) -> bool:
+    """
+    Returns True for the names of hidden files and directories, starting
+    with '.' or '_', e.g. ``_SUCCESS`` files, following the Hadoop
+    convention.
+    """
+    return name.startswith((".", "_"))
+
+
+@dataclass(frozen=True)
+class PartitionRange:
+    """
+    Inclusive range of the values of a hive partition, e.g.
+    ``PartitionRange("2024-10-10", "2024-10-16")``, open ended on the side of
+    a bound that is None. Numeric bounds are compared to the values as
+    numbers, other bounds as strings, which orders ISO dates.
+    """
+
+    low: Any = None
+    high: Any = None
+
+
+def _is_number(value: Any) -> bool:
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _value_filter(key: str, value: Any) -> pl.Expr:
+    column = pl.col(key)
+    expression = column == str(value)
+    if _is_number(value):
+        # e.g. month=01 for the value 1
+        expression = expression | (
+            column.cast(pl.Float64, strict=False) == float(value)
+        )
+    return expression
+
+
+def _range_filter(key: str, partition_range: PartitionRange) -> pl.Expr:
+    bounds = [
+        bound
+        for bound in (partition_range.low, partition_range.high)
+        if bound is not None
+    ]
+    column = pl.col(key)
+    convert: Callable[[Any], Any] = str
+    if bounds and all(_is_number(bound) for bound in bounds):
+        column = column.cast(pl.Float64, strict=False)
+        convert = float
+    expression = pl.lit(True)
+    if partition_range.low is not None:
+        expression = expression & (column >= convert(partition_range.low))
+    if partition_range.high is not None:
+        expression = expression & (column <= convert(partition_range.high))
+    return expression
+
+
+def partition_filter(partitions: Mapping[str, Any]) -> pl.Expr:
+    """
+    Filter of the values of the hive partitions, see
+    :meth:`PartitionIndex.partition_values`, selecting the files of the
+    given partitions.
+
+    Args:
+        partitions: selected values of every partition key: a value, e.g.
+            ``{"year": 2024}``, a list of values, e.g.
+            ``{"country": ["FR", "DE"]}``, or a :class:`PartitionRange`.
+            Files with a null partition value are never selected.
+
+    Returns:
+        boolean expression.
+    """
+    expressions = []
+    for key, selection in partitions.items():
+        if isinstance(selection, PartitionRange):
+            expressions.append(_range_filter(key, selection))
+        elif isinstance(selection, (list, tuple, set, frozenset)):
+            expressions.append(
+                pl.any_horizontal(
+                    [_value_filter(key, value) for value in selection]
+                )
+                if selection
+                else pl.lit(False)
+            )
+        else:
+            expressions.append(_value_filter(key, selection))
+    if not expressions:
+        return pl.lit(True)
+    # a null value of a partition does not match
+    return pl.all_horizontal(expressions).fill_null(False)
+
+
+@dataclass
+class IndexedDirectory:
+    """
+    Entries of a directory of the index.
+
+    Args:
+        mtime_ns: modification time of the directory when it was listed.
+        subdirectories: names of its subdirectories that are not hidden.
+        files: name, size and modification time of its parquet files that
+            are not hidden.
+    """
+
+    mtime_ns: int
+    subdirectories: list[str] = field(default_factory=list)
+    files: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _list_directory(path: Path, mtime_ns: int) -> IndexedDirectory:
+    directory = IndexedDirectory(mtime_ns=mtime_ns)
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if is_hidden(entry.name):
+                continue
+            if entry.is_dir():
+                directory.subdirectories.append(entry.name)
+            elif entry.name.endswith(
+                MetaGenSupportedFileExtension.PARQUET.value
+            ):
+                stat = entry.stat()
+                directory.files.append(
+                    {
+                        "name": entry.name,
+                        "size": stat.st_size,
+                        "mtime_ns": stat.st_mtime_ns,
+                    }
+                )
+    return directory
+
+
+class PartitionIndex:
+    """
+    Index of the parquet files under a directory.
+
+    Args:
+        root: directory of partitioned parquet files.
+        directories: entries of `root` and of every directory under it, keyed
+            by their POSIX path relative to `root`, '.' for `root` itself.
+    """
+
+    def __init__(self, root: Path, directories: dict[str, IndexedDirectory]):
+        self.root = root
+        self.directories = directories
+
+    @classmethod
+    def build(
+        cls, root: Path | str, previous: PartitionIndex | None = None
+    ) -> PartitionIndex:
+        """
+        Walk the directory tree under `root`, only listing the directories
+        that are new or modified since the `previous` index of `root`.
+        """
+        root = Path(root)
+        previous_directories = previous.directories if previous else {}
+        directories: dict[str, IndexedDirectory] = {}
+        to_visit = [PurePosixPath(".")]
+        while to_visit:
+            relative = to_visit.pop()
+            path = root / relative
+            # the time is read before listing, so that entries added while
+            # listing modify the directory again
+            mtime_ns = os.stat(path).st_mtime_ns
+            directory = previous_directories.get(str(relative))
+            if directory is None or directory.mtime_ns != mtime_ns:
+                directory = _list_directory(path, mtime_ns)
+            directories[str(relative)] = directory
+            to_visit.extend(
+                relative / subdirectory
+                for subdirectory in directory.subdirectories
+            )
+        return cls(root, directories)
+
+    @classmethod
+    def read(cls, root: Path | str, path: Path | str) -> PartitionIndex | None:
+        """
+        Index of `root` persisted as a manifest, see :meth:`write`. A missing
+        or unreadable manifest gives None.
+        """
+        try:
+            manifest = pl.read_parquet(path)
+        except (OSError, pl.exceptions.ComputeError):
+            return None
+        if manifest.schema != pl.Schema(PARTITION_INDEX_SCHEMA):
+            return None
+        return cls(
+            Path(root),
+            {
+                row["directory"]: IndexedDirectory(
+                    mtime_ns=row["mtime_ns"],
+                    subdirectories=row["subdirectories"],
+                    files=row["files"],
+                )
+                for row in manifest.iter_rows(named=True)
+            },
+        )
+
+    def write(self, path: Path | str) -> None:
+        """
+        Persist the index as a manifest with one row per directory, replacing
+        any previous manifest atomically.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_suffix(".tmp")
+        pl.DataFrame(
+            {
+                "directory": list(self.directories),
+                "mtime_ns": [
+                    directory.mtime_ns
+                    for directory in self.directories.values()
+                ],
+                "subdirectories": [
+                    directory.subdirectories
+                    for directory in self.directories.values()
+                ],
+                "files": [
+                    directory.files for directory in self.directories.values()
+                ],
+            },
+            schema=PARTITION_INDEX_SCHEMA,
+        ).write_parquet(temporary_path)
+        os.replace(temporary_path, path)
+
+    def _relative_files(self) -> list[tuple[PurePosixPath, dict[str, Any]]]:
+        return sorted(
+            (
+                (PurePosixPath(relative, file["name"]), file)
+                for relative, directory in self.directories.items()
+                for file in directory.files
+            ),
+            key=lambda relative_file: str(relative_file[0]),
+        )
+
+    def partition_values(self) -> pl.DataFrame:
+        """
+        Values of the hive partitions of the parquet files, see
+        :func:`hive_partitions`, one string column per partition key and one
+        row per file, in the order of :meth:`files`.
+        """
+        partitions = [
+            hive_partitions(relative) for relative, _ in self._relative_files()
+        ]
+        keys = list(
+            dict.fromkeys(key for partition in partitions for key in partition)
+        )
+        return pl.DataFrame(
+            {
+                key: [partition.get(key) for partition in partitions]
+                for key in keys
+            },
+            schema={key: pl.String for key in keys},
+        )
+
+    def files(
+        self, partitions: Mapping[str, Any] | None = None
+    ) -> pl.DataFrame:
+        """
+        Table of the parquet files, sorted by path: their path, size and
+        modification time.
+
+        Args:
+            partitions: selected hive partitions, see
+                :func:`partition_filter`. All the files if not given.
+
+        Returns:
+            table of the files of the selected partitions.
+        """
+        relative_files = self._relative_files()
+        files = pl.DataFrame(
+            {
+                "file": [
+                    str(self.root / relative) for relative, _ in relative_files
+                ],
+                "size": [file["size"] for _, file in relative_files],
+                "mtime_ns": [file["mtime_ns"] for _, file in relative_files],
+            },
+            schema={"file": pl.String, "size": pl.Int64, "mtime_ns": pl.Int64},
+        )
+        if not partitions:
+            return files
+        partition_values = self.partition_values()
+        unknown_keys = set(partitions) - set(partition_values.columns)
+        if unknown_keys:
+            raise ValueError(
+                f"Unknown partition keys {sorted(unknown_keys)} of"
+                f" {self.root}, its partition keys are"
+                f" {partition_values.columns}."
+            )
+        return files.filter(
+            partition_values.with_columns(
+                selected=partition_filter(partitions)
+            )["selected"]
+        )
+
+    def paths(self, partitions: Mapping[str, Any] | None = None) -> list[Path]:
+        """
+        Paths of the parquet files of the selected `partitions`, see
+        :meth:`files`, sorted.
+        """
+        return [Path(file) for file in self.files(partitions)["file"]]
+
+
+def partition_index_path(root: Path | str, index_dir: Path | str) -> Path:
+    """
+    Path of the manifest of the index of `root` in `index_dir`, named by the
+    hash of the absolute path of `root`.
+    """
+    key = hashlib.sha256(str(Path(root).resolve()).encode()).hexdigest()
+    return Path(index_dir) / f"{key}{PARTITION_INDEX_SUFFIX}"
+
+
+def partition_index(
+    root: Path | str,
+    index_dir: Path | str | None = None,
+    rebuild: bool = False,
+) -> PartitionIndex:
+    """
+    Index of the parquet files under a directory.
+
+    Args:
+        root: directory of partitioned parquet files.
+        index_dir: directory of the persisted manifests. The manifest of
+            `root`, if any, is refreshed incrementally and written back. The
+            whole tree is walked when not given.
+        rebuild: walk the whole tree even if a manifest exists, e.g. after
+            files were rewritten in place.
+
+    Returns:
+        index of `root`.
+    """
+    root = Path(root)
+    if index_dir is None:
+        return PartitionIndex.build(root)
+
+    manifest_path = partition_index_path(root, index_dir)
+    previous = None if rebuild else PartitionIndex.read(root, manifest_path)
+    index = PartitionIndex.build(root, previous)
+    if previous is None or index.directories != previous.directories:
+        index.write(manifest_path)
+    return index
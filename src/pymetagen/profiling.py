@@ -0,0 +1,163 @@
+"""
+Profiling
+=========
+
+Instrumentation of the metadata computation. A :class:`MetaGenProfiler`
+passed to :class:`pymetagen.MetaGen` records, for every step of the
+computation, i.e. a metric or group of metrics over one or several columns,
+its wall time, the number of rows it scanned, the peak memory of the process
+so far and the optimized Polars plan of its query.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from pymetagen._typing import ColumnName
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+def process_peak_memory() -> int | None:
+    """
+    Peak resident memory of the process since it started, in bytes, None
+    where it cannot be measured. Polars allocates outside of the Python heap,
+    so the whole process is measured rather than Python allocations. The peak
+    never decreases: it is not the memory used by the last step alone.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@dataclass
+class ProfileRecord:
+    """
+    Measurements of one step of the metadata computation.
+
+    Args:
+        metric: metric, or group of metrics, computed by the step.
+        columns: columns the step computed the metric of.
+        wall_time: wall time of the step, in seconds.
+        rows_scanned: number of rows of data the step read, if known.
+        process_peak_memory: peak resident memory of the process from its
+            start to the end of the step, in bytes, if it can be measured,
+            see :func:`process_peak_memory`.
+        plan: optimized Polars plan of the query of the step, if any.
+    """
+
+    metric: str
+    columns: list[ColumnName]
+    wall_time: float
+    rows_scanned: int | None = None
+    process_peak_memory: int | None = None
+    plan: str | None = None
+
+
+@dataclass
+class MetaGenProfiler:
+    """
+    Records a :class:`ProfileRecord` for every step of the metadata
+    computation of the :class:`pymetagen.MetaGen` it is passed to.
+
+    Args:
+        callback: function called with every record as soon as it is
+            recorded.
+        explain: Flag for recording the optimized plan of every query.
+            Optimizing a plan again has a cost, which is not part of the
+            measured wall time.
+    """
+
+    callback: Callable[[ProfileRecord], Any] | None = None
+    explain: bool = True
+    records: list[ProfileRecord] = field(default_factory=list)
+    number_of_rows: int | None = None
+
+    @contextmanager
+    def profile(
+        self,
+        metric: str,
+        columns: Sequence[ColumnName],
+        query: pl.LazyFrame | Sequence[pl.LazyFrame] | None = None,
+        rows_scanned: int | None = None,
+    ) -> Iterator[ProfileRecord]:
+        """
+        Measure the step run in the context. The record of the step is
+        yielded, so that the step can set what it only knows once run, e.g.
+        its number of rows scanned.
+
+        Args:
+            metric: metric, or group of metrics, computed by the step.
+            columns: columns the step computes the metric of.
+            query: query, or queries, of the step, to record their optimized
+                plans.
+            rows_scanned: number of rows read by the step, defaults to the
+                number of rows of the data.
+        """
+        queries = [query] if isinstance(query, pl.LazyFrame) else query or []
+        record = ProfileRecord(
+            metric=metric,
+            columns=list(columns),
+            wall_time=0.0,
+            rows_scanned=(
+                rows_scanned
+                if rows_scanned is not None
+                else self.number_of_rows
+            ),
+            plan=(
+                "\n\n".join(query.explain() for query in queries)
+                if self.explain and queries
+                else None
+            ),
+        )
+        start = time.perf_counter()
+        yield record
+        record.wall_time = time.perf_counter() - start
+        record.process_peak_memory = process_peak_memory()
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def wall_time_by_metric(self) -> dict[str, float]:
+        """
+        Total wall time of each metric, slowest first.
+        """
+        wall_times: dict[str, float] = {}
+        for record in self.records:
+            wall_times[record.metric] = (
+                wall_times.get(record.metric, 0.0) + record.wall_time
+            )
+        return dict(
+            sorted(wall_times.items(), key=lambda item: item[1], reverse=True)
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Records and total wall time of each metric, as a JSON serializable
+        dictionary.
+        """
+        return {
+            "number_of_rows": self.number_of_rows,
+            "wall_time_by_metric": self.wall_time_by_metric(),
+            "records": [asdict(record) for record in self.records],
+        }
+
+    def write(self, path: Path | str) -> None:
+        """
+        Write the profile to a JSON file.
+        """
+        Path(path).write_text(json.dumps(self.to_dict(), indent=4))
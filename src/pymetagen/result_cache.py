@@ -0,0 +1,184 @@
+"""
+Metadata Result Cache
+=====================
+
+On-disk cache of metadata tables, so repeated runs over unchanged inputs
+return without reading the data again. Each table is stored under a key
+hashing the fingerprint of the input files, their paths, sizes and
+modification times, or optionally their content, together with the options
+the table was computed with.
+
+The least recently used tables are evicted once the cache grows beyond its
+maximum size.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from pymetagen.partition_index import partition_index
+from pymetagen.stats_cache import file_key
+
+DEFAULT_RESULT_CACHE_MAX_SIZE = 256 * 2**20
+RESULT_CACHE_DIR_ENV_VAR = "PYMETAGEN_CACHE_DIR"
+RESULT_CACHE_SUFFIX = ".arrow"
+
+
+def default_result_cache_dir() -> Path:
+    """
+    Directory of the metadata result cache: ``$PYMETAGEN_CACHE_DIR`` if set,
+    otherwise ``pymetagen`` in the user cache directory.
+    """
+    if RESULT_CACHE_DIR_ENV_VAR in os.environ:
+        return Path(os.environ[RESULT_CACHE_DIR_ENV_VAR])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pymetagen"
+
+
+def file_content_hash(path: Path | str) -> str:
+    """
+    SHA-256 hash of the content of a file, read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def input_fingerprint(
+    path: Path | str,
+    hash_content: bool = False,
+    partition_index_dir: Path | str | None = None,
+    partitions: Mapping[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Fingerprint of the files of an input, a file or a directory of
+    partitioned parquet files: the key of every file, see
+    :func:`pymetagen.stats_cache.file_key`, and its content hash if
+    `hash_content` is set. The files of a directory, of the selected
+    `partitions` only, are listed by its partition index, see
+    :func:`pymetagen.partition_index.partition_index`, but their keys are
+    read from the files themselves, as the index misses files rewritten in
+    place.
+    """
+    path = Path(path)
+    if path.is_dir():
+        keys = [
+            file_key(file)
+            for file in partition_index(
+                path.resolve(), partition_index_dir
+            ).paths(partitions)
+        ]
+    else:
+        keys = [file_key(path)] if path.exists() else []
+
+    if hash_content:
+        for key in keys:
+            key["sha256"] = file_content_hash(key["file"])
+    return keys
+
+
+def result_cache_key(
+    fingerprint: list[dict[str, Any]], options: dict[str, Any]
+) -> str:
+    """
+    Key of a metadata table in the cache, hashing the fingerprint of the
+    input, the options the table was computed with and the version of
+    pymetagen.
+    """
+    payload = json.dumps(
+        {
+            "version": version("pymetagen"),
+            "fingerprint": fingerprint,
+            "options": options,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MetadataResultCache:
+    """
+    Directory of cached metadata tables, one Arrow IPC file per key.
+
+    Reading a table marks it as recently used by updating the modification
+    time of its file. When a table is added, the least recently used tables
+    are removed until the cache fits in `max_size` bytes.
+
+    Args:
+        directory: directory of the cache, created on the first write.
+        max_size: maximum total size of the cached tables, in bytes.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        max_size: int = DEFAULT_RESULT_CACHE_MAX_SIZE,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer.")
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}{RESULT_CACHE_SUFFIX}"
+
+    def get(self, key: str) -> pl.DataFrame | None:
+        """
+        Cached metadata table of a key, None if it is not cached.
+        """
+        path = self._entry_path(key)
+        try:
+            metadata = pl.read_ipc(path, memory_map=False)
+            os.utime(path)
+        except (OSError, pl.exceptions.ComputeError):
+            return None
+        return metadata
+
+    def put(self, key: str, metadata: pl.DataFrame) -> None:
+        """
+        Cache the metadata table of a key and evict the least recently used
+        tables beyond the maximum size of the cache.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        temporary_path = path.with_suffix(".tmp")
+        metadata.write_ipc(temporary_path)
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used tables until the cache fits in its
+        maximum size.
+        """
+        entries = []
+        for path in self.directory.glob(f"*{RESULT_CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total_size = 0
+        for _, size, path in sorted(entries, reverse=True):
+            total_size += size
+            if total_size > self.max_size:
+                path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """
+        Remove every cached table.
+        """
+        for path in self.directory.glob(f"*{RESULT_CACHE_SUFFIX}"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,144 @@
+"""
+Sampling
+========
+
+Estimates of the count metrics of a table from the metadata of a random
+sample of its rows. Counts are scaled to the number of rows of the table and
+reported with a confidence interval, the Wilson score interval of the
+proportion of rows counted in the sample, corrected for sampling without
+replacement from a finite table.
+"""
+
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+from typing import Any
+
+from pymetagen._typing import Hashable
+from pymetagen.datatypes import MetaGenMetadataColumn
+
+SAMPLE_CONFIDENCE_LEVEL = 0.95
+
+
+def sample_size(number_of_rows: int, sample: int | float) -> int:
+    """
+    Number of rows to sample from a table.
+
+    Args:
+        number_of_rows: number of rows of the table.
+        sample: number of rows to sample if an integer, or fraction of the
+            rows to sample, in (0, 1], if a float.
+
+    Returns:
+        number of rows to sample, at most `number_of_rows`.
+    """
+    if isinstance(sample, bool) or not isinstance(sample, (int, float)):
+        raise ValueError(
+            "sample must be a number of rows or a fraction of the rows."
+        )
+    if isinstance(sample, int):
+        if sample < 1:
+            raise ValueError("sample must be a positive number of rows.")
+        return min(sample, number_of_rows)
+    if not 0 < sample <= 1:
+        raise ValueError("sample fraction must be in (0, 1].")
+    return min(max(round(sample * number_of_rows), 1), number_of_rows)
+
+
+def scaled_count(count: int, sample_size: int, number_of_rows: int) -> int:
+    """
+    Estimate of a count over the table from the count over a sample of its
+    rows.
+    """
+    if sample_size == 0:
+        return 0
+    return round(count * number_of_rows / sample_size)
+
+
+def count_confidence_interval(
+    count: int,
+    sample_size: int,
+    number_of_rows: int,
+    confidence_level: float = SAMPLE_CONFIDENCE_LEVEL,
+) -> tuple[int, int]:
+    """
+    Confidence interval of a count over the table from the count over a
+    sample of its rows drawn without replacement.
+
+    The Wilson score interval of the proportion is computed with the sample
+    size inflated by the finite population correction, so the interval
+    shrinks to the exact count as the sample grows to the whole table. It is
+    then bounded by the rows known to be counted, or not counted, from the
+    sample.
+
+    Args:
+        count: count over the sample.
+        sample_size: number of rows of the sample.
+        number_of_rows: number of rows of the table.
+        confidence_level: confidence level of the interval.
+
+    Returns:
+        lower and upper bounds of the count over the table.
+    """
+    lowest = count
+    highest = number_of_rows - (sample_size - count)
+    if sample_size == 0 or sample_size >= number_of_rows:
+        return lowest, highest
+
+    z = NormalDist().inv_cdf((1 + confidence_level) / 2)
+    correction = (number_of_rows - sample_size) / (number_of_rows - 1)
+    n = sample_size / correction
+    proportion = count / sample_size
+    denominator = 1 + z**2 / n
+    center = (proportion + z**2 / (2 * n)) / denominator
+    half_width = (
+        z
+        * math.sqrt(proportion * (1 - proportion) / n + z**2 / (4 * n**2))
+        / denominator
+    )
+    lower = math.floor((center - half_width) * number_of_rows)
+    upper = math.ceil((center + half_width) * number_of_rows)
+    return max(lower, lowest), min(upper, highest)
+
+
+def scale_sampled_metadata(
+    metadata: dict[Hashable, dict[Hashable, Any]],
+    sample_size: int,
+    number_of_rows: int,
+) -> dict[Hashable, dict[Hashable, Any]]:
+    """
+    Scale the count metrics of the metadata of a sample to estimates over the
+    table, and add their confidence intervals, see
+    :meth:`MetaGenMetadataColumn.confidence_interval_columns`.
+
+    Args:
+        metadata: metadata of the sample, i.e. ``{metric: {column: value}}``.
+        sample_size: number of rows of the sample.
+        number_of_rows: number of rows of the table.
+
+    Returns:
+        metadata with scaled counts and their confidence intervals.
+    """
+    metadata = dict(metadata)
+    for (
+        metric,
+        interval_metric,
+    ) in MetaGenMetadataColumn.confidence_interval_columns().items():
+        counts = metadata.get(metric, {})
+        metadata[metric] = {}
+        metadata[interval_metric] = {}
+        for column, count in counts.items():
+            if count is None:
+                metadata[metric][column] = None
+                metadata[interval_metric][column] = None
+                continue
+            metadata[metric][column] = scaled_count(
+                int(count), sample_size, number_of_rows
+            )
+            metadata[interval_metric][column] = list(
+                count_confidence_interval(
+                    int(count), sample_size, number_of_rows
+                )
+            )
+    return metadata
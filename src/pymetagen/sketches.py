@@ -0,0 +1,341 @@
+"""
+Sketches
+========
+
+Mergeable, bounded memory summaries of the values of a column: HyperLogLog
+for the number of distinct values and KLL for quantiles.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+import polars as pl
+
+HASH_SEED = 0
+RANK_BITS = 6
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+MIN_KLL_K = 8
+
+
+def hyperloglog_precision(relative_error: float) -> int:
+    """
+    Smallest HyperLogLog precision whose standard error, 1.04 / sqrt(2^p), is
+    below the given relative error.
+
+    Args:
+        relative_error: target relative standard error, e.g. 0.01 for 1%.
+
+    Returns:
+        precision, i.e. log2 of the number of registers.
+    """
+    if not 0 < relative_error < 1:
+        raise ValueError("relative_error must be between 0 and 1.")
+    precision = math.ceil(2 * math.log2(1.04 / relative_error))
+    return min(max(precision, MIN_PRECISION), MAX_PRECISION)
+
+
+def hyperloglog_expression(column: str | pl.Expr, precision: int) -> pl.Expr:
+    """
+    Polars expression aggregating a column into the HyperLogLog observations
+    of its non-null values.
+
+    Every value is hashed and encoded as ``register * 2^6 + rank``. Only the
+    distinct encodings are kept, so the result has at most
+    ``2^precision * (65 - precision)`` elements whatever the number of rows.
+    Build the sketch with :meth:`HyperLogLog.from_observations`.
+
+    Args:
+        column: column name or expression.
+        precision: log2 of the number of registers.
+
+    Returns:
+        expression aggregating into a list of encoded observations.
+    """
+    col = pl.col(column) if isinstance(column, str) else column
+    hashes = col.drop_nulls().hash(seed=HASH_SEED)
+    remaining_bits = 64 - precision
+    register = hashes // 2**remaining_bits
+    rank = (
+        (hashes % 2**remaining_bits).bitwise_leading_zeros().cast(pl.UInt64)
+        - precision
+        + 1
+    )
+    return (register * 2**RANK_BITS + rank).unique().implode()
+
+
+@dataclass
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating the number of distinct values.
+
+    Memory is constant, ``2^precision`` bytes, and two sketches with the same
+    precision can be merged, e.g. to combine the sketches of several chunks
+    or files.
+
+    Args:
+        precision: log2 of the number of registers. The relative standard
+            error of the estimate is 1.04 / sqrt(2^precision), see
+            :func:`hyperloglog_precision`.
+    """
+
+    precision: int = 14
+    registers: np.ndarray = field(default=None, repr=False)  # type: ignore
+
+    def __post_init__(self):
+        if not MIN_PRECISION <= self.precision <= MAX_PRECISION:
+            raise ValueError(
+                f"precision must be between {MIN_PRECISION} and"
+                f" {MAX_PRECISION}."
+            )
+        if self.registers is None:
+            self.registers = np.zeros(2**self.precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(2**self.precision)
+
+    @classmethod
+    def from_observations(
+        cls, observations: Iterable[int] | None, precision: int
+    ) -> HyperLogLog:
+        """
+        Build a sketch from the result of :func:`hyperloglog_expression`.
+        """
+        sketch = cls(precision=precision)
+        encoded = np.asarray(
+            observations if observations is not None else [], dtype=np.uint64
+        )
+        np.maximum.at(
+            sketch.registers,
+            (encoded >> np.uint64(RANK_BITS)).astype(np.int64),
+            (encoded & np.uint64(2**RANK_BITS - 1)).astype(np.uint8),
+        )
+        return sketch
+
+    @classmethod
+    def from_bytes(cls, registers: bytes) -> HyperLogLog:
+        """
+        Build a sketch from the registers returned by :meth:`to_bytes`.
+        """
+        return cls(
+            precision=int(math.log2(len(registers))),
+            registers=np.frombuffer(registers, dtype=np.uint8).copy(),
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Registers of the sketch, e.g. to persist it.
+        """
+        return self.registers.tobytes()
+
+    def update(self, values: pl.Series) -> HyperLogLog:
+        """
+        Add the non-null values of a series to the sketch.
+        """
+        observations = (
+            values.to_frame()
+            .select(hyperloglog_expression(values.name, self.precision))
+            .item()
+        )
+        return self.merge(
+            HyperLogLog.from_observations(observations, self.precision)
+        )
+
+    def merge(self, other: HyperLogLog) -> HyperLogLog:
+        """
+        Merge another sketch into this one.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        """
+        Estimated number of distinct values added to the sketch.
+        """
+        number_of_registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / number_of_registers)
+        raw_estimate = (
+            alpha
+            * number_of_registers**2
+            / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        )
+        empty_registers = int(np.count_nonzero(self.registers == 0))
+        if raw_estimate <= 2.5 * number_of_registers and empty_registers:
+            # small range correction: linear counting
+            return round(
+                number_of_registers
+                * math.log(number_of_registers / empty_registers)
+            )
+        return round(raw_estimate)
+
+
+def kll_k(rank_error: float) -> int:
+    """
+    Smallest KLL parameter `k` whose normalized rank error, about 3.3 / k
+    with 99% confidence, is below the given rank error.
+
+    Args:
+        rank_error: target rank error, e.g. 0.01 for quantiles within one
+            percentile of the exact ones.
+
+    Returns:
+        k, the size of the largest compactor of the sketch.
+    """
+    if not 0 < rank_error < 1:
+        raise ValueError("rank_error must be between 0 and 1.")
+    return max(math.ceil(3.3 / rank_error), MIN_KLL_K)
+
+
+@dataclass
+class KLL:
+    """
+    KLL sketch estimating the quantiles of numeric values.
+
+    Values are kept in compactors, one per level, each item of level `h`
+    standing for ``2^h`` values. When a compactor is full, its items are
+    sorted and every other item is promoted to the next level, so memory is
+    ``O(k)`` whatever the number of values, and two sketches with the same
+    `k` can be merged. Compactions pick their offset from a seeded generator,
+    so the same values give the same sketch.
+
+    Args:
+        k: size of the largest compactor, see :func:`kll_k`.
+    """
+
+    k: int = 200
+    compactors: list[np.ndarray] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        if self.k < MIN_KLL_K:
+            raise ValueError(f"k must be at least {MIN_KLL_K}.")
+        if not self.compactors:
+            self.compactors = [np.empty(0, dtype=np.float64)]
+
+    @property
+    def count(self) -> int:
+        """
+        Number of values added to the sketch.
+        """
+        return sum(
+            len(compactor) * 2**level
+            for level, compactor in enumerate(self.compactors)
+        )
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(math.ceil(self.k * (2 / 3) ** depth), 2)
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            compactor = self.compactors[level]
+            if len(compactor) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0, dtype=np.float64))
+                compactor = np.sort(compactor)
+                # an odd item out stays at this level
+                kept = compactor[: len(compactor) % 2]
+                compactor = compactor[len(compactor) % 2 :]
+                offset = np.random.default_rng(
+                    [level, len(compactor)]
+                ).integers(2)
+                self.compactors[level + 1] = np.concatenate(
+                    [self.compactors[level + 1], compactor[offset::2]]
+                )
+                self.compactors[level] = kept
+            level += 1
+
+    def update(self, values: Iterable[float] | np.ndarray) -> KLL:
+        """
+        Add values to the sketch. NaN values are ignored.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.compactors[0] = np.concatenate(
+            [self.compactors[0], values[~np.isnan(values)]]
+        )
+        self._compress()
+        return self
+
+    def merge(self, other: KLL) -> KLL:
+        """
+        Merge another sketch into this one.
+        """
+        if other.k != self.k:
+            raise ValueError("Cannot merge sketches of different k.")
+        for level, compactor in enumerate(other.compactors):
+            if level == len(self.compactors):
+                self.compactors.append(np.empty(0, dtype=np.float64))
+            self.compactors[level] = np.concatenate(
+                [self.compactors[level], compactor]
+            )
+        self._compress()
+        return self
+
+    def quantiles(self, quantiles: Iterable[float]) -> list[float | None]:
+        """
+        Estimated quantiles of the values added to the sketch, None if the
+        sketch is empty.
+
+        Args:
+            quantiles: quantiles between 0 and 1, e.g. 0.5 for the median.
+
+        Returns:
+            the value of each quantile.
+        """
+        items = np.concatenate(self.compactors)
+        if not len(items):
+            return [None for _ in quantiles]
+        weights = np.concatenate(
+            [
+                np.full(len(compactor), 2**level, dtype=np.float64)
+                for level, compactor in enumerate(self.compactors)
+            ]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cumulative_weights = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(list(quantiles)) * cumulative_weights[-1]
+        indexes = np.searchsorted(cumulative_weights, ranks, side="left")
+        return [float(items[min(index, len(items) - 1)]) for index in indexes]
+
+    def quantile(self, quantile: float) -> float | None:
+        """
+        Estimated quantile of the values added to the sketch.
+        """
+        return self.quantiles([quantile])[0]
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> KLL:
+        """
+        Build a sketch from the result of :meth:`to_bytes`.
+        """
+        header = np.frombuffer(data, dtype=np.int64, count=2)
+        k, number_of_levels = int(header[0]), int(header[1])
+        sizes = np.frombuffer(
+            data, dtype=np.int64, count=number_of_levels, offset=16
+        )
+        items = np.frombuffer(
+            data, dtype=np.float64, offset=16 + 8 * number_of_levels
+        )
+        bounds = np.cumsum(np.concatenate([[0], sizes]))
+        return cls(
+            k=k,
+            compactors=[
+                items[start:end].copy()
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ],
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Compactors of the sketch, e.g. to persist it.
+        """
+        sizes = [len(compactor) for compactor in self.compactors]
+        header = np.asarray([self.k, len(sizes), *sizes], dtype=np.int64)
+        return header.tobytes() + np.concatenate(self.compactors).tobytes()
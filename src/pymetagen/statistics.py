@@ -0,0 +1,561 @@
+"""
+Partial Statistics
+==================
+
+Mergeable statistics of the columns of a chunk of data. The statistics of
+every chunk of a table, computed one chunk at a time, can be merged into the
+statistics of the whole table without ever holding the table in memory.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import polars as pl
+
+from pymetagen._typing import (
+    ColumnName,
+    DataFrameT,
+    Hashable,
+    PolarsDataType,
+)
+from pymetagen.datatypes import (
+    MetaGenDataType,
+    MetaGenMetadataColumn,
+    dtype_to_metagen_type,
+)
+from pymetagen.metrics import (
+    column_expression,
+    column_metadata,
+    has_mean,
+    metadata_from_column_metadata,
+    skip_min_max,
+    unique_values_expression,
+)
+from pymetagen.sketches import KLL, HyperLogLog, hyperloglog_expression
+from pymetagen.utils import DataSchema, for_each_batch
+
+PARTIAL_STATISTICS = [
+    "count",
+    "null_count",
+    "minimum",
+    "maximum",
+    "mean",
+    "m2",
+    "zero_count",
+    "positive_count",
+    "negative_count",
+    "min_length",
+    "max_length",
+    "sketch",
+    "values",
+]
+
+
+def _statistic_alias(statistic: str, column: ColumnName) -> str:
+    return f"{statistic}:{column}"
+
+
+def _merge_optional(a: Any, b: Any, merge) -> Any:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return merge(a, b)
+
+
+def _add(a: int | None, b: int | None) -> int | None:
+    return _merge_optional(a, b, lambda x, y: x + y)
+
+
+def _is_nan(value: Any) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+@dataclass
+class PartialColumnStatistics:
+    """
+    Mergeable statistics of a column over a chunk of data.
+
+    Attributes:
+        count: number of rows.
+        null_count: number of null values.
+        minimum: smallest non-null value, None if not computable.
+        maximum: largest non-null value, None if not computable.
+        mean: mean of the non-null values, numeric and boolean columns only.
+        m2: sum of the squared differences to the mean of the non-null
+            values (Welford), numeric and boolean columns only.
+        zero_count: number of zeros, always 0 for non-numeric columns.
+        positive_count: number of positive values, numeric columns only.
+        negative_count: number of negative values, numeric columns only.
+        min_length: shortest string length in bytes, string columns only.
+        max_length: longest string length in bytes, string columns only.
+        sketch: HyperLogLog sketch of the non-null values.
+        values: unique values, null included, or None once there are
+            `max_values` or more of them.
+        max_values: maximum number of unique values kept in `values`.
+        quantile_sketch: KLL sketch of the non-null values, numeric columns
+            only, if quantiles are computed.
+
+    Statistics left to None are unknown, e.g. the ones parquet footers do not
+    hold, and are reported as None in the metadata table.
+    """
+
+    count: int = 0
+    null_count: int = 0
+    minimum: Any = None
+    maximum: Any = None
+    mean: float | None = None
+    m2: float | None = None
+    zero_count: int | None = None
+    positive_count: int | None = None
+    negative_count: int | None = None
+    min_length: int | None = None
+    max_length: int | None = None
+    sketch: HyperLogLog | None = field(default_factory=HyperLogLog)
+    values: list[Any] | None = field(default_factory=list)
+    max_values: int = 10
+    quantile_sketch: KLL | None = None
+
+    @property
+    def valid_count(self) -> int:
+        return self.count - self.null_count
+
+    @property
+    def std(self) -> float | None:
+        """
+        Sample standard deviation of the non-null values.
+        """
+        if self.m2 is None or self.valid_count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.valid_count - 1))
+
+    @property
+    def number_of_unique(self) -> int | None:
+        """
+        Number of unique values, null included. Exact if the unique values
+        are known, estimated with the sketch otherwise.
+        """
+        if self.values is not None:
+            return len(self.values)
+        if self.sketch is None:
+            return None
+        return self.sketch.estimate() + (self.null_count > 0)
+
+    def merge(self, other: PartialColumnStatistics) -> PartialColumnStatistics:
+        """
+        Merge the statistics of another chunk into these ones.
+        """
+        if self.mean is None or self.m2 is None:
+            self.mean, self.m2 = other.mean, other.m2
+        elif other.mean is not None and other.m2 is not None:
+            # Chan et al. parallel variant of Welford's algorithm
+            count = self.valid_count + other.valid_count
+            delta = other.mean - self.mean
+            self.m2 += (
+                other.m2
+                + delta**2 * self.valid_count * other.valid_count / count
+            )
+            self.mean += delta * other.valid_count / count
+
+        self.count += other.count
+        self.null_count += other.null_count
+        self.minimum = _merge_optional(self.minimum, other.minimum, min)
+        self.maximum = _merge_optional(self.maximum, other.maximum, max)
+        self.zero_count = _add(self.zero_count, other.zero_count)
+        self.positive_count = _add(self.positive_count, other.positive_count)
+        self.negative_count = _add(self.negative_count, other.negative_count)
+        self.min_length = _merge_optional(
+            self.min_length, other.min_length, min
+        )
+        self.max_length = _merge_optional(
+            self.max_length, other.max_length, max
+        )
+        if self.sketch is None or other.sketch is None:
+            self.sketch = None
+        else:
+            self.sketch.merge(other.sketch)
+        if self.quantile_sketch is None or other.quantile_sketch is None:
+            self.quantile_sketch = None
+        else:
+            self.quantile_sketch.merge(other.quantile_sketch)
+        self.values = self._merge_values(other.values)
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Statistics as a dictionary of plain values, the sketch as bytes, e.g.
+        to persist them. See :func:`partial_statistics_dtypes` for their
+        data types.
+        """
+        statistics = {
+            statistic: getattr(self, statistic)
+            for statistic in PARTIAL_STATISTICS
+        }
+        statistics["sketch"] = (
+            self.sketch.to_bytes() if self.sketch is not None else None
+        )
+        statistics["max_values"] = self.max_values
+        statistics["quantile_sketch"] = (
+            self.quantile_sketch.to_bytes()
+            if self.quantile_sketch is not None
+            else None
+        )
+        return statistics
+
+    @classmethod
+    def from_dict(
+        cls, statistics: Mapping[str, Any]
+    ) -> PartialColumnStatistics:
+        """
+        Build the statistics from the result of :meth:`to_dict`.
+        """
+        statistics = dict(statistics)
+        if statistics["sketch"] is not None:
+            statistics["sketch"] = HyperLogLog.from_bytes(statistics["sketch"])
+        if statistics["quantile_sketch"] is not None:
+            statistics["quantile_sketch"] = KLL.from_bytes(
+                statistics["quantile_sketch"]
+            )
+        return cls(**statistics)
+
+    def _merge_values(self, values: list[Any] | None) -> list[Any] | None:
+        if self.values is None or values is None:
+            return None
+        merged = list(self.values)
+        has_nan = any(_is_nan(value) for value in merged)
+        for value in values:
+            # NaN is not equal to itself but is a single unique value
+            if _is_nan(value):
+                if not has_nan:
+                    merged.append(value)
+                    has_nan = True
+            # values may be unhashable, e.g. lists of list columns
+            elif value not in merged:
+                merged.append(value)
+        return merged if len(merged) < self.max_values else None
+
+    def column_metadata(
+        self, dtype: PolarsDataType
+    ) -> dict[MetaGenMetadataColumn, Any]:
+        """
+        Metadata of the column, as reported in the metadata table.
+        """
+        values = self.values
+        if values is not None:
+            try:
+                values = sorted(values, key=lambda e: (e is None, e))
+            except TypeError:
+                pass
+
+        metadata = column_metadata(
+            {
+                MetaGenMetadataColumn.NUMBER_NULLS: self.null_count,
+                MetaGenMetadataColumn.MIN: self.minimum,
+                MetaGenMetadataColumn.MAX: self.maximum,
+                MetaGenMetadataColumn.MEAN: self.mean,
+                MetaGenMetadataColumn.STD: (
+                    self.std if dtype.is_numeric() else None
+                ),
+                MetaGenMetadataColumn.MIN_LENGTH: self.min_length,
+                MetaGenMetadataColumn.MAX_LENGTH: self.max_length,
+                MetaGenMetadataColumn.NUMBER_EMPTY_ZERO: (
+                    self.null_count + self.zero_count
+                    if self.zero_count is not None
+                    else None
+                ),
+                MetaGenMetadataColumn.NUMBER_POSITIVE: self.positive_count,
+                MetaGenMetadataColumn.NUMBER_NEGATIVE: self.negative_count,
+                MetaGenMetadataColumn.NUMBER_UNIQUE: self.number_of_unique,
+                MetaGenMetadataColumn.VALUES: values,
+            },
+            dtype=dtype,
+            row_count=self.count,
+            max_number_of_unique_to_show=self.max_values,
+        )
+        metadata.update(quantile_metadata(self.quantile_sketch))
+        return metadata
+
+
+def partial_statistics_dtypes(
+    dtype: PolarsDataType,
+) -> dict[str, PolarsDataType]:
+    """
+    Polars data types of the values of
+    :meth:`PartialColumnStatistics.to_dict` for a column.
+
+    Args:
+        dtype: Polars data type of the column.
+
+    Returns:
+        dictionary of statistic name to data type.
+    """
+    # categorical columns are summarised as strings, see column_expression
+    value_dtype = pl.Utf8 if dtype == pl.Categorical else dtype
+    return {
+        "count": pl.Int64,
+        "null_count": pl.Int64,
+        "minimum": value_dtype,
+        "maximum": value_dtype,
+        "mean": pl.Float64,
+        "m2": pl.Float64,
+        "zero_count": pl.Int64,
+        "positive_count": pl.Int64,
+        "negative_count": pl.Int64,
+        "min_length": pl.Int64,
+        "max_length": pl.Int64,
+        "sketch": pl.Binary,
+        "values": pl.List(value_dtype),
+        "max_values": pl.Int64,
+        "quantile_sketch": pl.Binary,
+    }
+
+
+def partial_statistics_expressions(
+    column: ColumnName,
+    dtype: PolarsDataType,
+    precision: int,
+    max_number_of_unique_to_show: int = 10,
+) -> dict[str, pl.Expr]:
+    """
+    Build a Polars expression for every partial statistic of a column.
+
+    Args:
+        column: name of the column.
+        dtype: Polars data type of the column.
+        precision: precision of the HyperLogLog sketch.
+        max_number_of_unique_to_show: maximum number of unique values kept.
+
+    Returns:
+        dictionary of statistic name to expression.
+    """
+    col = column_expression(column, dtype)
+    metagen_type = dtype_to_metagen_type(dtype)
+    is_numeric = metagen_type in MetaGenDataType.numeric_data_types()
+    is_string = metagen_type in MetaGenDataType.categorical_data_types()
+    null = pl.lit(None)
+
+    string_length = col.cast(pl.Utf8).str.len_bytes()
+    number = col.cast(pl.Float64) if dtype == pl.Boolean else col
+    mean = number.mean()
+    return {
+        "count": pl.len(),
+        "null_count": col.null_count(),
+        "minimum": null if skip_min_max(dtype) else col.min(),
+        "maximum": null if skip_min_max(dtype) else col.max(),
+        "mean": mean if has_mean(dtype) else null,
+        "m2": ((number - mean) ** 2).sum() if has_mean(dtype) else null,
+        "zero_count": (col == 0).sum() if is_numeric else pl.lit(0),
+        "positive_count": (col > 0).sum() if is_numeric else null,
+        "negative_count": (col < 0).sum() if is_numeric else null,
+        "min_length": string_length.min() if is_string else null,
+        "max_length": string_length.max() if is_string else null,
+        "sketch": hyperloglog_expression(col, precision),
+        "values": unique_values_expression(
+            col, dtype, max_number_of_unique_to_show
+        ),
+    }
+
+
+def quantile_metadata(
+    quantile_sketch: KLL | None,
+) -> dict[MetaGenMetadataColumn, float | None]:
+    """
+    Quantile columns of the metadata table, estimated from a KLL sketch.
+    """
+    quantile_columns = MetaGenMetadataColumn.quantile_columns()
+    if quantile_sketch is None:
+        return {column: None for column in quantile_columns}
+    return dict(
+        zip(
+            quantile_columns,
+            quantile_sketch.quantiles(quantile_columns.values()),
+        )
+    )
+
+
+def has_quantiles(dtype: PolarsDataType) -> bool:
+    """
+    Returns True if quantiles are computed for the data type.
+    """
+    return dtype.is_numeric()
+
+
+def quantile_values(data: pl.DataFrame, column: ColumnName) -> np.ndarray:
+    """
+    Non-null values of a numeric column as floats, to add to a KLL sketch.
+    """
+    return data.get_column(column).cast(pl.Float64).drop_nulls().to_numpy()
+
+
+def quantile_sketches(
+    data: DataFrameT,
+    data_schema: DataSchema,
+    k: int,
+    chunk_size: int = 100_000,
+) -> dict[ColumnName, KLL]:
+    """
+    Build a KLL sketch of every numeric column, reading the data chunk by
+    chunk, see :func:`pymetagen.utils.for_each_batch`.
+
+    Args:
+        data: polars DataFrame or LazyFrame.
+        data_schema: schema of the data.
+        k: parameter of the KLL sketches, see
+            :func:`pymetagen.sketches.kll_k`.
+        chunk_size: number of rows in a chunk.
+
+    Returns:
+        dictionary of numeric column to sketch.
+    """
+    columns = [
+        column
+        for column, dtype in data_schema.schema.items()
+        if has_quantiles(dtype)
+    ]
+    sketches = {column: KLL(k=k) for column in columns}
+
+    def update(batch: pl.DataFrame) -> None:
+        for column in columns:
+            sketches[column].update(quantile_values(batch, column))
+
+    if columns:
+        for_each_batch(data.select(columns), update, chunk_size)
+    return sketches
+
+
+def partial_statistics(
+    data: pl.DataFrame,
+    data_schema: DataSchema,
+    precision: int,
+    max_number_of_unique_to_show: int = 10,
+    quantile_k: int | None = None,
+) -> dict[ColumnName, PartialColumnStatistics]:
+    """
+    Compute the partial statistics of every column of a chunk of data in a
+    single query.
+
+    Args:
+        data: chunk of data.
+        data_schema: schema of the data.
+        precision: precision of the HyperLogLog sketches.
+        max_number_of_unique_to_show: maximum number of unique values kept
+            per column.
+        quantile_k: parameter of the KLL sketches of the numeric columns, no
+            quantiles are computed if not given.
+
+    Returns:
+        dictionary of column to partial statistics.
+    """
+    expressions = [
+        expression.alias(_statistic_alias(statistic, column))
+        for column, dtype in data_schema.schema.items()
+        for statistic, expression in partial_statistics_expressions(
+            column, dtype, precision, max_number_of_unique_to_show
+        ).items()
+    ]
+    row = data.select(expressions).row(0, named=True)
+
+    partials: dict[ColumnName, PartialColumnStatistics] = {}
+    for column, dtype in data_schema.schema.items():
+        statistics = {
+            statistic: row[_statistic_alias(statistic, column)]
+            for statistic in PARTIAL_STATISTICS
+        }
+        if quantile_k is not None and has_quantiles(dtype):
+            statistics["quantile_sketch"] = KLL(k=quantile_k).update(
+                quantile_values(data, column)
+            )
+        statistics["sketch"] = HyperLogLog.from_observations(
+            statistics["sketch"], precision
+        )
+        if len(statistics["values"]) >= max_number_of_unique_to_show:
+            statistics["values"] = None
+        partials[column] = PartialColumnStatistics(
+            **statistics, max_values=max_number_of_unique_to_show
+        )
+    return partials
+
+
+def merge_partial_statistics(
+    partials: Iterable[Mapping[ColumnName, PartialColumnStatistics]],
+) -> dict[ColumnName, PartialColumnStatistics]:
+    """
+    Merge the partial statistics of several chunks of data, column by column.
+    """
+    merged: dict[ColumnName, PartialColumnStatistics] = {}
+    for chunk_partials in partials:
+        for column, partial in chunk_partials.items():
+            if column in merged:
+                merged[column].merge(partial)
+            else:
+                merged[column] = partial
+    return merged
+
+
+def streaming_partial_statistics(
+    data: DataFrameT,
+    data_schema: DataSchema,
+    precision: int,
+    max_number_of_unique_to_show: int = 10,
+    chunk_size: int = 100_000,
+    quantile_k: int | None = None,
+) -> dict[ColumnName, PartialColumnStatistics]:
+    """
+    Compute the partial statistics of every column chunk by chunk, merging
+    them as they come, so only one chunk of data is held in memory at a time.
+
+    Args:
+        data: polars DataFrame or LazyFrame.
+        data_schema: schema of the data.
+        precision: precision of the HyperLogLog sketches.
+        max_number_of_unique_to_show: maximum number of unique values kept
+            per column.
+        chunk_size: number of rows in a chunk.
+        quantile_k: parameter of the KLL sketches of the numeric columns, no
+            quantiles are computed if not given.
+
+    Returns:
+        dictionary of column to partial statistics of the whole data.
+    """
+    merged: dict[ColumnName, PartialColumnStatistics] = {}
+
+    def update(batch: pl.DataFrame) -> None:
+        partials = partial_statistics(
+            batch,
+            data_schema,
+            precision,
+            max_number_of_unique_to_show,
+            quantile_k,
+        )
+        for column, partial in partials.items():
+            if column in merged:
+                merged[column].merge(partial)
+            else:
+                merged[column] = partial
+
+    for_each_batch(data, update, chunk_size)
+    if not merged:
+        update(pl.DataFrame(schema=data_schema.schema))
+    return merged
+
+
+def metadata_from_partial_statistics(
+    partials: Mapping[ColumnName, PartialColumnStatistics],
+    data_schema: DataSchema,
+) -> dict[Hashable, dict[Hashable, Any]]:
+    """
+    Turn the merged partial statistics of every column into the metadata
+    dictionary used by :meth:`pymetagen.MetaGen.compute_metadata`.
+    """
+    return metadata_from_column_metadata(
+        {
+            column: partials[column].column_metadata(dtype)
+            for column, dtype in data_schema.schema.items()
+        },
+        data_schema,
+    )
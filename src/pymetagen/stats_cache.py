@@ -0,0 +1,176 @@
+"""
+Partial Statistics Cache
+========================
+
+Sidecar cache of the partial statistics of the files of a dataset. Each file
+is keyed by its path, size and modification time, so on later runs only the
+new or changed files have to be read again, and their partial statistics
+merged with the cached ones.
+
+The cache is a parquet file with one row per data file and one column per
+partial statistic of every data column, named ``statistic:column``, so every
+statistic keeps the data type of its column.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from pymetagen._typing import ColumnName, PolarsDataType
+from pymetagen.statistics import (
+    PartialColumnStatistics,
+    partial_statistics_dtypes,
+)
+from pymetagen.utils import DataSchema
+
+FILE_KEY_DTYPES: dict[str, PolarsDataType] = {
+    "file": pl.Utf8,
+    "size": pl.Int64,
+    "mtime_ns": pl.Int64,
+    "precision": pl.Int64,
+    "max_values": pl.Int64,
+    "quantile_k": pl.Int64,
+}
+
+
+def _statistic_column(statistic: str, column: ColumnName) -> str:
+    return f"{statistic}:{column}"
+
+
+def file_key(path: Path | str) -> dict[str, Any]:
+    """
+    Key of a file in the cache: its absolute path, size and modification
+    time.
+    """
+    stat = os.stat(path)
+    return {
+        "file": str(Path(path).resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+class PartialStatisticsCache:
+    """
+    Cache of the partial statistics of the files of a dataset.
+
+    Entries are only valid for the schema, sketch parameters and maximum
+    number of unique values they were computed with: a cache file built for
+    another schema is ignored, entries built with other settings are
+    recomputed, and both are overwritten on :meth:`save`.
+
+    Args:
+        path: path of the cache file.
+        data_schema: schema of the data.
+        precision: precision of the HyperLogLog sketches.
+        max_number_of_unique_to_show: maximum number of unique values kept
+            per column.
+        quantile_k: parameter of the KLL sketches, if quantiles are
+            computed.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        data_schema: DataSchema,
+        precision: int,
+        max_number_of_unique_to_show: int = 10,
+        quantile_k: int | None = None,
+    ):
+        self.path = Path(path)
+        self.data_schema = data_schema
+        self.precision = precision
+        self.max_values = max_number_of_unique_to_show
+        self.quantile_k = quantile_k
+        self.schema = self._cache_schema()
+        self.entries: dict[str, dict[str, Any]] = self._load()
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+
+    def _cache_schema(self) -> dict[str, PolarsDataType]:
+        schema = FILE_KEY_DTYPES.copy()
+        for column, dtype in self.data_schema.schema.items():
+            for statistic, statistic_dtype in partial_statistics_dtypes(
+                dtype
+            ).items():
+                schema[_statistic_column(statistic, column)] = statistic_dtype
+        return schema
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        cache = pl.read_parquet(self.path)
+        if cache.schema != pl.Schema(self.schema):
+            return {}
+        return {
+            row["file"]: row
+            for row in cache.rows(named=True)
+            if row["precision"] == self.precision
+            and row["max_values"] == self.max_values
+            and row["quantile_k"] == self.quantile_k
+        }
+
+    def get(
+        self, path: Path | str
+    ) -> dict[ColumnName, PartialColumnStatistics] | None:
+        """
+        Cached partial statistics of a file, None if the file is not cached
+        or has changed since.
+        """
+        key = file_key(path)
+        entry = self.entries.get(key["file"])
+        if (
+            entry is None
+            or entry["size"] != key["size"]
+            or entry["mtime_ns"] != key["mtime_ns"]
+        ):
+            self.number_of_misses += 1
+            return None
+
+        self.number_of_hits += 1
+        return {
+            column: PartialColumnStatistics.from_dict(
+                {
+                    statistic: entry[_statistic_column(statistic, column)]
+                    for statistic in partial_statistics_dtypes(dtype)
+                }
+            )
+            for column, dtype in self.data_schema.schema.items()
+        }
+
+    def put(
+        self,
+        path: Path | str,
+        partials: dict[ColumnName, PartialColumnStatistics],
+    ) -> None:
+        """
+        Cache the partial statistics of a file.
+        """
+        entry = {
+            **file_key(path),
+            "precision": self.precision,
+            "max_values": self.max_values,
+            "quantile_k": self.quantile_k,
+        }
+        for column, partial in partials.items():
+            for statistic, value in partial.to_dict().items():
+                entry[_statistic_column(statistic, column)] = value
+        self.entries[entry["file"]] = entry
+
+    def save(self) -> None:
+        """
+        Write the cache file. The entries of files deleted from the dataset
+        are dropped, those of files not read by this run, e.g. of partitions
+        that were not selected, are kept for the next runs.
+        """
+        entries = [
+            entry
+            for file, entry in self.entries.items()
+            if os.path.exists(file)
+        ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        pl.DataFrame(entries, schema=self.schema).write_parquet(self.path)
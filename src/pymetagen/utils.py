@@ -3,10 +3,12 @@ from __future__ import annotations
 import datetime
 import json
 import os
-from collections.abc import Sequence
+import re
+from collections.abc import Callable, Sequence
 from copy import deepcopy
 from dataclasses import dataclass
 from enum import Enum
+from fnmatch import fnmatchcase
 from functools import cached_property
 from glob import glob
 from pathlib import Path
@@ -92,6 +94,53 @@ def collect(df: DataFrameT, streaming: bool = True) -> pl.DataFrame:
     return df
 
 
+def for_each_batch(
+    df: DataFrameT,
+    function: Callable[[pl.DataFrame], Any],
+    chunk_size: int = 100_000,
+) -> None:
+    """
+    Calls a function on consecutive batches of at most `chunk_size` rows of a
+    dataframe, in order.
+
+    A polars LazyFrame is run on the polars streaming engine, so it is read
+    from its source morsel by morsel and never held in memory as a whole.
+    Morsels are buffered until `chunk_size` rows are available.
+
+    Args:
+        df: polars DataFrame or LazyFrame
+        function: function called on each batch
+        chunk_size: maximum number of rows in a batch
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    if isinstance(df, pl.DataFrame):
+        for batch in df.iter_slices(chunk_size):
+            function(batch)
+        return
+
+    buffer: list[pl.DataFrame] = []
+
+    def flush(final: bool = False) -> None:
+        data = pl.concat(buffer) if len(buffer) > 1 else buffer[0]
+        buffer.clear()
+        for batch in data.iter_slices(chunk_size):
+            if batch.height < chunk_size and not final:
+                buffer.append(batch)
+            else:
+                function(batch)
+
+    def buffer_morsel(morsel: pl.DataFrame) -> pl.DataFrame:
+        buffer.append(morsel)
+        if sum(batch.height for batch in buffer) >= chunk_size:
+            flush()
+        return morsel.clear()
+
+    df.map_batches(buffer_morsel, streamable=True).collect(engine="streaming")
+    if buffer:
+        flush(final=True)
+
+
 def get_nested_path(
     base_path: Path | str, file_extension: str = "parquet"
 ) -> str:
@@ -157,11 +206,7 @@ def sample(
             replace=with_replacement,
         )
         return (
-            df.with_columns(
-                pl.Series(pl.arange(0, row_depth, eager=True)).alias(
-                    "row_index"
-                )
-            )
+            df.with_row_index("row_index")
             .filter(pl.col("row_index").is_in(row_indexes))
             .drop("row_index")
         )
@@ -338,3 +383,38 @@ def get_data_schema(df: DataFrameT) -> DataSchema:
     else:
         schema = df.collect_schema()  # type: ignore
     return DataSchema(schema=schema)
+
+
+def select_columns(
+    columns: Sequence[str], patterns: Sequence[str]
+) -> list[str]:
+    """
+    Select the columns matching any of the given names or patterns, in the
+    order of `columns`.
+
+    As in :func:`polars.col`, a pattern starting with ``^`` and ending with
+    ``$`` is a regular expression. Any other pattern is a column name or a
+    glob, e.g. ``price_*``.
+
+    Args:
+        columns: column names to select from.
+        patterns: column names, globs or regular expressions.
+
+    Returns:
+        selected column names.
+    """
+    selected: set[str] = set()
+    for pattern in patterns:
+        if pattern.startswith("^") and pattern.endswith("$"):
+            regex = re.compile(pattern)
+            matches = {column for column in columns if regex.match(column)}
+        elif pattern in columns:
+            matches = {pattern}
+        else:
+            matches = {
+                column for column in columns if fnmatchcase(column, pattern)
+            }
+        if not matches:
+            raise ValueError(f"No column matches {pattern!r}.")
+        selected |= matches
+    return [column for column in columns if column in selected]
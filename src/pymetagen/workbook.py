@@ -0,0 +1,120 @@
+"""
+Workbook Profiling
+==================
+
+Metadata of every sheet of an Excel workbook, one metadata table per sheet.
+The workbook is parsed once, by the fastest engine installed, see
+:func:`pymetagen.dataloader.default_excel_engine`, and the metadata of its
+sheets are computed in parallel by a pool of threads: Polars releases the
+GIL while it computes, and the sheets are already in memory.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import xlsxwriter  # type: ignore[import-untyped]
+
+from pymetagen.dataloader import DataLoader
+from pymetagen.datatypes import (
+    MetaGenExcelEngine,
+    MetaGenSupportedFileExtension,
+)
+from pymetagen.exceptions import FileTypeUnsupportedError
+from pymetagen.metadata_table import flat_metadata_table
+from pymetagen.metagen import MetaGen
+
+
+def profile_workbook(
+    path: Path | str,
+    sheet_names: Sequence[str] | None = None,
+    excel_engine: MetaGenExcelEngine | str | None = None,
+    workers: int | None = None,
+    **options: Any,
+) -> dict[str, MetaGen]:
+    """
+    Compute the metadata of every sheet of an Excel workbook.
+
+    Args:
+        path: path of the workbook.
+        sheet_names: names of the sheets to profile, all of them if not
+            given.
+        excel_engine: engine reading the workbook, see
+            :class:`pymetagen.datatypes.MetaGenExcelEngine`. Defaults to the
+            fastest engine installed.
+        workers: number of sheets profiled at the same time, defaults to the
+            default of :class:`concurrent.futures.ThreadPoolExecutor`.
+        options: keyword arguments of :class:`pymetagen.MetaGen`.
+
+    Returns:
+        MetaGen of every sheet with columns, with its metadata computed,
+        keyed by sheet name in workbook order.
+    """
+    path = Path(path)
+    if path.suffix != MetaGenSupportedFileExtension.XLSX.value:
+        raise FileTypeUnsupportedError(f"File {path} is not an Excel file")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be a positive integer.")
+
+    sheets = DataLoader(path, excel_engine=excel_engine).load_excel_sheets(
+        sheet_names
+    )
+    metagens = {
+        sheet_name: MetaGen(data=data, **options)
+        for sheet_name, data in sheets.items()
+        if data.width > 0
+    }
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # as with compute_metadata=True, cached for writing
+        for metagen, metadata in zip(
+            metagens.values(),
+            executor.map(
+                lambda metagen: metagen._polars_metadata, metagens.values()
+            ),
+        ):
+            metagen.polars_metadata = metadata
+    return metagens
+
+
+def sheet_metadata_path(outpath: Path, sheet_name: str) -> Path:
+    """
+    Path of the metadata file of a sheet, e.g. ``meta_Sales_2024.csv`` for
+    the sheet ``Sales 2024`` and `outpath` ``meta.csv``.
+    """
+    safe_sheet_name = re.sub(r"[^\w.-]+", "_", sheet_name)
+    return outpath.with_name(
+        f"{outpath.stem}_{safe_sheet_name}{outpath.suffix}"
+    )
+
+
+def write_workbook_metadata(
+    metagens: dict[str, MetaGen], outpath: Path | str
+) -> list[Path]:
+    """
+    Write the metadata of every sheet of a workbook, see
+    :func:`profile_workbook`: to a single Excel file with one worksheet per
+    sheet, or to one file per sheet in the other formats, see
+    :func:`sheet_metadata_path`.
+
+    Returns:
+        paths of the written files.
+    """
+    outpath = Path(outpath)
+    if outpath.suffix == MetaGenSupportedFileExtension.XLSX.value:
+        with xlsxwriter.Workbook(outpath) as workbook:
+            for sheet_name, metagen in metagens.items():
+                flat_metadata_table(metagen._polars_metadata).write_excel(
+                    workbook=workbook, worksheet=sheet_name
+                )
+        return [outpath]
+
+    paths = []
+    for sheet_name, metagen in metagens.items():
+        path = sheet_metadata_path(outpath, sheet_name)
+        metagen.write_metadata(path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,183 @@
+"""
+Benchmark Datasets
+==================
+
+Reproducible synthetic datasets of the shapes the benchmarks cover: a tall
+numeric table, a wide table of thousands of columns, a table of high
+cardinality strings and a hive partitioned parquet dataset. Every generator
+takes a `scale` multiplying its number of rows and a random `seed`, and
+writes the dataset under a directory, returning its path.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+TALL_NUMBER_OF_ROWS = 1_000_000
+WIDE_NUMBER_OF_ROWS = 1_000
+WIDE_NUMBER_OF_COLUMNS = 5_000
+STRINGS_NUMBER_OF_ROWS = 200_000
+PARTITIONED_NUMBER_OF_PARTITIONS = 20
+PARTITIONED_ROWS_PER_PARTITION = 50_000
+
+
+def _number_of_rows(number_of_rows: int, scale: float) -> int:
+    return max(round(number_of_rows * scale), 1)
+
+
+def _with_nulls(
+    values: np.ndarray, rng: np.random.Generator, fraction: float = 0.05
+) -> pl.Series:
+    return pl.Series(values).scatter(
+        np.flatnonzero(rng.random(len(values)) < fraction), None
+    )
+
+
+def tall_numeric(directory: Path, scale: float = 1.0, seed: int = 0) -> Path:
+    """
+    Parquet file of integer and float columns, some of them with nulls,
+    of 1,000,000 rows at scale 1.
+    """
+    rng = np.random.default_rng(seed)
+    number_of_rows = _number_of_rows(TALL_NUMBER_OF_ROWS, scale)
+    path = directory / "tall_numeric.parquet"
+    pl.DataFrame(
+        {
+            "id": np.arange(number_of_rows),
+            "int_small": rng.integers(-10, 10, number_of_rows),
+            "int_large": rng.integers(-(2**40), 2**40, number_of_rows),
+            "int_nulls": _with_nulls(
+                rng.integers(0, 1_000, number_of_rows), rng
+            ),
+            "float_normal": rng.normal(size=number_of_rows),
+            "float_uniform": rng.random(number_of_rows),
+            "float_nulls": _with_nulls(rng.normal(size=number_of_rows), rng),
+            "float_zeros": rng.choice([0.0, 1.5], number_of_rows),
+        }
+    ).write_parquet(path)
+    return path
+
+
+def wide(
+    directory: Path,
+    scale: float = 1.0,
+    seed: int = 0,
+    number_of_columns: int = WIDE_NUMBER_OF_COLUMNS,
+) -> Path:
+    """
+    Parquet file of `number_of_columns` float and integer columns,
+    alternating, of 1,000 rows at scale 1.
+    """
+    rng = np.random.default_rng(seed)
+    number_of_rows = _number_of_rows(WIDE_NUMBER_OF_ROWS, scale)
+    path = directory / "wide.parquet"
+    floats = rng.normal(size=(number_of_rows, number_of_columns))
+    pl.DataFrame(
+        {
+            f"column_{index:05d}": (
+                floats[:, index]
+                if index % 2 == 0
+                else (floats[:, index] * 100).astype(np.int64)
+            )
+            for index in range(number_of_columns)
+        }
+    ).write_parquet(path)
+    return path
+
+
+def high_cardinality_strings(
+    directory: Path, scale: float = 1.0, seed: int = 0
+) -> Path:
+    """
+    CSV file of string columns of mostly unique values, of 200,000 rows at
+    scale 1.
+    """
+    rng = np.random.default_rng(seed)
+    number_of_rows = _number_of_rows(STRINGS_NUMBER_OF_ROWS, scale)
+    path = directory / "high_cardinality_strings.csv"
+    identifiers = rng.integers(0, 2**62, number_of_rows)
+    pl.DataFrame(
+        {
+            "uuid_like": [f"{value:016x}" for value in identifiers],
+            "email": [f"user{value}@example.com" for value in identifiers],
+            "text": [
+                "lorem ipsum " * int(length)
+                for length in rng.integers(0, 20, number_of_rows)
+            ],
+            "category": rng.choice(
+                [f"category_{index}" for index in range(1_000)],
+                number_of_rows,
+            ),
+            "amount": rng.normal(100, 20, number_of_rows),
+        }
+    ).write_csv(path)
+    return path
+
+
+def hive_partitioned(
+    directory: Path, scale: float = 1.0, seed: int = 0
+) -> Path:
+    """
+    Directory of parquet files partitioned by ``day``, 20 partitions of
+    50,000 rows at scale 1.
+    """
+    rng = np.random.default_rng(seed)
+    rows_per_partition = _number_of_rows(PARTITIONED_ROWS_PER_PARTITION, scale)
+    path = directory / "hive_partitioned"
+    for day in range(1, PARTITIONED_NUMBER_OF_PARTITIONS + 1):
+        partition_path = path / f"day={day:02d}"
+        partition_path.mkdir(parents=True, exist_ok=True)
+        pl.DataFrame(
+            {
+                "value": rng.normal(size=rows_per_partition),
+                "quantity": rng.integers(0, 100, rows_per_partition),
+                "label": rng.choice(["a", "b", "c"], rows_per_partition),
+            }
+        ).write_parquet(partition_path / "part-0.parquet")
+    return path
+
+
+@dataclass
+class BenchmarkDataset:
+    """
+    Dataset of the benchmarks.
+
+    Args:
+        name: name of the dataset in the results.
+        generate: function writing the dataset, see the generators above.
+        filter_query: SQL query over the ``data`` table filtering the
+            dataset, to benchmark :meth:`pymetagen.MetaGen.filter_data`.
+    """
+
+    name: str
+    generate: Callable[..., Path]
+    filter_query: str
+
+
+DATASETS = [
+    BenchmarkDataset(
+        name="tall_numeric",
+        generate=tall_numeric,
+        filter_query="SELECT * FROM data WHERE float_normal > 0",
+    ),
+    BenchmarkDataset(
+        name="wide",
+        generate=wide,
+        filter_query="SELECT * FROM data WHERE column_00000 > 0",
+    ),
+    BenchmarkDataset(
+        name="high_cardinality_strings",
+        generate=high_cardinality_strings,
+        filter_query="SELECT * FROM data WHERE amount > 100",
+    ),
+    BenchmarkDataset(
+        name="hive_partitioned",
+        generate=hive_partitioned,
+        filter_query="SELECT * FROM data WHERE quantity < 50",
+    ),
+]
@@ -0,0 +1,264 @@
+"""
+Memory Benchmarks
+=================
+
+Peak memory of every ``metagen`` subcommand over tall numeric datasets of
+increasing size, see :func:`tests.benchmarks.datasets.tall_numeric`. Each
+subcommand runs in a fresh process, :mod:`tests.benchmarks.memory_child`,
+which reports:
+
+- ``peak_rss``: peak resident memory of the process, including the memory
+  Polars allocates outside of the Python heap.
+- ``python_peak_memory``: peak memory of the Python allocations of the
+  subcommand, traced with :mod:`tracemalloc`.
+- ``allocated_blocks``: Python memory blocks still allocated by the
+  subcommand when it returns.
+
+The peak RSS of a subcommand must fit in its budget: a base covering the
+interpreter and its imports, plus a factor of the in-memory size of the
+input data. Runs exceeding their budget are reported and make the command
+fail::
+
+    python -m tests.benchmarks.memory -o memory.json --budgets budgets.json
+
+where ``budgets.json`` overrides the default budgets, e.g.
+``{"metadata": {"base_mib": 256, "factor": 4}}``.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import click
+import polars as pl
+
+from tests.benchmarks.datasets import tall_numeric
+
+MEMORY_BENCHMARK_SCALES = (0.01, 0.1, 1.0)
+REPOSITORY_DIR = Path(__file__).parents[2]
+
+
+@dataclass
+class MemoryBudget:
+    """
+    Budget of the peak RSS of a subcommand.
+
+    Args:
+        base_mib: memory allowed whatever the input, in MiB.
+        factor: memory allowed per byte of the in-memory size of the input.
+    """
+
+    base_mib: float
+    factor: float
+
+    def limit(self, data_size: int) -> int:
+        """
+        Peak RSS allowed for an input of `data_size` bytes in memory.
+        """
+        return round(self.base_mib * 2**20 + self.factor * data_size)
+
+
+DEFAULT_MEMORY_BUDGETS = {
+    "metadata": MemoryBudget(base_mib=256, factor=6),
+    "inspect": MemoryBudget(base_mib=256, factor=2),
+    "extracts": MemoryBudget(base_mib=256, factor=3),
+    "filter": MemoryBudget(base_mib=256, factor=3),
+}
+
+
+def _metadata_arguments(path: Path, output_directory: Path) -> list[str]:
+    return [
+        "metadata",
+        "-i",
+        str(path),
+        "-o",
+        str(output_directory / "metadata.json"),
+        "--no-cache",
+    ]
+
+
+def _inspect_arguments(path: Path, output_directory: Path) -> list[str]:
+    return ["inspect", "-i", str(path)]
+
+
+def _extracts_arguments(path: Path, output_directory: Path) -> list[str]:
+    return ["extracts", "-i", str(path), "-o", str(output_directory / "e.csv")]
+
+
+def _filter_arguments(path: Path, output_directory: Path) -> list[str]:
+    return [
+        "filter",
+        "-i",
+        str(path),
+        "-t",
+        "data",
+        "-q",
+        "SELECT * FROM data WHERE float_normal > 0",
+        "-o",
+        str(output_directory / "filtered.parquet"),
+    ]
+
+
+SUBCOMMAND_ARGUMENTS: dict[str, Callable[[Path, Path], list[str]]] = {
+    "metadata": _metadata_arguments,
+    "inspect": _inspect_arguments,
+    "extracts": _extracts_arguments,
+    "filter": _filter_arguments,
+}
+
+
+def measure_subcommand(
+    arguments: Sequence[str], usage_path: Path
+) -> dict[str, int]:
+    """
+    Run a ``metagen`` subcommand in a fresh process and return its memory
+    usage, see :mod:`tests.benchmarks.memory_child`.
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "tests.benchmarks.memory_child",
+            str(usage_path),
+            *arguments,
+        ],
+        capture_output=True,
+        text=True,
+        cwd=REPOSITORY_DIR,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"metagen {' '.join(arguments)} failed:\n{process.stderr}"
+        )
+    return json.loads(usage_path.read_text())
+
+
+def run_memory_benchmarks(
+    directory: Path,
+    scales: Sequence[float] = MEMORY_BENCHMARK_SCALES,
+    subcommands: Sequence[str] = tuple(SUBCOMMAND_ARGUMENTS),
+    budgets: dict[str, MemoryBudget] = DEFAULT_MEMORY_BUDGETS,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """
+    Measure the memory usage of subcommands over tall numeric datasets of
+    every scale, generated under a directory.
+
+    Returns:
+        memory usage of every subcommand and scale, with the in-memory size
+        of the data and the budget of the peak RSS.
+    """
+    results = []
+    for scale in scales:
+        scale_directory = directory / f"scale-{scale}"
+        scale_directory.mkdir(parents=True, exist_ok=True)
+        path = tall_numeric(scale_directory, scale=scale, seed=seed)
+        data_size = pl.read_parquet(path).estimated_size()
+        for subcommand in subcommands:
+            usage = measure_subcommand(
+                SUBCOMMAND_ARGUMENTS[subcommand](path, scale_directory),
+                scale_directory / f"{subcommand}-usage.json",
+            )
+            budget = budgets[subcommand].limit(data_size)
+            results.append(
+                {
+                    "subcommand": subcommand,
+                    "scale": scale,
+                    "data_size": data_size,
+                    **usage,
+                    "budget": budget,
+                    "within_budget": (
+                        usage["peak_rss"] is None
+                        or usage["peak_rss"] <= budget
+                    ),
+                }
+            )
+    return results
+
+
+def load_budgets(path: Path | None) -> dict[str, MemoryBudget]:
+    """
+    Default budgets overridden by the budgets of a JSON file, if any.
+    """
+    budgets = dict(DEFAULT_MEMORY_BUDGETS)
+    if path is not None:
+        for subcommand, budget in json.loads(path.read_text()).items():
+            if subcommand not in budgets:
+                raise ValueError(f"Unknown subcommand {subcommand!r}.")
+            budgets[subcommand] = MemoryBudget(**budget)
+    return budgets
+
+
+@click.command()
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path, writable=True),
+    required=True,
+    help="Path of the JSON file to save the results to.",
+)
+@click.option(
+    "--budgets",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help=(
+        "(optional) JSON file of the memory budgets of the subcommands,"
+        ' e.g. {"metadata": {"base_mib": 256, "factor": 4}}.'
+    ),
+)
+@click.option(
+    "--scale",
+    "scales",
+    type=click.FloatRange(min=0, min_open=True),
+    multiple=True,
+    help=(
+        "(optional) Scale of the input, can be given several times."
+        " Defaults to 0.01, 0.1 and 1, i.e. 10,000 to 1,000,000 rows."
+    ),
+)
+@click.option(
+    "--subcommand",
+    "subcommands",
+    type=click.Choice(list(SUBCOMMAND_ARGUMENTS)),
+    multiple=True,
+    help="(optional) Subcommand to measure. Defaults to all subcommands.",
+)
+def main(
+    output: Path,
+    budgets: Path | None,
+    scales: tuple[float, ...],
+    subcommands: tuple[str, ...],
+) -> None:
+    """
+    Measure the peak memory of the metagen subcommands.
+    """
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        results = run_memory_benchmarks(
+            Path(tmpdirname),
+            scales=scales or MEMORY_BENCHMARK_SCALES,
+            subcommands=subcommands or tuple(SUBCOMMAND_ARGUMENTS),
+            budgets=load_budgets(budgets),
+        )
+    output.write_text(json.dumps(results, indent=4))
+    click.echo(f"Results written to {output}")
+
+    over_budget = [result for result in results if not result["within_budget"]]
+    for result in over_budget:
+        click.echo(
+            f"metagen {result['subcommand']} at scale {result['scale']}:"
+            f" peak RSS {result['peak_rss'] / 2**20:.1f} MiB exceeds its"
+            f" budget of {result['budget'] / 2**20:.1f} MiB"
+        )
+    if over_budget:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Runs a ``metagen`` subcommand and writes its memory usage as JSON, to be run
+in a fresh process by :mod:`tests.benchmarks.memory`::
+
+    python -m tests.benchmarks.memory_child usage.json metadata -i data.csv
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+from pymetagen.app import cli
+from pymetagen.profiling import process_peak_memory
+
+
+def main(usage_path: Path, arguments: list[str]) -> None:
+    allocated_blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    cli.main(arguments, standalone_mode=False)
+    _, python_peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated_blocks = sys.getallocatedblocks() - allocated_blocks
+    usage_path.write_text(
+        json.dumps(
+            {
+                "peak_rss": process_peak_memory(),
+                "python_peak_memory": python_peak_memory,
+                "allocated_blocks": allocated_blocks,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]), sys.argv[2:])
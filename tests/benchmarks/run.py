@@ -0,0 +1,379 @@
+"""
+Benchmarks
+==========
+
+Benchmarks of :class:`pymetagen.MetaGen` over the synthetic datasets of
+:mod:`tests.benchmarks.datasets`, in every loading mode: loading the data,
+``compute_metadata`` in the given execution modes, ``extract_data`` in every
+inspection mode, ``filter_data`` and every ``write_metadata`` and
+``write_data`` format. The wall times are saved as JSON, together with the
+versions they were measured with, so the results of two releases can be
+compared::
+
+    python -m tests.benchmarks.run -o baseline.json
+    python -m tests.benchmarks.run -o current.json --baseline baseline.json
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import click
+import polars as pl
+
+from pymetagen import MetaGen, __version__
+from pymetagen.datatypes import (
+    MetaGenExecutionMode,
+    MetaGenSupportedFileExtension,
+    MetaGenSupportedLoadingMode,
+)
+from pymetagen.utils import InspectionMode
+from tests.benchmarks.datasets import DATASETS, BenchmarkDataset
+
+WRITE_FORMATS = [
+    MetaGenSupportedFileExtension.CSV,
+    MetaGenSupportedFileExtension.JSON,
+    MetaGenSupportedFileExtension.PARQUET,
+    MetaGenSupportedFileExtension.XLSX,
+]
+DEFAULT_REGRESSION_THRESHOLD = 0.1
+
+
+def measure(function: Callable[[], Any], repeat: int) -> list[float]:
+    """
+    Wall times, in seconds, of `repeat` calls of a function.
+    """
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        wall_times.append(time.perf_counter() - start)
+    return wall_times
+
+
+def _result(
+    dataset: str,
+    loading_mode: str,
+    operation: str,
+    wall_times: list[float],
+    **parameters: Any,
+) -> dict[str, Any]:
+    return {
+        "dataset": dataset,
+        "loading_mode": loading_mode,
+        "operation": operation,
+        "parameters": parameters,
+        "wall_times": wall_times,
+        "min": min(wall_times),
+        "median": statistics.median(wall_times),
+    }
+
+
+def benchmark_dataset(
+    path: Path,
+    dataset: BenchmarkDataset,
+    loading_mode: MetaGenSupportedLoadingMode,
+    output_directory: Path,
+    executions: Sequence[MetaGenExecutionMode],
+    repeat: int,
+    extract_rows: int,
+) -> list[dict[str, Any]]:
+    """
+    Benchmark every operation of :class:`pymetagen.MetaGen` over a dataset
+    in a loading mode.
+
+    Args:
+        path: path of the dataset.
+        dataset: dataset to benchmark.
+        loading_mode: loading mode of the data.
+        output_directory: directory the metadata and data are written to.
+        executions: execution modes to compute the metadata in. The
+            metadata written is the one of the last mode.
+        repeat: number of times every operation is measured.
+        extract_rows: number of rows of the extracts, which are the data
+            the ``write_data`` formats are measured on.
+
+    Returns:
+        results of the operations.
+    """
+    results = []
+
+    def record(operation: str, function: Callable[[], Any], **parameters):
+        results.append(
+            _result(
+                dataset.name,
+                loading_mode.value,
+                operation,
+                measure(function, repeat),
+                **parameters,
+            )
+        )
+
+    def load() -> MetaGen:
+        return MetaGen.from_path(path, loading_mode=loading_mode)
+
+    record("load", load)
+
+    metagen = load()
+    for execution in executions:
+        metagen = MetaGen(data=metagen.data, execution=execution, path=path)
+        record(
+            "compute_metadata",
+            metagen.compute_metadata,
+            execution=execution.value,
+        )
+
+    for inspection_mode in InspectionMode:
+        record(
+            "extract_data",
+            lambda: metagen.extract_data(
+                inspection_mode=inspection_mode,
+                tbl_rows=extract_rows,
+                random_seed=0,
+            ),
+            inspection_mode=inspection_mode.value,
+        )
+
+    def filter_data() -> None:
+        filtered = load()
+        filtered.filter_data("data", dataset.filter_query)
+        filtered.data.lazy().select(pl.len()).collect()
+
+    record("filter_data", filter_data)
+
+    metadata_by_output_format = metagen.metadata_by_output_format()
+    extract = metagen.extract_data(
+        inspection_mode=InspectionMode.head, tbl_rows=extract_rows
+    )
+    for output_format in WRITE_FORMATS:
+        metadata_path = output_directory / f"metadata{output_format.value}"
+        record(
+            "write_metadata",
+            lambda: metagen.write_metadata(
+                metadata_path, metadata_by_output_format[output_format.value]
+            ),
+            format=output_format.value,
+        )
+        data_path = output_directory / f"data{output_format.value}"
+        record(
+            "write_data",
+            lambda: metagen.write_data(data_path, extract),
+            format=output_format.value,
+        )
+    return results
+
+
+def run_benchmarks(
+    directory: Path,
+    datasets: Sequence[BenchmarkDataset] = DATASETS,
+    loading_modes: Sequence[MetaGenSupportedLoadingMode] = tuple(
+        MetaGenSupportedLoadingMode
+    ),
+    executions: Sequence[MetaGenExecutionMode] = (MetaGenExecutionMode.FUSED,),
+    scale: float = 1.0,
+    seed: int = 0,
+    repeat: int = 3,
+    extract_rows: int = 1_000,
+) -> dict[str, Any]:
+    """
+    Generate the datasets under a directory and benchmark them in every
+    loading mode, see :func:`benchmark_dataset`.
+
+    Returns:
+        JSON serializable results, with the versions and the options they
+        were measured with.
+    """
+    results = []
+    for dataset in datasets:
+        dataset_directory = directory / dataset.name
+        dataset_directory.mkdir(parents=True, exist_ok=True)
+        path = dataset.generate(dataset_directory, scale=scale, seed=seed)
+        for loading_mode in loading_modes:
+            output_directory = (
+                dataset_directory / f"output-{loading_mode.value}"
+            )
+            output_directory.mkdir(exist_ok=True)
+            results.extend(
+                benchmark_dataset(
+                    path,
+                    dataset,
+                    loading_mode,
+                    output_directory,
+                    executions=executions,
+                    repeat=repeat,
+                    extract_rows=extract_rows,
+                )
+            )
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "pymetagen": __version__,
+            "polars": pl.__version__,
+            "python": platform.python_version(),
+        },
+        "platform": platform.platform(),
+        "options": {
+            "scale": scale,
+            "seed": seed,
+            "repeat": repeat,
+            "extract_rows": extract_rows,
+            "executions": [execution.value for execution in executions],
+        },
+        "results": results,
+    }
+
+
+def _result_key(result: dict[str, Any]) -> str:
+    return json.dumps(
+        [
+            result["dataset"],
+            result["loading_mode"],
+            result["operation"],
+            result["parameters"],
+        ],
+        sort_keys=True,
+    )
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """
+    Regressions of the current results over the baseline: the operations
+    whose minimum wall time grew by more than `threshold`, as a fraction of
+    the baseline time.
+
+    Returns:
+        the regressed results, with their baseline minimum wall time and the
+        ratio of the current one to it.
+    """
+    baseline_times = {
+        _result_key(result): result["min"] for result in baseline["results"]
+    }
+    regressions = []
+    for result in current["results"]:
+        baseline_time = baseline_times.get(_result_key(result))
+        if not baseline_time:
+            continue
+        ratio = result["min"] / baseline_time
+        if ratio > 1 + threshold:
+            regressions.append(
+                {**result, "baseline_min": baseline_time, "ratio": ratio}
+            )
+    return regressions
+
+
+@click.command()
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path, writable=True),
+    required=True,
+    help="Path of the JSON file to save the results to.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="(optional) Results to compare the new results with.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_REGRESSION_THRESHOLD,
+    help=(
+        "(optional) Growth of the minimum wall time over the baseline, as a"
+        " fraction, reported as a regression. Defaults to 0.1."
+    ),
+)
+@click.option(
+    "--scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    help="(optional) Multiplier of the number of rows of every dataset.",
+)
+@click.option(
+    "--dataset",
+    "dataset_names",
+    type=click.Choice([dataset.name for dataset in DATASETS]),
+    multiple=True,
+    help="(optional) Dataset to benchmark. Defaults to all datasets.",
+)
+@click.option(
+    "--execution",
+    "executions",
+    type=click.Choice(MetaGenExecutionMode.values()),
+    multiple=True,
+    help=(
+        "(optional) Execution mode to compute the metadata in, can be given"
+        " several times. Defaults to fused: the sequential mode runs several"
+        " queries per column, which takes long on the wide dataset."
+    ),
+)
+@click.option("--seed", type=click.INT, default=0, help="Random seed.")
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=3,
+    help="(optional) Number of measurements of every operation.",
+)
+def main(
+    output: Path,
+    baseline: Path | None,
+    threshold: float,
+    scale: float,
+    dataset_names: tuple[str, ...],
+    executions: tuple[str, ...],
+    seed: int,
+    repeat: int,
+) -> None:
+    """
+    Benchmark pymetagen over synthetic datasets.
+    """
+    datasets = [
+        dataset
+        for dataset in DATASETS
+        if not dataset_names or dataset.name in dataset_names
+    ]
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        results = run_benchmarks(
+            Path(tmpdirname),
+            datasets=datasets,
+            executions=[
+                MetaGenExecutionMode(execution) for execution in executions
+            ]
+            or [MetaGenExecutionMode.FUSED],
+            scale=scale,
+            seed=seed,
+            repeat=repeat,
+        )
+    output.write_text(json.dumps(results, indent=4))
+    click.echo(f"Results written to {output}")
+
+    if baseline is not None:
+        regressions = compare_results(
+            json.loads(baseline.read_text()), results, threshold
+        )
+        for regression in regressions:
+            click.echo(
+                f"{regression['dataset']} {regression['loading_mode']}"
+                f" {regression['operation']} {regression['parameters']}:"
+                f" {regression['baseline_min']:.4f}s ->"
+                f" {regression['min']:.4f}s (x{regression['ratio']:.2f})"
+            )
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Smoke tests of the benchmarks on tiny datasets, so they keep running."""
+
+import json
+from functools import partial
+from pathlib import Path
+
+import polars as pl
+import pytest
+from click.testing import CliRunner
+
+from pymetagen.datatypes import MetaGenSupportedLoadingMode
+from pymetagen.utils import InspectionMode
+from tests.benchmarks.datasets import (
+    DATASETS,
+    BenchmarkDataset,
+    high_cardinality_strings,
+    hive_partitioned,
+    tall_numeric,
+    wide,
+)
+from tests.benchmarks.run import (
+    WRITE_FORMATS,
+    compare_results,
+    main,
+    run_benchmarks,
+)
+
+SCALE = 0.0001
+
+
+@pytest.fixture
+def datasets() -> list[BenchmarkDataset]:
+    return [
+        (
+            BenchmarkDataset(
+                name=dataset.name,
+                generate=partial(wide, number_of_columns=20),
+                filter_query=dataset.filter_query,
+            )
+            if dataset.name == "wide"
+            else dataset
+        )
+        for dataset in DATASETS
+    ]
+
+
+def test_datasets(tmp_dir_path: Path):
+    tall = pl.read_parquet(tall_numeric(tmp_dir_path, scale=SCALE))
+    assert tall.shape == (100, 8)
+    assert tall["int_nulls"].null_count() > 0
+
+    assert pl.read_parquet(
+        wide(tmp_dir_path, scale=SCALE, number_of_columns=50)
+    ).shape == (1, 50)
+
+    strings = pl.read_csv(high_cardinality_strings(tmp_dir_path, scale=0.01))
+    assert strings["uuid_like"].n_unique() == len(strings) == 2_000
+
+    partitioned = hive_partitioned(tmp_dir_path, scale=SCALE)
+    assert len(list(partitioned.glob("day=*/*.parquet"))) == 20
+
+
+def test_datasets_are_reproducible(tmp_dir_path: Path):
+    paths = []
+    for name in ("first", "second"):
+        (tmp_dir_path / name).mkdir()
+        paths.append(tall_numeric(tmp_dir_path / name, scale=SCALE, seed=1))
+    first, second = (pl.read_parquet(path) for path in paths)
+    assert first.equals(second)
+
+
+def test_run_benchmarks(tmp_dir_path: Path, datasets: list[BenchmarkDataset]):
+    results = run_benchmarks(
+        tmp_dir_path, datasets=datasets, scale=SCALE, repeat=1
+    )
+
+    assert json.loads(json.dumps(results)) == results
+    operations_per_run = (
+        1  # load
+        + 1  # compute_metadata
+        + len(InspectionMode)
+        + 1  # filter_data
+        + 2 * len(WRITE_FORMATS)
+    )
+    assert len(results["results"]) == (
+        len(datasets) * len(MetaGenSupportedLoadingMode) * operations_per_run
+    )
+    assert {result["loading_mode"] for result in results["results"]} == set(
+        MetaGenSupportedLoadingMode.values()
+    )
+    for result in results["results"]:
+        assert len(result["wall_times"]) == 1
+        assert result["min"] == result["median"] >= 0
+
+
+def test_compare_results():
+    def results(wall_time: float) -> dict:
+        return {
+            "results": [
+                {
+                    "dataset": "wide",
+                    "loading_mode": "lazy",
+                    "operation": "compute_metadata",
+                    "parameters": {"execution": "fused"},
+                    "min": wall_time,
+                }
+            ]
+        }
+
+    assert compare_results(results(1.0), results(1.05)) == []
+    [regression] = compare_results(results(1.0), results(2.0))
+    assert regression["ratio"] == 2.0
+    assert compare_results(results(1.0), results(2.0), threshold=1.5) == []
+
+
+def test_main(tmp_dir_path: Path):
+    output = tmp_dir_path / "results.json"
+    runner = CliRunner()
+    arguments = [
+        "-o",
+        str(output),
+        "--dataset",
+        "tall_numeric",
+        "--scale",
+        str(SCALE),
+        "--repeat",
+        "1",
+    ]
+    result = runner.invoke(main, arguments)
+    assert result.exit_code == 0
+
+    baseline = json.loads(output.read_text())
+    for baseline_result in baseline["results"]:
+        baseline_result["min"] /= 100
+    baseline_path = tmp_dir_path / "baseline.json"
+    baseline_path.write_text(json.dumps(baseline))
+
+    result = runner.invoke(main, [*arguments, "--baseline", baseline_path])
+    assert result.exit_code == 1
+    assert "tall_numeric" in result.output
@@ -0,0 +1,76 @@
+"""Smoke tests of the memory benchmarks on tiny datasets."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from tests.benchmarks.memory import (
+    DEFAULT_MEMORY_BUDGETS,
+    SUBCOMMAND_ARGUMENTS,
+    MemoryBudget,
+    load_budgets,
+    main,
+    run_memory_benchmarks,
+)
+
+SCALE = 0.001
+
+
+def test_memory_budget():
+    assert MemoryBudget(base_mib=1, factor=2).limit(100) == 2**20 + 200
+
+
+def test_load_budgets(tmp_dir_path: Path):
+    assert load_budgets(None) == DEFAULT_MEMORY_BUDGETS
+
+    path = tmp_dir_path / "budgets.json"
+    path.write_text(json.dumps({"inspect": {"base_mib": 1, "factor": 1}}))
+    budgets = load_budgets(path)
+    assert budgets["inspect"] == MemoryBudget(base_mib=1, factor=1)
+    assert budgets["metadata"] == DEFAULT_MEMORY_BUDGETS["metadata"]
+
+    path.write_text(json.dumps({"unknown": {"base_mib": 1, "factor": 1}}))
+    with pytest.raises(ValueError, match="unknown"):
+        load_budgets(path)
+
+
+def test_run_memory_benchmarks(tmp_dir_path: Path):
+    results = run_memory_benchmarks(tmp_dir_path, scales=[SCALE])
+
+    assert [result["subcommand"] for result in results] == list(
+        SUBCOMMAND_ARGUMENTS
+    )
+    for result in results:
+        assert result["data_size"] > 0
+        assert result["peak_rss"] is None or result["peak_rss"] > 0
+        assert result["python_peak_memory"] > 0
+        assert result["within_budget"]
+    assert (tmp_dir_path / f"scale-{SCALE}" / "metadata.json").exists()
+
+
+def test_main_over_budget(tmp_dir_path: Path):
+    budgets_path = tmp_dir_path / "budgets.json"
+    budgets_path.write_text(
+        json.dumps({"inspect": {"base_mib": 1, "factor": 0}})
+    )
+    output = tmp_dir_path / "memory.json"
+    result = CliRunner().invoke(
+        main,
+        [
+            "-o",
+            str(output),
+            "--budgets",
+            str(budgets_path),
+            "--scale",
+            str(SCALE),
+            "--subcommand",
+            "inspect",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "metagen inspect" in result.output
+    [memory] = json.loads(output.read_text())
+    assert not memory["within_budget"]
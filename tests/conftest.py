@@ -1,10 +1,16 @@
+import bz2
+import datetime
+import gzip
+import lzma
 import shutil
 import tempfile
 from pathlib import Path
 from typing import Any
 
 import polars as pl
+import pyarrow as pa
 import pytest
+import xlsxwriter
 
 
 @pytest.fixture(scope="session")
@@ -20,6 +26,14 @@ def test_data_dir():
         yield tmp_test_dir
 
 
+@pytest.fixture(autouse=True)
+def result_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the metadata result cache of the CLI out of the user cache."""
+    path = tmp_path / "result_cache"
+    monkeypatch.setenv("PYMETAGEN_CACHE_DIR", str(path))
+    return path
+
+
 @pytest.fixture
 def tmp_dir_path(tmpdir) -> Path:
     return Path(tmpdir)
@@ -50,6 +64,25 @@ def input_parquet_path(eager_data: pl.DataFrame, test_data_dir: Path) -> Path:
     return path
 
 
+@pytest.fixture(params=[".gz", ".zst", ".bz2", ".xz"])
+def input_compressed_csv_path(
+    request: pytest.FixtureRequest, input_csv_path: Path, test_data_dir: Path
+) -> Path:
+    """
+    Compresses the CSV data fixture with gzip, zstd, bz2 and xz.
+    """
+    path = test_data_dir / f"input.csv{request.param}"
+    content = input_csv_path.read_bytes()
+    if request.param == ".zst":
+        with pa.CompressedOutputStream(str(path), "zstd") as f:
+            f.write(content)
+    else:
+        opener = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+        with opener[request.param](path, "wb") as f:
+            f.write(content)
+    return path
+
+
 @pytest.fixture
 def input_xlsx_path(eager_data: pl.DataFrame, test_data_dir: Path) -> Path:
     """
@@ -60,6 +93,44 @@ def input_xlsx_path(eager_data: pl.DataFrame, test_data_dir: Path) -> Path:
     return path
 
 
+@pytest.fixture
+def input_ndjson_path(eager_data: pl.DataFrame, test_data_dir: Path) -> Path:
+    """
+    Uses the CSV data fixture to create a newline delimited JSON file.
+    """
+    path = test_data_dir / "input.ndjson"
+    eager_data.write_ndjson(path)
+    return path
+
+
+@pytest.fixture
+def input_json_path(eager_data: pl.DataFrame, test_data_dir: Path) -> Path:
+    """
+    Uses the CSV data fixture to create a JSON file holding an array of
+    records.
+    """
+    path = test_data_dir / "input.json"
+    eager_data.write_json(path)
+    return path
+
+
+@pytest.fixture
+def input_workbook_path(
+    eager_data: pl.DataFrame, df_mixed_types: pl.DataFrame, tmp_dir_path: Path
+) -> Path:
+    """
+    Excel workbook with two sheets of data and an empty sheet.
+    """
+    path = tmp_dir_path / "workbook.xlsx"
+    with xlsxwriter.Workbook(path) as workbook:
+        eager_data.write_excel(workbook, worksheet="Sales 2024")
+        workbook.add_worksheet("Empty")
+        df_mixed_types.select("integer", "float", "string").write_excel(
+            workbook, worksheet="Stock"
+        )
+    return path
+
+
 @pytest.fixture
 def descriptions_csv_path(test_data_dir: Path) -> Path:
     return test_data_dir / "descriptions.csv"
@@ -88,3 +159,29 @@ def df_eager() -> pl.DataFrame:
             "c": [1, 2, 3, 4, 5],
         }
     )
+
+
+@pytest.fixture
+def df_mixed_types() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "integer": [1, -2, 0, None, 5],
+            "float": [1.5, None, 0.0, -3.25, 2.0],
+            "string": ["a", "bb", None, "ccc", "a"],
+            "bool": [True, False, None, True, True],
+            "date": [
+                datetime.date(2020, 1, 1),
+                None,
+                datetime.date(2021, 1, 1),
+                datetime.date(2020, 5, 1),
+                datetime.date(2020, 5, 1),
+            ],
+            "category": pl.Series(
+                ["x", "y", None, "x", "z"], dtype=pl.Categorical
+            ),
+            "all_nulls": [None, None, None, None, None],
+            "many_values": list(range(5)),
+            # mean 2 and std 2, described as integers
+            "whole": [0, 4, 2, 0, 4],
+        }
+    )
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
+import polars as pl
 import pytest
 from click.testing import CliRunner
 
 from pymetagen.app import cli
-from pymetagen.datatypes import MetaGenSupportedLoadingMode
+from pymetagen.datatypes import (
+    MetaGenExecutionMode,
+    MetaGenSupportedLoadingMode,
+)
 from pymetagen.utils import InspectionMode
 
 
@@ -21,6 +26,7 @@ class TestCli:
             "input_csv_path",
             "input_parquet_path",
             "input_xlsx_path",
+            "input_ndjson_path",
         ],
     )
     def test_cli_metadata(
@@ -49,6 +55,7 @@ class TestCli:
             "input_csv_path",
             "input_parquet_path",
             "input_xlsx_path",
+            "input_ndjson_path",
         ],
     )
     def test_cli_inspect(
@@ -69,6 +76,7 @@ class TestCli:
             "input_csv_path",
             "input_parquet_path",
             "input_xlsx_path",
+            "input_ndjson_path",
         ],
     )
     def test_cli_inspect_writing(
@@ -98,6 +106,7 @@ class TestCli:
             "input_csv_path",
             "input_parquet_path",
             "input_xlsx_path",
+            "input_ndjson_path",
         ],
     )
     def test_cli_extracts_writing(
@@ -187,3 +196,657 @@ class TestCli:
         assert outpath.exists()
         assert outpath.is_file()
         assert outpath.stat().st_size > 0
+
+    @pytest.mark.parametrize(
+        "execution",
+        [
+            execution
+            for execution in MetaGenExecutionMode.values()
+            if execution != MetaGenExecutionMode.FOOTER.value
+        ],
+    )
+    def test_cli_metadata_execution(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+        execution: MetaGenExecutionMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                "--execution",
+                execution,
+            ],
+        )
+
+        assert result.exit_code == 0
+
+        assert outpath.exists()
+        assert outpath.stat().st_size > 0
+
+    def test_cli_metadata_approx_unique(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                "--approx-unique",
+                "--approx-unique-error",
+                "0.02",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "# unique (approx)" in outpath.read_text()
+
+    def test_cli_metadata_footer(
+        self,
+        input_parquet_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_parquet_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                "--execution",
+                MetaGenExecutionMode.FOOTER.value,
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert outpath.stat().st_size > 0
+
+    def test_cli_metadata_stats_cache(
+        self,
+        input_parquet_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.csv"
+        stats_cache_path: Path = tmp_dir_path / "stats-cache.parquet"
+        arguments = [
+            "metadata",
+            "-i",
+            str(input_parquet_path),
+            "-o",
+            str(outpath),
+            "-m",
+            mode,
+            "--execution",
+            MetaGenExecutionMode.STREAMING.value,
+            "--stats-cache",
+            str(stats_cache_path),
+        ]
+        result = runner.invoke(cli, arguments)
+        assert result.exit_code == 0
+        assert stats_cache_path.exists()
+
+        first_metadata = outpath.read_text()
+        result = runner.invoke(cli, arguments)
+        assert result.exit_code == 0
+        assert outpath.read_text() == first_metadata
+
+    def test_cli_metadata_streaming_chunk_size(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                "--execution",
+                MetaGenExecutionMode.STREAMING.value,
+                "--chunk-size",
+                "2",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "# unique (approx)" in outpath.read_text()
+
+    def test_cli_metadata_quantiles(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                "--quantiles",
+                "--quantile-error",
+                "0.05",
+            ],
+        )
+
+        assert result.exit_code == 0
+        header = outpath.read_text().splitlines()[0]
+        for column in ("25%", "50%", "75%", "95%", "99%"):
+            assert column in header
+
+    @pytest.mark.parametrize(
+        "sample_option", [["--sample-rows", "2"], ["--sample-fraction", "0.5"]]
+    )
+    def test_cli_metadata_sample(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+        sample_option: list[str],
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                *sample_option,
+                "--random-seed",
+                "0",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "# nulls (95% CI)" in outpath.read_text()
+
+    def test_cli_metadata_sample_rows_and_fraction(
+        self,
+        input_csv_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-m",
+                mode,
+                "--sample-rows",
+                "2",
+                "--sample-fraction",
+                "0.5",
+            ],
+        )
+
+        assert result.exit_code == 2
+        assert "mutually exclusive" in result.output
+
+    def test_cli_metadata_columns_and_metrics(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.json"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                "--columns",
+                "a",
+                "--columns",
+                "^c$",
+                "--metrics",
+                "Max",
+                "--metrics",
+                "# nulls",
+            ],
+        )
+
+        assert result.exit_code == 0
+        metadata = json.loads(outpath.read_text())["fields"]
+        assert list(metadata) == ["a", "c"]
+        assert list(metadata["a"]) == [
+            "Long Name",
+            "Type",
+            "Description",
+            "Max",
+            "# nulls",
+        ]
+
+    @pytest.mark.parametrize(
+        "cache_options, number_of_entries",
+        [([], 1), (["--hash-content"], 1), (["--no-cache"], 0)],
+    )
+    def test_cli_metadata_result_cache(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        result_cache_dir: Path,
+        mode: MetaGenSupportedLoadingMode,
+        cache_options: list[str],
+        number_of_entries: int,
+    ) -> None:
+        runner = CliRunner()
+        outputs = []
+        for name in ("first.csv", "second.csv"):
+            outpath: Path = tmp_dir_path / name
+            result = runner.invoke(
+                cli,
+                [
+                    "metadata",
+                    "-i",
+                    str(input_csv_path),
+                    "-o",
+                    str(outpath),
+                    "-m",
+                    mode,
+                    *cache_options,
+                ],
+            )
+            assert result.exit_code == 0
+            outputs.append(outpath.read_text())
+
+        assert outputs[0] == outputs[1]
+        assert len(list(result_cache_dir.glob("*.arrow"))) == number_of_entries
+
+    @pytest.mark.parametrize(
+        "cache_options, number_of_indexes", [([], 1), (["--no-cache"], 0)]
+    )
+    def test_cli_metadata_partition_index(
+        self,
+        test_data_dir: Path,
+        tmp_dir_path: Path,
+        result_cache_dir: Path,
+        mode: MetaGenSupportedLoadingMode,
+        cache_options: list[str],
+        number_of_indexes: int,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.json"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(test_data_dir / "input_ab_partition"),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                *cache_options,
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert set(json.loads(outpath.read_text())["fields"]) == {
+            "a",
+            "b",
+            "c",
+        }
+        indexes = list(
+            (result_cache_dir / "partition_index").glob("*.parquet")
+        )
+        assert len(indexes) == number_of_indexes
+
+    def test_cli_metadata_profile(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        result_cache_dir: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.json"
+        profile_path: Path = tmp_dir_path / "profile.json"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                "--execution",
+                MetaGenExecutionMode.FUSED,
+                "--profile",
+                str(profile_path),
+            ],
+        )
+
+        assert result.exit_code == 0
+        profile = json.loads(profile_path.read_text())
+        assert list(profile["wall_time_by_metric"]) == ["all metrics"]
+        assert len(profile["records"]) == 1
+        assert (
+            profile["records"][0]["rows_scanned"] == profile["number_of_rows"]
+        )
+        assert "SELECT" in profile["records"][0]["plan"]
+        assert not list(result_cache_dir.glob("*.arrow"))
+
+    def test_cli_metadata_printed_progressively(
+        self,
+        input_csv_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-m",
+                mode,
+                "--no-cache",
+                "--show-descriptions",
+            ],
+        )
+
+        assert result.exit_code == 0
+        columns = pl.read_csv(input_csv_path).columns
+        lines = result.output.splitlines()
+        start = lines.index("Metadata:") + 1
+        assert [
+            line.split(" - ")[0] for line in lines[start:][: len(columns)]
+        ] == columns
+        assert "Column descriptions:" in result.output
+
+    def test_cli_metadata_max_unique_values(
+        self,
+        input_csv_path: Path,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+    ) -> None:
+        runner = CliRunner()
+        outpath: Path = tmp_dir_path / "meta.json"
+        result = runner.invoke(
+            cli,
+            [
+                "metadata",
+                "-i",
+                str(input_csv_path),
+                "-o",
+                str(outpath),
+                "-m",
+                mode,
+                "--max-unique-values",
+                "2",
+            ],
+        )
+
+        assert result.exit_code == 0
+        fields = json.loads(outpath.read_text())["fields"]
+        assert all(field["Values"] is None for field in fields.values())
+
+
+def test_cli_batch(input_csv_path: Path, tmp_dir_path: Path) -> None:
+    broken_path = tmp_dir_path / "broken.parquet"
+    broken_path.write_text("not a parquet file")
+    input_list = tmp_dir_path / "inputs.txt"
+    input_list.write_text(f"{input_csv_path}\n{broken_path}\n")
+    output_dir = tmp_dir_path / "metadata"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "batch",
+            "--input-list",
+            str(input_list),
+            "-o",
+            str(output_dir),
+            "-f",
+            ".csv",
+            "--workers",
+            "2",
+            "--no-cache",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "1 of 2 files could not be computed" in result.output
+    index = pl.read_csv(output_dir / "metadata_index.csv")
+    assert index["error"].is_null().to_list() == [True, False]
+    assert pl.read_csv(index["output"][0]).height == len(
+        pl.read_csv(input_csv_path).columns
+    )
+
+
+def test_cli_batch_without_inputs(tmp_dir_path: Path) -> None:
+    runner = CliRunner()
+    result = runner.invoke(cli, ["batch", "-o", str(tmp_dir_path)])
+
+    assert result.exit_code == 2
+
+
+def test_cli_catalog(input_csv_path: Path, tmp_dir_path: Path) -> None:
+    root = tmp_dir_path / "lake"
+    (root / "sales").mkdir(parents=True)
+    pl.read_csv(input_csv_path).write_csv(root / "sales" / "sales.csv")
+    runner = CliRunner()
+    result = runner.invoke(cli, ["catalog", str(root), "--workers", "1"])
+
+    assert result.exit_code == 0
+    assert "1 datasets: 1 profiled, 0 unchanged, 0 failed" in result.output
+    assert (root / "_catalog.parquet").exists()
+    assert (root / "_catalog.json").exists()
+
+    result = runner.invoke(cli, ["catalog", str(root), "--workers", "1"])
+    assert "1 datasets: 0 profiled, 1 unchanged, 0 failed" in result.output
+
+
+@pytest.mark.parametrize("mode", MetaGenSupportedLoadingMode.values())
+def test_cli_metadata_ndjson(
+    input_ndjson_path: Path,
+    tmp_dir_path: Path,
+    mode: MetaGenSupportedLoadingMode,
+) -> None:
+    runner = CliRunner()
+    outpath: Path = tmp_dir_path / "meta.json"
+    result = runner.invoke(
+        cli,
+        [
+            "metadata",
+            "-i",
+            str(input_ndjson_path),
+            "-o",
+            str(outpath),
+            "-m",
+            mode,
+            "--infer-schema-length",
+            "1",
+        ],
+    )
+
+    assert result.exit_code == 0
+    fields = json.loads(outpath.read_text())["fields"]
+    assert list(fields) == pl.read_ndjson(input_ndjson_path).columns
+
+
+@pytest.mark.parametrize("mode", MetaGenSupportedLoadingMode.values())
+def test_cli_metadata_compressed_csv(
+    input_compressed_csv_path: Path,
+    eager_data: pl.DataFrame,
+    tmp_dir_path: Path,
+    mode: MetaGenSupportedLoadingMode,
+) -> None:
+    runner = CliRunner()
+    outpath: Path = tmp_dir_path / "meta.json"
+    result = runner.invoke(
+        cli,
+        [
+            "metadata",
+            "-i",
+            str(input_compressed_csv_path),
+            "-o",
+            str(outpath),
+            "-m",
+            mode,
+        ],
+    )
+
+    assert result.exit_code == 0
+    fields = json.loads(outpath.read_text())["fields"]
+    assert list(fields) == eager_data.columns
+
+
+@pytest.mark.parametrize(
+    "partition_options, values_of_a",
+    [
+        (["--partition", "a=1", "--partition", "a=7"], [1, 7]),
+        (["--partition-range", "a=2:"], [4, 7]),
+        (["--partition-range", "a=:4", "--partition", "b=5"], [4]),
+    ],
+)
+def test_cli_partitions(
+    test_data_dir: Path,
+    tmp_dir_path: Path,
+    partition_options: list[str],
+    values_of_a: list[int],
+) -> None:
+    runner = CliRunner()
+    input_path = str(test_data_dir / "input_ab_partition")
+    metadata_path: Path = tmp_dir_path / "meta.json"
+    result = runner.invoke(
+        cli,
+        ["metadata", "-i", input_path, "-o", str(metadata_path)]
+        + partition_options,
+    )
+    assert result.exit_code == 0
+    fields = json.loads(metadata_path.read_text())["fields"]
+    assert fields["a"]["Values"] == values_of_a
+
+    extract_path: Path = tmp_dir_path / "extract.csv"
+    result = runner.invoke(
+        cli,
+        ["inspect", "-i", input_path, "-o", str(extract_path)]
+        + partition_options,
+    )
+    assert result.exit_code == 0
+    assert sorted(pl.read_csv(extract_path)["a"]) == values_of_a
+
+
+@pytest.mark.parametrize(
+    "partition_options",
+    [
+        ["--partition", "a"],
+        ["--partition-range", "a=1"],
+        ["--partition", "z=1"],
+        ["--partition", "a=1", "--partition-range", "a=1:2"],
+    ],
+)
+def test_cli_invalid_partitions(
+    test_data_dir: Path, partition_options: list[str]
+) -> None:
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["inspect", "-i", str(test_data_dir / "input_ab_partition")]
+        + partition_options,
+    )
+    assert result.exit_code == 2
+
+
+def test_cli_metadata_all_sheets(
+    input_workbook_path: Path, tmp_dir_path: Path
+) -> None:
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "metadata",
+            "-i",
+            str(input_workbook_path),
+            "--all-sheets",
+            "--excel-engine",
+            "openpyxl",
+        ],
+    )
+    assert result.exit_code == 0
+    assert "Metadata of sheet Sales 2024:" in result.output
+    assert "Metadata of sheet Stock:" in result.output
+
+    outpath = tmp_dir_path / "meta.csv"
+    result = runner.invoke(
+        cli,
+        [
+            "metadata",
+            "-i",
+            str(input_workbook_path),
+            "-o",
+            str(outpath),
+            "--all-sheets",
+        ],
+    )
+    assert result.exit_code == 0
+    assert pl.read_csv(tmp_dir_path / "meta_Stock.csv").height == 3
+
+    result = runner.invoke(
+        cli,
+        [
+            "metadata",
+            "-i",
+            str(input_workbook_path),
+            "--all-sheets",
+            "--preview",
+        ],
+    )
+    assert result.exit_code == 2
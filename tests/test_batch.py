@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from pymetagen.batch import (
+    BATCH_INDEX_FILE_NAME,
+    BatchResult,
+    default_threads_per_worker,
+    expand_inputs,
+    metadata_output_path,
+    run_batch,
+)
+
+
+@pytest.fixture
+def batch_inputs(tmp_dir_path: Path, eager_data: pl.DataFrame) -> list[Path]:
+    """
+    Two CSV files and a parquet file, one of them in a subdirectory.
+    """
+    (tmp_dir_path / "drops" / "2024").mkdir(parents=True)
+    paths = [
+        tmp_dir_path / "drops" / "sales.csv",
+        tmp_dir_path / "drops" / "2024" / "sales.csv",
+        tmp_dir_path / "drops" / "2024" / "stock.parquet",
+    ]
+    eager_data.write_csv(paths[0])
+    eager_data.head(5).write_csv(paths[1])
+    eager_data.write_parquet(paths[2])
+    return paths
+
+
+def test_expand_inputs(tmp_dir_path: Path, batch_inputs: list[Path]):
+    drops = tmp_dir_path / "drops"
+    assert expand_inputs([drops / "*.csv"]) == [batch_inputs[0]]
+    assert expand_inputs([f"{drops}/**/*.csv"]) == [
+        batch_inputs[1],
+        batch_inputs[0],
+    ]
+
+    input_list = tmp_dir_path / "inputs.txt"
+    input_list.write_text(
+        f"# drops of the day\n{batch_inputs[2]}\n\n{drops}/*.csv\n"
+    )
+    assert expand_inputs([batch_inputs[0]], input_list) == [
+        batch_inputs[0],
+        batch_inputs[2],
+    ]
+
+
+def test_default_threads_per_worker(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    assert default_threads_per_worker(1) == 8
+    assert default_threads_per_worker(3) == 2
+    assert default_threads_per_worker(16) == 1
+
+
+def test_metadata_output_path(tmp_dir_path: Path, batch_inputs: list[Path]):
+    root = (tmp_dir_path / "drops").resolve()
+    output_dir = tmp_dir_path / "metadata"
+    assert metadata_output_path(
+        batch_inputs[1], root, output_dir, ".json"
+    ) == (output_dir / "2024" / "sales_metadata.json")
+    assert metadata_output_path(
+        root / "sales.csv.gz", root, output_dir, ".json"
+    ) == (output_dir / "sales_metadata.json")
+
+
+def test_run_batch(tmp_dir_path: Path, batch_inputs: list[Path]):
+    bad_input = tmp_dir_path / "drops" / "broken.parquet"
+    bad_input.write_text("not a parquet file")
+    paths = [*batch_inputs, bad_input]
+    output_dir = tmp_dir_path / "metadata"
+    done: list[BatchResult] = []
+
+    results = run_batch(
+        paths,
+        output_dir,
+        workers=2,
+        threads_per_worker=1,
+        callback=done.append,
+        result_cache_dir=None,
+    )
+
+    assert [result.input for result in results] == [str(p) for p in paths]
+    assert sorted(result.input for result in done) == sorted(
+        result.input for result in results
+    )
+    for result in results[:3]:
+        assert result.error is None
+        fields = json.loads(Path(result.output).read_text())["fields"]
+        assert len(fields) == result.number_of_columns
+    assert Path(results[1].output) == (
+        output_dir / "2024" / "sales_metadata.json"
+    )
+    assert results[3].output is None
+    assert results[3].error is not None
+
+    index = pl.read_csv(output_dir / BATCH_INDEX_FILE_NAME)
+    assert index["input"].to_list() == [str(p) for p in paths]
+    assert index["error"].is_null().to_list() == [True, True, True, False]
+
+
+def test_run_batch_same_output(tmp_dir_path: Path, batch_inputs: list[Path]):
+    csv_path = batch_inputs[2].with_suffix(".csv")
+    csv_path.write_text("a\n1\n")
+    with pytest.raises(ValueError):
+        run_batch([batch_inputs[2], csv_path], tmp_dir_path / "metadata")
+
+
+def test_run_batch_invalid_workers(
+    tmp_dir_path: Path, batch_inputs: list[Path]
+):
+    with pytest.raises(ValueError):
+        run_batch(batch_inputs, tmp_dir_path, workers=0)
+    with pytest.raises(ValueError):
+        run_batch(batch_inputs, tmp_dir_path, threads_per_worker=0)
@@ -0,0 +1,159 @@
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from pymetagen.catalog import (
+    DatasetProfile,
+    build_catalog,
+    catalog_table,
+    find_datasets,
+    is_partitioned_dataset,
+    read_catalog,
+)
+
+
+@pytest.fixture
+def lake(
+    tmp_dir_path: Path, test_data_dir: Path, eager_data: pl.DataFrame
+) -> Path:
+    """
+    A data lake with a hive partitioned dataset, a CSV file in a
+    subdirectory, a corrupted parquet file and hidden files.
+    """
+    root = tmp_dir_path / "lake"
+    shutil.copytree(test_data_dir / "input_ab_partition", root / "events")
+    (root / "events" / "_SUCCESS").touch()
+    (root / "sales").mkdir()
+    eager_data.write_csv(root / "sales" / "sales.csv")
+    (root / "broken.parquet").write_text("not a parquet file")
+    (root / ".staging").mkdir()
+    eager_data.write_csv(root / ".staging" / "sales.csv")
+    return root
+
+
+def test_is_partitioned_dataset(lake: Path, test_data_dir: Path):
+    assert is_partitioned_dataset(lake / "events")
+    assert is_partitioned_dataset(test_data_dir / "input_ab_partition")
+    assert not is_partitioned_dataset(lake / "sales")
+    assert not is_partitioned_dataset(
+        test_data_dir / "directory_without_parquet"
+    )
+
+
+def test_find_datasets(lake: Path):
+    assert find_datasets(lake) == [
+        lake / "broken.parquet",
+        lake / "events",
+        lake / "sales" / "sales.csv",
+    ]
+    assert find_datasets(lake / "events") == [lake / "events"]
+
+
+def test_find_datasets_compressed_csv(lake: Path, eager_data: pl.DataFrame):
+    with gzip.open(lake / "sales" / "returns.csv.gz", "wb") as f:
+        eager_data.write_csv(f)
+    (lake / "sales" / "notes.txt.gz").write_bytes(b"")
+    assert find_datasets(lake / "sales") == [
+        lake / "sales" / "returns.csv.gz",
+        lake / "sales" / "sales.csv",
+    ]
+
+
+def test_build_catalog(lake: Path, eager_data: pl.DataFrame):
+    profiled: list[DatasetProfile] = []
+    profiles = build_catalog(
+        lake, workers=2, threads_per_worker=1, callback=profiled.append
+    )
+
+    assert [profile.dataset for profile in profiles] == [
+        "broken.parquet",
+        "events",
+        "sales/sales.csv",
+    ]
+    assert len(profiled) == 3
+    assert profiles[0].error is not None
+    assert profiles[1].row_count == 3
+    assert set(profiles[1].schema) == {"a", "b", "c"}
+    assert profiles[2].row_count == eager_data.height
+    assert profiles[2].schema == {
+        column: str(dtype) for column, dtype in eager_data.schema.items()
+    }
+
+    table = pl.read_parquet(lake / "_catalog.parquet")
+    assert table.columns[:6] == [
+        "Dataset",
+        "Fingerprint",
+        "# rows",
+        "Name",
+        "Data Type",
+        "Error",
+    ]
+    assert table.filter(pl.col("Dataset") == "sales/sales.csv")[
+        "Name"
+    ].to_list() == list(eager_data.columns)
+
+    catalog = json.loads((lake / "_catalog.json").read_text())
+    sales = catalog["datasets"]["sales/sales.csv"]
+    assert sales["row_count"] == eager_data.height
+    assert list(sales["fields"]) == eager_data.columns
+    assert catalog["datasets"]["broken.parquet"]["fields"] == {}
+
+
+def test_build_catalog_profiles_changed_datasets(
+    lake: Path, eager_data: pl.DataFrame
+):
+    build_catalog(lake, workers=1)
+    eager_data.head(1).write_csv(lake / "sales" / "sales.csv")
+    eager_data.write_csv(lake / "sales" / "returns.csv")
+
+    profiles = {
+        profile.dataset: profile for profile in build_catalog(lake, workers=1)
+    }
+
+    # the failed dataset is tried again
+    assert {
+        dataset for dataset, profile in profiles.items() if profile.profiled
+    } == {"broken.parquet", "sales/returns.csv", "sales/sales.csv"}
+    assert profiles["sales/sales.csv"].row_count == 1
+    assert profiles["events"].row_count == 3
+
+    profiles_rebuilt = build_catalog(lake, workers=1, rebuild=True)
+    assert all(profile.profiled for profile in profiles_rebuilt)
+
+
+def test_read_catalog(lake: Path, tmp_dir_path: Path):
+    profiles = build_catalog(lake, output_dir=tmp_dir_path, workers=1)
+    read_profiles = read_catalog(tmp_dir_path / "_catalog.parquet")
+
+    assert list(read_profiles) == [profile.dataset for profile in profiles]
+    for profile in profiles:
+        read_profile = read_profiles[profile.dataset]
+        assert read_profile.fingerprint == profile.fingerprint
+        assert read_profile.schema == profile.schema
+        assert read_profile.error == profile.error
+        assert not read_profile.profiled
+        if profile.metadata is not None:
+            assert read_profile.metadata.equals(profile.metadata)
+    assert read_catalog(tmp_dir_path / "missing.parquet") == {}
+
+
+def test_catalog_table_without_datasets():
+    table = catalog_table([])
+    assert table.is_empty()
+    assert table.columns == [
+        "Dataset",
+        "Fingerprint",
+        "# rows",
+        "Name",
+        "Data Type",
+        "Error",
+    ]
+
+
+def test_build_catalog_invalid_root(tmp_dir_path: Path):
+    with pytest.raises(ValueError):
+        build_catalog(tmp_dir_path / "missing")
@@ -0,0 +1,72 @@
+from typing import Callable
+
+import polars as pl
+import pytest
+
+from pymetagen import MetaGen
+from pymetagen.column_statistics import ColumnStatisticsStore
+from pymetagen.datatypes import MetaGenDataType
+
+
+@pytest.fixture
+def counted_collects(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    lazy_collect = pl.LazyFrame.collect
+    collects: list[int] = []
+
+    def counted_collect(self, *args, **kwargs):
+        collects.append(1)
+        return lazy_collect(self, *args, **kwargs)
+
+    monkeypatch.setattr(pl.LazyFrame, "collect", counted_collect)
+    return collects
+
+
+@pytest.mark.parametrize("df_constructor", [pl.DataFrame, pl.LazyFrame])
+def test_counts_computed_once(
+    df_constructor: Callable,
+    df_mixed_types: pl.DataFrame,
+    counted_collects: list[int],
+):
+    store = ColumnStatisticsStore(df_constructor(df_mixed_types))
+
+    assert store.row_count() == 5
+    assert store.null_count("integer") == 1
+    assert store.null_count("many_values") == 0
+    assert store.is_all_null("all_nulls")
+    assert not store.is_all_null("string")
+    # a single query computes the row count and every null count
+    assert len(counted_collects) == 1
+
+
+def test_counts_of_len_column():
+    data = pl.DataFrame({"len": [1, None, 3]})
+    store = ColumnStatisticsStore(data)
+
+    assert store.row_count() == 3
+    assert store.null_count("len") == 1
+    assert MetaGen(data=data).compute_metadata()["# nulls"]["len"] == 1
+
+
+def test_metagen_type(df_mixed_types: pl.DataFrame):
+    store = ColumnStatisticsStore(df_mixed_types)
+    assert store.metagen_type("float") == MetaGenDataType.float.value
+    assert store.metagen_type("category") == MetaGenDataType.string.value
+
+
+def test_sketch(df_mixed_types: pl.DataFrame, counted_collects: list[int]):
+    store = ColumnStatisticsStore(df_mixed_types.lazy())
+
+    sketch = store.sketch("string", precision=10)
+    assert sketch.estimate() == 3
+    assert store.sketch("string", precision=10) is sketch
+    assert len(counted_collects) == 1
+    assert store.sketch("string", precision=12) is not sketch
+
+
+def test_reset(df_mixed_types: pl.DataFrame):
+    store = ColumnStatisticsStore(df_mixed_types)
+    assert store.row_count() == 5
+
+    store.reset(df_mixed_types.filter(pl.col("integer") > 0))
+    assert store.row_count() == 2
+    assert store.null_count("integer") == 0
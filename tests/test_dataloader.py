@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from pymetagen.dataloader import (
+    DataLoader,
+    LazyDataLoader,
+    data_file_extension,
+    file_compression,
+    is_newline_delimited_json,
+)
+from pymetagen.datatypes import MetaGenCompression
+from pymetagen.exceptions import FileTypeUnsupportedError
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ('{"a": 1}\n{"a": 2}\n', True),
+        ('\n{"a": 1}', False),
+        ('[{"a": 1}, {"a": 2}]', False),
+        ('{\n    "a": 1\n}\n', False),
+        ('{"a": 1}', True),
+    ],
+)
+def test_is_newline_delimited_json(
+    content: str, expected: bool, tmp_dir_path: Path
+):
+    path = tmp_dir_path / "data.json"
+    path.write_text(content)
+    assert is_newline_delimited_json(path) == expected
+
+
+def test_load_json(input_json_path: Path, eager_data: pl.DataFrame):
+    assert DataLoader(input_json_path)().equals(eager_data)
+    with pytest.warns(UserWarning):
+        data = LazyDataLoader(input_json_path)()
+    assert data.equals(eager_data)
+
+
+def test_load_ndjson(input_ndjson_path: Path, eager_data: pl.DataFrame):
+    assert DataLoader(input_ndjson_path)().equals(eager_data)
+    data = LazyDataLoader(input_ndjson_path)()
+    assert isinstance(data, pl.LazyFrame)
+    assert data.select("a").collect().equals(eager_data.select("a"))
+
+
+def test_load_json_options(tmp_dir_path: Path):
+    path = tmp_dir_path / "data.ndjson"
+    path.write_text('{"a": 1}\n{"a": 2}\n')
+
+    assert DataLoader(path)().schema["a"] == pl.Int64
+    data = DataLoader(
+        path, polars_read_json_options={"schema_overrides": {"a": pl.Float64}}
+    )()
+    assert data["a"].to_list() == [1.0, 2.0]
+
+
+@pytest.mark.parametrize(
+    "name, compression, extension",
+    [
+        ("sales.csv.gz", MetaGenCompression.GZIP, ".csv"),
+        ("sales.csv.zst", MetaGenCompression.ZSTD, ".csv"),
+        ("sales.json.xz", MetaGenCompression.XZ, ".json"),
+        ("sales.csv", None, ".csv"),
+        ("sales.bz2", MetaGenCompression.BZ2, ""),
+    ],
+)
+def test_file_compression(
+    name: str, compression: MetaGenCompression | None, extension: str
+):
+    assert file_compression(name) == compression
+    assert data_file_extension(name) == extension
+
+
+def test_load_compressed_csv(
+    input_compressed_csv_path: Path, eager_data: pl.DataFrame
+):
+    assert DataLoader(input_compressed_csv_path)().equals(eager_data)
+    data = LazyDataLoader(input_compressed_csv_path)()
+    assert isinstance(data, pl.LazyFrame)
+    assert data.select("a").collect().equals(eager_data.select("a"))
+
+
+def test_load_compressed_unsupported(tmp_dir_path: Path):
+    path = tmp_dir_path / "data.json.gz"
+    with gzip.open(path, "wt") as f:
+        f.write('{"a": 1}\n')
+    with pytest.raises(FileTypeUnsupportedError):
+        DataLoader(path)()
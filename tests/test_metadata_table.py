@@ -0,0 +1,124 @@
+import datetime
+import subprocess
+import sys
+
+import polars as pl
+
+from pymetagen.datatypes import MetaGenMetadataColumn
+from pymetagen.metadata_table import (
+    build_metadata_table,
+    decode_values,
+    encode_values,
+    flat_metadata_table,
+    metadata_table_to_dict,
+    metadata_table_to_pandas,
+)
+
+METADATA = {
+    MetaGenMetadataColumn.TYPE: {"a": "integer", "b": "date"},
+    MetaGenMetadataColumn.MIN: {"a": "1", "b": "2020-01-01"},
+    MetaGenMetadataColumn.NUMBER_NULLS: {"a": 1, "b": 0},
+    MetaGenMetadataColumn.NUMBER_POSITIVE: {"a": 2, "b": None},
+    MetaGenMetadataColumn.NUMBER_NULLS_CI: {"a": [0, 3], "b": [0, 0]},
+    MetaGenMetadataColumn.VALUES: {
+        "a": [1, 2, None],
+        "b": [datetime.date(2020, 1, 1)],
+    },
+}
+METADATA_COLUMNS = [
+    MetaGenMetadataColumn.TYPE,
+    MetaGenMetadataColumn.MIN,
+    MetaGenMetadataColumn.STD,
+    MetaGenMetadataColumn.NUMBER_NULLS,
+    MetaGenMetadataColumn.NUMBER_POSITIVE,
+    MetaGenMetadataColumn.NUMBER_NULLS_CI,
+    MetaGenMetadataColumn.VALUES,
+]
+
+
+def table() -> pl.DataFrame:
+    return build_metadata_table(METADATA, ["a", "b"], METADATA_COLUMNS)
+
+
+def test_encode_decode_values():
+    assert encode_values(None) is None
+    assert encode_values([1, None, datetime.date(2020, 1, 1)]) == (
+        '[1, null, "2020-01-01"]'
+    )
+    assert decode_values('[1, null, "é"]') == [1, None, "é"]
+    assert decode_values(None) is None
+
+
+def test_decode_values_by_type():
+    values = {
+        "date": [datetime.date(2020, 1, 1), None],
+        "datetime": [
+            datetime.datetime(2020, 1, 1, 12, 30, 0, 5),
+            datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+        ],
+        "time": [datetime.time(1, 2, 3, 4)],
+        "duration": [
+            datetime.timedelta(days=-1, seconds=5, microseconds=7),
+            datetime.timedelta(days=2, hours=3),
+            datetime.timedelta(seconds=1),
+        ],
+    }
+    for metagen_type, type_values in values.items():
+        encoded = encode_values(type_values)
+        assert decode_values(encoded, metagen_type) == type_values
+    assert decode_values('["2020-01-01"]', "string") == ["2020-01-01"]
+
+
+def test_build_metadata_table():
+    metadata = table()
+
+    assert metadata.columns == ["Name"] + [
+        column.value for column in METADATA_COLUMNS
+    ]
+    assert metadata.schema["# positive"] == pl.Int64
+    assert metadata.schema["# nulls (95% CI)"] == pl.List(pl.Int64)
+    assert metadata["Std"].to_list() == [None, None]
+    assert metadata["Values"].to_list() == ["[1, 2, null]", '["2020-01-01"]']
+
+
+def test_flat_metadata_table():
+    metadata = flat_metadata_table(table())
+    assert metadata["# nulls (95% CI)"].to_list() == ["[0, 3]", "[0, 0]"]
+    assert metadata["Values"].to_list() == [
+        "[1, 2, None]",
+        "[datetime.date(2020, 1, 1)]",
+    ]
+
+
+def test_metadata_table_to_dict():
+    metadata = metadata_table_to_dict(table())
+    assert metadata["a"]["# nulls (95% CI)"] == [0, 3]
+    assert metadata["a"]["Values"] == [1, 2, None]
+    assert metadata["b"]["Values"] == [datetime.date(2020, 1, 1)]
+    assert metadata["b"]["# positive"] is None
+
+
+def test_metadata_table_to_pandas():
+    metadata = metadata_table_to_pandas(table())
+
+    assert metadata.index.name == "Name"
+    assert list(metadata.index) == ["a", "b"]
+    assert metadata.loc["a", "Values"] == [1, 2, None]
+    assert metadata.loc["b", "Values"] == [datetime.date(2020, 1, 1)]
+    assert metadata.loc["a", "# nulls (95% CI)"] == [0, 3]
+    assert metadata.loc["b", "# positive"] is None
+    assert metadata.loc["a", "Std"] is None
+
+
+def test_import_does_not_import_pandas():
+    modules = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, pymetagen; print(sorted(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert "'pandas'" not in modules
@@ -1,26 +1,63 @@
 from __future__ import annotations
 
+import contextlib
+import datetime
+import json
+import math
+import os
 from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
+import numpy as np
 import pandas as pd
 import polars as pl
 import pytest
 
+import pymetagen.metagen
+import pymetagen.statistics
 from pymetagen import MetaGen, json_metadata_to_pandas
 from pymetagen._typing import ColumnName, ColumnSimpleMetadata, DataFrameT
+from pymetagen.column_statistics import ColumnStatisticsStore
 from pymetagen.datatypes import (
+    MetaGenExcelEngine,
+    MetaGenExecutionMode,
     MetaGenMetadataColumn,
     MetaGenSupportedFileExtension,
     MetaGenSupportedLoadingMode,
 )
 from pymetagen.exceptions import (
+    ExecutionModeUnsupportedError,
     FileTypeUnsupportedError,
     LoadingModeUnsupportedError,
 )
+from pymetagen.metadata_table import (
+    metadata_table_to_dict,
+    metadata_table_to_pandas,
+)
+from pymetagen.partition_index import PartitionRange
+from pymetagen.profiling import MetaGenProfiler, ProfileRecord
+from pymetagen.statistics import (
+    partial_statistics,
+    streaming_partial_statistics,
+)
 from pymetagen.utils import InspectionMode
 
-input_paths = ["input_csv_path", "input_parquet_path", "input_xlsx_path"]
+# execution modes computing the metadata from the data itself, the footer
+# mode reads the statistics of parquet files instead
+DATA_EXECUTION_MODES = [
+    execution
+    for execution in MetaGenExecutionMode.list()
+    if execution != MetaGenExecutionMode.FOOTER
+]
+
+input_paths = [
+    "input_csv_path",
+    "input_parquet_path",
+    "input_xlsx_path",
+    "input_ndjson_path",
+    "input_json_path",
+]
 
 
 @pytest.mark.parametrize(
@@ -128,6 +165,63 @@ class TestMetadataMethods:
             "mixed": [1, 2, 3, None],
         }
 
+    @pytest.mark.parametrize(
+        ["max_number_of_unique_to_show", "expected_values"],
+        [
+            [
+                3,
+                {"all_nulls": [None], "no_nulls": None, "mixed": None},
+            ],
+            [
+                5,
+                {
+                    "all_nulls": [None],
+                    "no_nulls": None,
+                    "mixed": [1, 2, 3, None],
+                },
+            ],
+            [
+                6,
+                {
+                    "all_nulls": [None],
+                    "no_nulls": [1, 2, 3, 4, 5],
+                    "mixed": [1, 2, 3, None],
+                },
+            ],
+        ],
+    )
+    def test__number_of_unique_values_threshold(
+        self,
+        df_constructor: Callable,
+        columns_with_nulls,
+        max_number_of_unique_to_show: int,
+        expected_values: dict[str, list[int | None] | None],
+    ):
+        df = df_constructor(columns_with_nulls)
+
+        metagen = MetaGen(
+            data=df, max_number_of_unique_to_show=max_number_of_unique_to_show
+        )
+        assert metagen._number_of_unique_values() == expected_values
+
+    def test__number_of_unique_values_sorts_booleans_and_categoricals(
+        self, df_constructor: Callable
+    ):
+        df = df_constructor(
+            {
+                "bool": [True, None, False, True],
+                "category": pl.Series(
+                    ["b", "c", None, "a"], dtype=pl.Categorical
+                ),
+            }
+        )
+
+        metagen = MetaGen(data=df)
+        assert metagen._number_of_unique_values() == {
+            "bool": [False, True, None],
+            "category": ["a", "b", "c", None],
+        }
+
     @pytest.mark.parametrize(
         ["eager", "return_type"],
         [[True, pl.DataFrame], [False, pl.LazyFrame]],
@@ -173,6 +267,1195 @@ class TestMetadataMethods:
         assert isinstance(filtered, return_type)  # type: ignore
 
 
+@pytest.mark.parametrize(
+    "df_constructor",
+    [
+        pl.DataFrame,
+        pl.LazyFrame,
+    ],
+)
+class TestExecutionModes:
+    """Test the execution modes against the sequential one."""
+
+    @pytest.mark.parametrize(
+        "execution",
+        [
+            MetaGenExecutionMode.FUSED,
+            MetaGenExecutionMode.BATCHED,
+            MetaGenExecutionMode.WIDE,
+        ],
+    )
+    def test_same_metadata_as_sequential(
+        self,
+        df_constructor: Callable,
+        df_mixed_types: pl.DataFrame,
+        execution: MetaGenExecutionMode,
+    ):
+        df = df_constructor(df_mixed_types)
+
+        sequential = MetaGen(
+            data=df, execution=MetaGenExecutionMode.SEQUENTIAL
+        ).compute_metadata()
+        metadata = MetaGen(
+            data=df, execution=execution, batch_size=3, column_batch_size=1
+        ).compute_metadata()
+
+        pd.testing.assert_frame_equal(
+            metadata.drop(columns=MetaGenMetadataColumn.STD.value),
+            sequential.drop(columns=MetaGenMetadataColumn.STD.value),
+        )
+        pd.testing.assert_series_equal(
+            metadata[MetaGenMetadataColumn.STD.value].astype(float),
+            sequential[MetaGenMetadataColumn.STD.value].astype(float),
+        )
+
+    def test_scans_data_once(
+        self,
+        df_constructor: Callable,
+        df_mixed_types: pl.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        lazy_collect = pl.LazyFrame.collect
+        number_of_scans: dict[MetaGenExecutionMode, int] = {}
+
+        for execution in DATA_EXECUTION_MODES:
+            number_of_scans[execution] = 0
+
+            def counted_collect(self, *args, execution=execution, **kwargs):
+                number_of_scans[execution] += 1
+                return lazy_collect(self, *args, **kwargs)
+
+            monkeypatch.setattr(pl.LazyFrame, "collect", counted_collect)
+            MetaGen(
+                data=df_constructor(df_mixed_types), execution=execution
+            ).compute_metadata()
+
+        assert number_of_scans[MetaGenExecutionMode.FUSED] == 1
+        assert (
+            number_of_scans[MetaGenExecutionMode.SEQUENTIAL]
+            > df_mixed_types.width
+        )
+
+    @pytest.mark.parametrize(
+        ["batch_size", "expected_number_of_batches"],
+        [[1, 9], [3, 3], [100, 1]],
+    )
+    def test_batched_collects_in_batches(
+        self,
+        df_constructor: Callable,
+        df_mixed_types: pl.DataFrame,
+        batch_size: int,
+        expected_number_of_batches: int,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        collect_all = pl.collect_all
+        batches: list[int] = []
+
+        def counted_collect_all(queries, *args, **kwargs):
+            batches.append(len(queries))
+            return collect_all(queries, *args, **kwargs)
+
+        monkeypatch.setattr(pl, "collect_all", counted_collect_all)
+        MetaGen(
+            data=df_constructor(df_mixed_types),
+            execution=MetaGenExecutionMode.BATCHED,
+            batch_size=batch_size,
+        ).compute_metadata()
+
+        assert len(batches) == expected_number_of_batches
+        assert sum(batches) == df_mixed_types.width
+        assert max(batches) <= batch_size
+
+    @pytest.mark.parametrize(
+        ["column_batch_size", "expected_number_of_queries"],
+        # the integer columns are computed together
+        [[1, 9], [2, 8], [100, 7]],
+    )
+    def test_wide_batches_columns_by_dtype(
+        self,
+        df_constructor: Callable,
+        df_mixed_types: pl.DataFrame,
+        column_batch_size: int,
+        expected_number_of_queries: int,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        collect_all = pl.collect_all
+        batches: list[int] = []
+
+        def counted_collect_all(queries, *args, **kwargs):
+            batches.append(len(queries))
+            return collect_all(queries, *args, **kwargs)
+
+        monkeypatch.setattr(pl, "collect_all", counted_collect_all)
+        MetaGen(
+            data=df_constructor(df_mixed_types),
+            execution=MetaGenExecutionMode.WIDE,
+            batch_size=3,
+            column_batch_size=column_batch_size,
+        ).compute_metadata()
+
+        assert sum(batches) == expected_number_of_queries
+        assert max(batches) <= 3
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"approx_unique": True},
+            {"metrics": ["# nulls", "Min", "Values"]},
+            {"max_number_of_unique_to_show": 2},
+        ],
+    )
+    def test_wide_same_metadata_as_fused(
+        self,
+        df_constructor: Callable,
+        df_mixed_types: pl.DataFrame,
+        options: dict[str, Any],
+    ):
+        df = df_constructor(df_mixed_types)
+
+        fused = MetaGen(
+            data=df, execution=MetaGenExecutionMode.FUSED, **options
+        ).compute_polars_metadata()
+        wide = MetaGen(
+            data=df, execution=MetaGenExecutionMode.WIDE, **options
+        ).compute_polars_metadata()
+
+        assert wide.equals(fused)
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 100])
+    def test_streaming_same_metadata_as_sequential(
+        self,
+        df_constructor: Callable,
+        df_mixed_types: pl.DataFrame,
+        chunk_size: int,
+    ):
+        df = df_constructor(df_mixed_types)
+
+        sequential = MetaGen(
+            data=df, execution=MetaGenExecutionMode.SEQUENTIAL
+        ).compute_metadata()
+        metadata = MetaGen(
+            data=df,
+            execution=MetaGenExecutionMode.STREAMING,
+            chunk_size=chunk_size,
+        ).compute_metadata()
+
+        assert MetaGenMetadataColumn.NUMBER_UNIQUE.value not in metadata
+        metadata = metadata.rename(
+            columns={
+                MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX.value: (
+                    MetaGenMetadataColumn.NUMBER_UNIQUE.value
+                )
+            }
+        )
+        pd.testing.assert_frame_equal(
+            metadata.drop(columns=MetaGenMetadataColumn.STD.value),
+            sequential.drop(columns=MetaGenMetadataColumn.STD.value),
+            check_dtype=False,
+        )
+        pd.testing.assert_series_equal(
+            metadata[MetaGenMetadataColumn.STD.value].astype(float),
+            sequential[MetaGenMetadataColumn.STD.value].astype(float),
+        )
+
+    def test_streaming_nan_values(self, df_constructor: Callable):
+        df = df_constructor({"f": [1.0, float("nan"), 2.0] * 4})
+        metadata = {
+            execution: (
+                MetaGen(
+                    data=df, execution=execution, chunk_size=3
+                ).compute_metadata()
+            )
+            for execution in (
+                MetaGenExecutionMode.SEQUENTIAL,
+                MetaGenExecutionMode.STREAMING,
+            )
+        }
+
+        for table in metadata.values():
+            values = table.loc["f", MetaGenMetadataColumn.VALUES.value]
+            assert values[:2] == [1.0, 2.0]
+            assert len(values) == 3 and math.isnan(values[2])
+        assert (
+            metadata[MetaGenExecutionMode.STREAMING].loc[
+                "f", MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX.value
+            ]
+            == metadata[MetaGenExecutionMode.SEQUENTIAL].loc[
+                "f", MetaGenMetadataColumn.NUMBER_UNIQUE.value
+            ]
+            == 3
+        )
+
+    def test_streaming_reads_in_chunks(
+        self,
+        df_constructor: Callable,
+        df_mixed_types: pl.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        chunks: list[int] = []
+
+        def counted_partial_statistics(data, *args, **kwargs):
+            chunks.append(data.height)
+            return partial_statistics(data, *args, **kwargs)
+
+        monkeypatch.setattr(
+            pymetagen.statistics,
+            "partial_statistics",
+            counted_partial_statistics,
+        )
+        MetaGen(
+            data=df_constructor(df_mixed_types),
+            execution=MetaGenExecutionMode.STREAMING,
+            chunk_size=2,
+        ).compute_metadata()
+
+        assert sum(chunks) == df_mixed_types.height
+        assert max(chunks) <= 2
+        assert len(chunks) == math.ceil(df_mixed_types.height / 2)
+
+    def test_invalid_chunk_size(self, df_constructor: Callable, df_eager):
+        with pytest.raises(ValueError):
+            MetaGen(data=df_constructor(df_eager), chunk_size=0)
+
+
+class TestFooterExecutionMode:
+    """Test the metadata read from the footers of parquet files."""
+
+    footer_metrics = [
+        MetaGenMetadataColumn.TYPE.value,
+        MetaGenMetadataColumn.MIN.value,
+        MetaGenMetadataColumn.MAX.value,
+        MetaGenMetadataColumn.NUMBER_NULLS.value,
+    ]
+
+    @pytest.mark.parametrize("partition_by", [None, "bool"])
+    def test_same_min_max_nulls_as_data(
+        self,
+        df_mixed_types: pl.DataFrame,
+        tmp_dir_path: Path,
+        partition_by: str | None,
+    ):
+        path = tmp_dir_path / "data.parquet"
+        df_mixed_types.write_parquet(
+            path, row_group_size=2, partition_by=partition_by
+        )
+
+        metadata = MetaGen.from_path(
+            path, execution=MetaGenExecutionMode.FOOTER
+        ).compute_metadata()
+        streaming = MetaGen.from_path(
+            path, execution=MetaGenExecutionMode.STREAMING
+        ).compute_metadata()
+
+        # without the mean and the standard deviation, min and max are not
+        # known to be described as integers
+        assert metadata.loc["whole", MetaGenMetadataColumn.MIN.value] == "0.0"
+        assert streaming.loc["whole", MetaGenMetadataColumn.MIN.value] == "0"
+        pd.testing.assert_frame_equal(
+            metadata[self.footer_metrics].drop(index="whole"),
+            streaming[self.footer_metrics].drop(index="whole"),
+            check_dtype=False,
+        )
+        for metric in [
+            MetaGenMetadataColumn.STD.value,
+            MetaGenMetadataColumn.NUMBER_POSITIVE.value,
+            MetaGenMetadataColumn.NUMBER_UNIQUE.value,
+        ]:
+            assert metadata[metric].drop(index="all_nulls").isna().all()
+
+    def test_requires_parquet_path(
+        self, df_mixed_types: pl.DataFrame, input_csv_path: Path
+    ):
+        with pytest.raises(ExecutionModeUnsupportedError):
+            MetaGen(
+                data=df_mixed_types, execution=MetaGenExecutionMode.FOOTER
+            ).compute_metadata()
+        with pytest.raises(ExecutionModeUnsupportedError):
+            MetaGen.from_path(
+                input_csv_path, execution=MetaGenExecutionMode.FOOTER
+            ).compute_metadata()
+
+    @pytest.mark.parametrize("extract", [False, True])
+    def test_filtered_data_is_not_read_from_footers(
+        self, tmp_dir_path: Path, extract: bool
+    ):
+        path = tmp_dir_path / "data.parquet"
+        pl.DataFrame({"a": range(100)}).write_parquet(path)
+        metagen = MetaGen.from_path(
+            path, execution=MetaGenExecutionMode.FOOTER
+        )
+        if extract:
+            metagen.extract_data(InspectionMode.head, inplace=True)
+        else:
+            metagen.filter_data("data", "SELECT * FROM data WHERE a < 10")
+
+        # the footers hold the statistics of the unfiltered file
+        with pytest.raises(ExecutionModeUnsupportedError):
+            metagen.compute_metadata()
+
+
+@pytest.mark.parametrize("execution", DATA_EXECUTION_MODES)
+class TestQuantiles:
+    """Test the quantiles estimated with KLL sketches."""
+
+    def test_quantile_columns(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        metadata = MetaGen(
+            data=df_mixed_types, execution=execution, quantiles=True
+        ).compute_metadata()
+
+        assert list(metadata.columns) == [
+            column.value
+            for column in MetaGenMetadataColumn.pymetagen_columns(
+                approx_unique=execution == MetaGenExecutionMode.STREAMING,
+                quantiles=True,
+            )
+        ]
+        medians = metadata[MetaGenMetadataColumn.MEDIAN.value]
+        assert medians["integer"] == df_mixed_types["integer"].quantile(
+            0.5, interpolation="lower"
+        )
+        assert medians["string"] is None
+        assert medians["all_nulls"] is None
+
+    def test_no_quantile_columns_by_default(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        metadata = MetaGen(
+            data=df_mixed_types, execution=execution
+        ).compute_metadata()
+        for column in MetaGenMetadataColumn.quantile_columns():
+            assert column.value not in metadata
+
+    @pytest.mark.parametrize("quantile_error", [0.05, 0.01])
+    def test_quantiles_within_error(
+        self, execution: MetaGenExecutionMode, quantile_error: float
+    ):
+        values = np.random.default_rng(0).exponential(size=50_000)
+        df = pl.DataFrame({"value": values}).lazy()
+        metadata = MetaGen(
+            data=df,
+            execution=execution,
+            quantiles=True,
+            quantile_error=quantile_error,
+            chunk_size=10_000,
+        ).compute_metadata()
+
+        sorted_values = np.sort(values)
+        for (
+            column,
+            quantile,
+        ) in MetaGenMetadataColumn.quantile_columns().items():
+            estimate = metadata[column.value]["value"]
+            rank = np.searchsorted(sorted_values, estimate) / len(values)
+            assert rank == pytest.approx(quantile, abs=quantile_error)
+
+
+@pytest.mark.parametrize("execution", DATA_EXECUTION_MODES)
+class TestSampledMetadata:
+    """Test the metadata computed on a random sample of the data."""
+
+    @pytest.fixture
+    def df_large(self) -> pl.LazyFrame:
+        rng = np.random.default_rng(0)
+        return (
+            pl.DataFrame(
+                {
+                    "value": rng.normal(size=20_000),
+                    "flag": rng.random(20_000) < 0.3,
+                }
+            )
+            .with_columns(
+                value=pl.when(pl.col("flag")).then(None).otherwise("value")
+            )
+            .lazy()
+        )
+
+    def test_sampled_columns(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        metadata = MetaGen(
+            data=df_mixed_types, execution=execution, random_seed=0
+        ).compute_metadata(sample=3)
+
+        assert list(metadata.columns) == [
+            column.value
+            for column in MetaGenMetadataColumn.pymetagen_columns(
+                approx_unique=execution == MetaGenExecutionMode.STREAMING,
+                sampled=True,
+            )
+        ]
+
+    def test_whole_sample_is_exact(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        metagen = MetaGen(data=df_mixed_types, execution=execution)
+        metadata = metagen.compute_metadata()
+        sampled = metagen.compute_metadata(sample=1.0)
+
+        for (
+            column,
+            interval_column,
+        ) in MetaGenMetadataColumn.confidence_interval_columns().items():
+            for name, count in metadata[column.value].items():
+                if count is None or pd.isna(count):
+                    assert sampled[interval_column.value][name] is None
+                else:
+                    assert sampled[column.value][name] == count
+                    assert sampled[interval_column.value][name] == [
+                        count,
+                        count,
+                    ]
+
+    def test_scaled_counts(
+        self, execution: MetaGenExecutionMode, df_large: pl.LazyFrame
+    ):
+        number_of_nulls = df_large.select(pl.col("value").null_count())
+        number_of_nulls = number_of_nulls.collect().item()
+        metadata = MetaGen(
+            data=df_large, execution=execution, random_seed=1
+        ).compute_metadata(sample=2_000)
+
+        nulls = metadata[MetaGenMetadataColumn.NUMBER_NULLS.value]["value"]
+        lower, upper = metadata[MetaGenMetadataColumn.NUMBER_NULLS_CI.value][
+            "value"
+        ]
+        assert lower <= nulls <= upper
+        assert lower <= number_of_nulls <= upper
+        assert nulls == pytest.approx(number_of_nulls, rel=0.1)
+
+    def test_sample_from_instance(
+        self, execution: MetaGenExecutionMode, df_large: pl.LazyFrame
+    ):
+        metagen = MetaGen(
+            data=df_large, execution=execution, sample=0.1, random_seed=2
+        )
+        assert metagen.compute_metadata().equals(
+            metagen.compute_metadata(sample=2_000)
+        )
+
+
+def test_sampled_footer_execution_mode(df_mixed_types: pl.DataFrame):
+    metagen = MetaGen(
+        data=df_mixed_types, execution=MetaGenExecutionMode.FOOTER
+    )
+    with pytest.raises(ExecutionModeUnsupportedError):
+        metagen.compute_metadata(sample=0.5)
+
+
+@pytest.mark.parametrize("execution", DATA_EXECUTION_MODES)
+class TestColumnAndMetricSelection:
+    """Test the columns and metrics selected with `columns` and `metrics`."""
+
+    def test_columns(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        metagen = MetaGen(
+            data=df_mixed_types.lazy(),
+            execution=execution,
+            columns=["^.*_.*$", "float", "str*"],
+        )
+        expected = MetaGen(
+            data=df_mixed_types.select(
+                "float", "string", "all_nulls", "many_values"
+            ),
+            execution=execution,
+        ).compute_metadata()
+
+        assert metagen.columns == [
+            "float",
+            "string",
+            "all_nulls",
+            "many_values",
+        ]
+        assert "4/9 COLUMNS" in metagen.data.explain()
+        assert metagen.compute_metadata().equals(expected)
+
+    def test_columns_projection_pushdown(
+        self, execution: MetaGenExecutionMode, input_csv_path: Path
+    ):
+        metagen = MetaGen.from_path(
+            input_csv_path, execution=execution, columns=["a"]
+        )
+        plan = metagen.data.explain()
+
+        assert plan.startswith("Csv SCAN")
+        assert "PROJECT 1/3 COLUMNS" in plan
+        assert list(metagen.compute_metadata().index) == ["a"]
+
+    def test_metrics(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        metrics = [
+            MetaGenMetadataColumn.MAX,
+            MetaGenMetadataColumn.NUMBER_POSITIVE,
+            MetaGenMetadataColumn.VALUES,
+        ]
+        metadata = MetaGen(
+            data=df_mixed_types, execution=execution, metrics=metrics
+        ).compute_metadata()
+        expected = MetaGen(
+            data=df_mixed_types, execution=execution
+        ).compute_metadata()
+
+        assert list(metadata.columns) == [
+            "Long Name",
+            "Type",
+            "Description",
+            *[metric.value for metric in metrics],
+        ]
+        assert metadata.equals(expected[metadata.columns])
+
+    def test_metrics_by_name(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        metadata = MetaGen(
+            data=df_mixed_types,
+            execution=execution,
+            metrics=["# unique (approx)", "50%", "# nulls"],
+        ).compute_metadata(sample=1.0)
+
+        unique_column = (
+            MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX
+            if execution == MetaGenExecutionMode.STREAMING
+            else MetaGenMetadataColumn.NUMBER_UNIQUE
+        )
+        assert list(metadata.columns) == [
+            "Long Name",
+            "Type",
+            "Description",
+            "50%",
+            "# nulls",
+            "# nulls (95% CI)",
+            unique_column.value,
+        ]
+        assert metadata[unique_column.value]["many_values"] == 5
+
+    @pytest.mark.parametrize(
+        "metrics", [["Long Name"], ["# unknown"], ["# nulls (95% CI)"]]
+    )
+    def test_invalid_metrics(
+        self,
+        execution: MetaGenExecutionMode,
+        df_mixed_types: pl.DataFrame,
+        metrics: list[str],
+    ):
+        with pytest.raises(ValueError, match="Unknown metric"):
+            MetaGen(data=df_mixed_types, execution=execution, metrics=metrics)
+
+
+class TestResultCache:
+    """Test the on-disk cache of metadata tables."""
+
+    @pytest.fixture
+    def computations(self, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+        computations: list[int] = []
+        compute = MetaGen._compute_metadata_values
+
+        def counted_compute(self):
+            computations.append(1)
+            return compute(self)
+
+        monkeypatch.setattr(
+            MetaGen, "_compute_metadata_values", counted_compute
+        )
+        return computations
+
+    @pytest.fixture
+    def data_path(self, tmp_dir_path: Path) -> Path:
+        path = tmp_dir_path / "data.csv"
+        pl.DataFrame({"a": [1, 2, None], "b": ["x", "y", "z"]}).write_csv(path)
+        return path
+
+    def test_repeat_run_is_cached(
+        self, data_path: Path, tmp_dir_path: Path, computations: list[int]
+    ):
+        cache_dir = tmp_dir_path / "cache"
+        metadata = MetaGen.from_path(
+            data_path, result_cache_dir=cache_dir
+        ).compute_metadata()
+        cached = MetaGen.from_path(
+            data_path, result_cache_dir=cache_dir
+        ).compute_metadata()
+
+        assert len(computations) == 1
+        assert cached.equals(metadata)
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"metrics": ["Min"]},
+            {"columns": ["a"]},
+            {"max_number_of_unique_to_show": 2},
+            {"execution": MetaGenExecutionMode.FUSED},
+            {"loading_mode": MetaGenSupportedLoadingMode.EAGER},
+            {"infer_schema_length": 1},
+            {"excel_engine": MetaGenExcelEngine.OPENPYXL},
+        ],
+    )
+    def test_other_options_are_computed(
+        self,
+        data_path: Path,
+        tmp_dir_path: Path,
+        computations: list[int],
+        options: dict[str, Any],
+    ):
+        cache_dir = tmp_dir_path / "cache"
+        MetaGen.from_path(data_path, result_cache_dir=cache_dir)._metadata
+        MetaGen.from_path(
+            data_path, result_cache_dir=cache_dir, **options
+        )._metadata
+        assert len(computations) == 2
+
+    def test_changed_file_is_computed(
+        self, data_path: Path, tmp_dir_path: Path, computations: list[int]
+    ):
+        cache_dir = tmp_dir_path / "cache"
+        MetaGen.from_path(data_path, result_cache_dir=cache_dir)._metadata
+        pl.DataFrame({"a": [1, 5], "b": ["x", "y"]}).write_csv(data_path)
+        metadata = MetaGen.from_path(
+            data_path, result_cache_dir=cache_dir
+        ).compute_metadata()
+
+        assert len(computations) == 2
+        assert float(metadata["Max"]["a"]) == 5
+
+    def test_partition_rewritten_in_place_is_computed(
+        self, tmp_dir_path: Path, computations: list[int]
+    ):
+        data_path = tmp_dir_path / "data"
+        (data_path / "year=2024").mkdir(parents=True)
+        file = data_path / "year=2024" / "part-0.parquet"
+        pl.DataFrame({"a": [1, 2, 3]}).write_parquet(file)
+        options: dict[str, Any] = {
+            "result_cache_dir": tmp_dir_path / "cache",
+            "partition_index_dir": tmp_dir_path / "index",
+        }
+        MetaGen.from_path(data_path, **options)._metadata
+
+        # the modification time of the directory is unchanged
+        directory_stat = file.parent.stat()
+        pl.DataFrame({"a": [100, 200, 300, 400]}).write_parquet(file)
+        os.utime(
+            file.parent,
+            ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns),
+        )
+        metadata = MetaGen.from_path(data_path, **options).compute_metadata()
+
+        assert len(computations) == 2
+        assert float(metadata["Max"]["a"]) == 400
+
+    def test_sample_without_seed_is_not_cached(
+        self, data_path: Path, tmp_dir_path: Path, computations: list[int]
+    ):
+        metagen = MetaGen.from_path(
+            data_path, result_cache_dir=tmp_dir_path / "cache"
+        )
+        metagen.compute_metadata(sample=2)
+        metagen.compute_metadata(sample=2)
+        assert len(computations) == 2
+
+        metagen.random_seed = 0
+        metagen.compute_metadata(sample=2)
+        metagen.compute_metadata(sample=2)
+        assert len(computations) == 3
+
+    def test_filtered_data_is_not_cached(
+        self, data_path: Path, tmp_dir_path: Path, computations: list[int]
+    ):
+        cache_dir = tmp_dir_path / "cache"
+        MetaGen.from_path(data_path, result_cache_dir=cache_dir)._metadata
+        metagen = MetaGen.from_path(data_path, result_cache_dir=cache_dir)
+        metagen.filter_data("data", "SELECT * FROM data WHERE a > 1")
+        metadata = metagen.compute_metadata()
+
+        assert len(computations) == 2
+        assert float(metadata["Min"]["a"]) == 2
+
+    def test_requires_path(self, df_eager: pl.DataFrame, tmp_dir_path: Path):
+        with pytest.raises(ValueError, match="result_cache_dir"):
+            MetaGen(data=df_eager, result_cache_dir=tmp_dir_path)
+
+
+@pytest.mark.parametrize("execution", DATA_EXECUTION_MODES)
+class TestIterColumnMetadata:
+    """Test the metadata yielded column by column."""
+
+    def test_same_metadata_as_table(
+        self, df_mixed_types: pl.DataFrame, execution: MetaGenExecutionMode
+    ):
+        options = {"execution": execution, "batch_size": 3}
+        records = list(
+            MetaGen(
+                data=df_mixed_types, column_batch_size=2, **options
+            ).iter_column_metadata()
+        )
+        table = MetaGen(
+            data=df_mixed_types, **options
+        ).compute_polars_metadata()
+
+        assert [record.name for record in records] == df_mixed_types.columns
+        assert {
+            record.name: record.metadata for record in records
+        } == metadata_table_to_dict(table)
+
+    def test_yields_first_batch_first(
+        self, df_mixed_types: pl.DataFrame, execution: MetaGenExecutionMode
+    ):
+        profiler = MetaGenProfiler(explain=False)
+        records = MetaGen(
+            data=df_mixed_types,
+            execution=execution,
+            batch_size=1,
+            column_batch_size=1,
+            profiler=profiler,
+        ).iter_column_metadata()
+
+        record = next(records)
+        assert record.name == "integer"
+        assert record.type == "integer"
+        profiled_columns = {
+            column for record in profiler.records for column in record.columns
+        }
+        if execution == MetaGenExecutionMode.STREAMING:
+            # every column is read at once
+            assert profiled_columns == set(df_mixed_types.columns)
+        else:
+            assert profiled_columns == {"integer"}
+
+    def test_computed_metadata_is_reused(
+        self,
+        df_mixed_types: pl.DataFrame,
+        execution: MetaGenExecutionMode,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        metagen = MetaGen(
+            data=df_mixed_types, execution=execution, compute_metadata=True
+        )
+
+        def compute_polars_metadata(self, sample=None):
+            raise AssertionError("metadata computed again")
+
+        monkeypatch.setattr(
+            MetaGen, "compute_polars_metadata", compute_polars_metadata
+        )
+        records = list(metagen.iter_column_metadata())
+        assert len(records) == df_mixed_types.width
+
+
+class TestColumnStatistics:
+    """Test the base facts shared by the metrics of the sequential mode."""
+
+    @pytest.mark.parametrize("approx_unique", [False, True])
+    def test_null_counts_computed_once(
+        self,
+        df_mixed_types: pl.DataFrame,
+        approx_unique: bool,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        compute_counts = ColumnStatisticsStore._compute_counts
+        computations: list[int] = []
+
+        def counted_compute_counts(self):
+            computations.append(1)
+            return compute_counts(self)
+
+        monkeypatch.setattr(
+            ColumnStatisticsStore, "_compute_counts", counted_compute_counts
+        )
+        metadata = MetaGen(
+            data=df_mixed_types, approx_unique=approx_unique
+        ).compute_metadata()
+
+        assert computations == [1]
+        assert metadata["# empty/zero"]["integer"] == 2
+
+    def test_filter_data_resets_statistics(self, df_mixed_types: pl.DataFrame):
+        metagen = MetaGen(data=df_mixed_types)
+        metagen.compute_metadata()
+
+        metagen.filter_data("data", "SELECT * FROM data WHERE integer > 0")
+        metadata = metagen.compute_metadata()
+
+        assert metagen.column_statistics.row_count() == 2
+        assert metadata["# empty/zero"]["integer"] == 0
+        assert metadata["# unique"]["string"] == 1
+
+    def test_extract_data_inplace_resets_statistics(
+        self, df_mixed_types: pl.DataFrame
+    ):
+        metagen = MetaGen(data=df_mixed_types)
+        assert metagen.column_statistics.row_count() == 5
+
+        metagen.extract_data(InspectionMode.head, tbl_rows=2)
+        assert metagen.column_statistics.row_count() == 5
+
+        metagen.extract_data(InspectionMode.head, tbl_rows=2, inplace=True)
+        assert metagen.column_statistics.row_count() == 2
+
+
+@pytest.mark.parametrize("execution", DATA_EXECUTION_MODES)
+class TestPolarsMetadata:
+    """Test the metadata table built with Polars."""
+
+    def test_compute_polars_metadata(
+        self, df_mixed_types: pl.DataFrame, execution: MetaGenExecutionMode
+    ):
+        metagen = MetaGen(data=df_mixed_types, execution=execution)
+        metadata = metagen.compute_polars_metadata()
+
+        assert metadata["Name"].to_list() == df_mixed_types.columns
+        dtypes = MetaGenMetadataColumn.polars_dtypes()
+        for column, dtype in metadata.schema.items():
+            assert dtype == dtypes[MetaGenMetadataColumn(column)]
+        assert json.loads(metadata.row(0, named=True)["Values"]) == [
+            -2,
+            0,
+            1,
+            5,
+            None,
+        ]
+        pd.testing.assert_frame_equal(
+            metagen.compute_metadata(), metadata_table_to_pandas(metadata)
+        )
+
+    def test_temporal_values(
+        self, execution: MetaGenExecutionMode, tmp_dir_path: Path
+    ):
+        df = pl.DataFrame(
+            {
+                "date": [datetime.date(2024, 1, 1), None],
+                "datetime": [datetime.datetime(2024, 1, 1, 12, 0, 0, 5), None],
+            }
+        )
+        metagen = MetaGen(data=df, execution=execution)
+        metadata = metagen.compute_metadata()
+
+        assert metadata.loc["date", "Values"] == [
+            datetime.date(2024, 1, 1),
+            None,
+        ]
+        assert metadata.loc["datetime", "Values"] == [
+            datetime.datetime(2024, 1, 1, 12, 0, 0, 5),
+            None,
+        ]
+        assert metadata.loc["date", "Min"] == "2024-01-01"
+        assert metadata.loc["datetime", "Max"] == "2024-01-01 12:00:00.000005"
+
+        outpath = tmp_dir_path / "metadata.csv"
+        metagen.write_metadata(outpath)
+        assert pl.read_csv(outpath)["Values"].to_list() == [
+            "[datetime.date(2024, 1, 1), None]",
+            "[datetime.datetime(2024, 1, 1, 12, 0, 0, 5), None]",
+        ]
+
+    def test_write_parquet_metadata(
+        self,
+        df_mixed_types: pl.DataFrame,
+        execution: MetaGenExecutionMode,
+        tmp_dir_path: Path,
+    ):
+        # unique values of different types are written as JSON
+        metagen = MetaGen(data=df_mixed_types, execution=execution)
+        outpath = tmp_dir_path / "metadata.parquet"
+        metagen.write_metadata(outpath)
+
+        assert pl.read_parquet(outpath).equals(metagen._polars_metadata)
+
+
+@pytest.mark.parametrize("execution", DATA_EXECUTION_MODES)
+class TestProfiler:
+    """Test the profiling of the metadata computation."""
+
+    def test_records(
+        self, df_mixed_types: pl.DataFrame, execution: MetaGenExecutionMode
+    ):
+        recorded: list[ProfileRecord] = []
+        profiler = MetaGenProfiler(callback=recorded.append)
+        metagen = MetaGen(
+            data=df_mixed_types.lazy(),
+            execution=execution,
+            batch_size=2,
+            profiler=profiler,
+        )
+        metagen.compute_metadata()
+
+        assert recorded == profiler.records
+        assert profiler.number_of_rows == len(df_mixed_types)
+        profiled_columns = {
+            column for record in profiler.records for column in record.columns
+        }
+        assert profiled_columns == set(df_mixed_types.columns)
+        for record in profiler.records:
+            assert record.wall_time >= 0
+            # steps without a query, e.g. the positive values of a string
+            # column, scan no rows
+            assert record.rows_scanned == (
+                len(df_mixed_types) if record.plan else 0
+            )
+        if execution == MetaGenExecutionMode.SEQUENTIAL:
+            assert "describe" in profiler.wall_time_by_metric()
+            assert MetaGenMetadataColumn.NUMBER_UNIQUE.value in (
+                profiler.wall_time_by_metric()
+            )
+            positive_records = {
+                record.columns[0]: record
+                for record in profiler.records
+                if record.metric == MetaGenMetadataColumn.NUMBER_POSITIVE
+            }
+            assert positive_records["integer"].plan
+            assert positive_records["string"].rows_scanned == 0
+        else:
+            assert all(record.plan for record in profiler.records)
+
+    def test_selected_metrics(
+        self, df_mixed_types: pl.DataFrame, execution: MetaGenExecutionMode
+    ):
+        profiler = MetaGenProfiler(explain=False)
+        MetaGen(
+            data=df_mixed_types,
+            execution=execution,
+            metrics=["# nulls", "# unique"],
+            profiler=profiler,
+        ).compute_metadata()
+
+        metrics = set(profiler.wall_time_by_metric())
+        if execution == MetaGenExecutionMode.SEQUENTIAL:
+            assert MetaGenMetadataColumn.NUMBER_POSITIVE.value not in metrics
+        else:
+            assert metrics == {"# nulls, # unique"}
+        assert all(record.plan is None for record in profiler.records)
+
+
+class TestStatsCache:
+    """Test the incremental streaming metadata with a statistics cache."""
+
+    def write_partition(self, path: Path, day: int) -> None:
+        partition_path = path / f"day={day}"
+        partition_path.mkdir(parents=True)
+        pl.DataFrame(
+            {"value": [day, -day, None], "label": ["a", str(day), None]}
+        ).write_parquet(partition_path / "part-0.parquet")
+
+    def test_only_new_files_are_read(
+        self, tmp_dir_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        path = tmp_dir_path / "dataset"
+        cache_path = tmp_dir_path / "stats-cache.parquet"
+        for day in range(1, 4):
+            self.write_partition(path, day)
+
+        scanned_rows: list[int] = []
+
+        def counted_streaming_partial_statistics(data, *args, **kwargs):
+            scanned_rows.append(data.lazy().select(pl.len()).collect().item())
+            return streaming_partial_statistics(data, *args, **kwargs)
+
+        monkeypatch.setattr(
+            pymetagen.metagen,
+            "streaming_partial_statistics",
+            counted_streaming_partial_statistics,
+        )
+
+        def compute_metadata(**kwargs) -> pd.DataFrame:
+            return MetaGen.from_path(
+                path, execution=MetaGenExecutionMode.STREAMING, **kwargs
+            ).compute_metadata()
+
+        compute_metadata(stats_cache_path=cache_path)
+        assert scanned_rows == [3, 3, 3]
+
+        scanned_rows.clear()
+        self.write_partition(path, 4)
+        metadata = compute_metadata(stats_cache_path=cache_path)
+        assert scanned_rows == [3]
+
+        scanned_rows.clear()
+        pd.testing.assert_frame_equal(metadata, compute_metadata())
+        assert metadata.loc["day", MetaGenMetadataColumn.MAX.value] == "4.0"
+
+    def test_selected_partitions_keep_other_entries(self, tmp_dir_path: Path):
+        path = tmp_dir_path / "dataset"
+        cache_path = tmp_dir_path / "stats-cache.parquet"
+        for day in range(1, 4):
+            self.write_partition(path, day)
+
+        for partitions in (None, {"day": 2}):
+            MetaGen.from_path(
+                path,
+                execution=MetaGenExecutionMode.STREAMING,
+                stats_cache_path=cache_path,
+                partitions=partitions,
+            ).compute_metadata()
+        assert pl.read_parquet(cache_path).height == 3
+
+    @pytest.mark.parametrize("extract", [False, True])
+    def test_filtered_data_is_not_cached(
+        self, tmp_dir_path: Path, extract: bool
+    ):
+        path = tmp_dir_path / "dataset"
+        cache_path = tmp_dir_path / "stats-cache.parquet"
+        for day in range(1, 4):
+            self.write_partition(path, day)
+        MetaGen.from_path(
+            path,
+            execution=MetaGenExecutionMode.STREAMING,
+            stats_cache_path=cache_path,
+        ).compute_metadata()
+
+        metagen = MetaGen.from_path(
+            path,
+            execution=MetaGenExecutionMode.STREAMING,
+            stats_cache_path=cache_path,
+        )
+        if extract:
+            metagen.extract_data(InspectionMode.head, tbl_rows=1, inplace=True)
+        else:
+            metagen.filter_data("data", "SELECT * FROM data WHERE day = 1")
+        metadata = metagen.compute_metadata()
+
+        assert metadata.loc["day", MetaGenMetadataColumn.MAX.value] == "1"
+        assert metadata.loc["value", MetaGenMetadataColumn.MIN.value] == (
+            "1" if extract else "-1.0"
+        )
+
+    def test_requires_streaming_and_path(
+        self, df_mixed_types: pl.DataFrame, tmp_dir_path: Path
+    ):
+        with pytest.raises(ValueError):
+            MetaGen(
+                data=df_mixed_types,
+                execution=MetaGenExecutionMode.STREAMING,
+                stats_cache_path=tmp_dir_path / "stats-cache.parquet",
+            )
+        with pytest.raises(ValueError):
+            MetaGen(
+                data=df_mixed_types,
+                path=tmp_dir_path / "data.parquet",
+                stats_cache_path=tmp_dir_path / "stats-cache.parquet",
+            )
+
+
+@pytest.mark.parametrize(
+    "execution",
+    DATA_EXECUTION_MODES,
+)
+class TestApproxUnique:
+    """Test the approximate number of unique values."""
+
+    def test_column_is_marked_approximate(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        metadata = MetaGen(
+            data=df_mixed_types, execution=execution, approx_unique=True
+        ).compute_metadata()
+
+        assert list(
+            metadata.columns
+        ) == MetaGenMetadataColumn.pymetagen_columns(approx_unique=True)
+        assert MetaGenMetadataColumn.NUMBER_UNIQUE.value not in metadata
+
+    def test_small_cardinalities_match_exact_counts(
+        self, execution: MetaGenExecutionMode, df_mixed_types: pl.DataFrame
+    ):
+        exact = MetaGen(
+            data=df_mixed_types, execution=MetaGenExecutionMode.SEQUENTIAL
+        ).compute_metadata()
+        approximate = MetaGen(
+            data=df_mixed_types.lazy(),
+            execution=execution,
+            approx_unique=True,
+        ).compute_metadata()
+
+        assert (
+            approximate[MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX.value]
+            .astype(int)
+            .to_dict()
+            == exact[MetaGenMetadataColumn.NUMBER_UNIQUE.value]
+            .astype(int)
+            .to_dict()
+        )
+
+    @pytest.mark.parametrize("approx_unique_error", [0.05, 0.01])
+    def test_high_cardinality_within_error(
+        self, execution: MetaGenExecutionMode, approx_unique_error: float
+    ):
+        number_of_rows = 100_000
+        df = pl.DataFrame(
+            {
+                "id": range(number_of_rows),
+                "id_with_nulls": [None, *range(1, number_of_rows)],
+            }
+        )
+        metadata = MetaGen(
+            data=df,
+            execution=execution,
+            approx_unique=True,
+            approx_unique_error=approx_unique_error,
+        ).compute_metadata()
+
+        unique_counts = metadata[
+            MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX.value
+        ]
+        for column in df.columns:
+            assert unique_counts[column] == pytest.approx(
+                number_of_rows, rel=3 * approx_unique_error
+            )
+
+
+@pytest.mark.parametrize(
+    "execution",
+    DATA_EXECUTION_MODES,
+)
+@pytest.mark.parametrize(
+    "max_number_of_unique_to_show",
+    [2, 4, 100],
+)
+def test_max_number_of_unique_to_show(
+    execution: MetaGenExecutionMode,
+    max_number_of_unique_to_show: int,
+    df_mixed_types: pl.DataFrame,
+):
+    metagen = MetaGen(
+        data=df_mixed_types,
+        execution=execution,
+        max_number_of_unique_to_show=max_number_of_unique_to_show,
+    )
+    metadata = metagen.compute_metadata()
+    number_of_unique_column = (
+        MetaGenMetadataColumn.NUMBER_UNIQUE_APPROX
+        if metagen.approx_unique
+        else MetaGenMetadataColumn.NUMBER_UNIQUE
+    )
+
+    for column, values in metadata[MetaGenMetadataColumn.VALUES.value].items():
+        number_of_unique = metadata[number_of_unique_column.value][column]
+        if number_of_unique < max_number_of_unique_to_show:
+            assert len(values) == number_of_unique
+        else:
+            assert values is None
+
+
+def test_invalid_max_number_of_unique_to_show(df_eager: pl.DataFrame):
+    with pytest.raises(ValueError):
+        MetaGen(data=df_eager, max_number_of_unique_to_show=0)
+
+
+def test_invalid_batch_size(df_eager: pl.DataFrame):
+    with pytest.raises(ValueError):
+        MetaGen(data=df_eager, batch_size=0)
+
+
+def test_compute_metadata_unsupported_execution_mode(df_eager: pl.DataFrame):
+    metagen = MetaGen(
+        data=df_eager,
+        execution="unsupported_mode",  # type: ignore
+    )
+    with pytest.raises(ExecutionModeUnsupportedError):
+        metagen.compute_metadata()
+
+
 @pytest.mark.parametrize(
     "column_name, expected_value",
     [
@@ -218,6 +1501,63 @@ class TestMetaGenFromPath:
             loading_mode=mode,
         )
 
+    @pytest.mark.parametrize("path", ["input_ndjson_path", "input_json_path"])
+    def test_from_path_json(
+        self,
+        path: str,
+        mode: MetaGenSupportedLoadingMode,
+        input_csv_path: Path,
+        request: pytest.FixtureRequest,
+    ):
+        file_path: Path = request.getfixturevalue(path)
+        metagen = MetaGen.from_path(path=file_path, loading_mode=mode)
+        csv_metagen = MetaGen.from_path(path=input_csv_path, loading_mode=mode)
+
+        is_lazy = (
+            mode == MetaGenSupportedLoadingMode.LAZY
+            and path == "input_ndjson_path"
+        )
+        assert isinstance(metagen.data, pl.LazyFrame) == is_lazy
+        assert metagen.compute_polars_metadata().equals(
+            csv_metagen.compute_polars_metadata()
+        )
+
+    def test_from_path_infer_schema_length(
+        self,
+        tmp_dir_path: Path,
+        mode: MetaGenSupportedLoadingMode,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        path = tmp_dir_path / "events.jsonl"
+        path.write_text('{"a": null}\n{"a": 1}\n{"a": 2}\n')
+
+        metagen = MetaGen.from_path(
+            path=path, loading_mode=mode, infer_schema_length=None
+        )
+        assert metagen.data_schema.schema["a"] == pl.Int64
+        # the first row alone infers a null column
+        if mode == MetaGenSupportedLoadingMode.LAZY:
+            metagen = MetaGen.from_path(
+                path=path, loading_mode=mode, infer_schema_length=1
+            )
+            assert metagen.data_schema.schema["a"] == pl.Null
+        else:
+            # whether the eager reader then fails depends on the polars
+            # version, so only check the option reaches it
+            read_ndjson = pl.read_ndjson
+            lengths: list[int | None] = []
+
+            def recorded_read_ndjson(*args, **kwargs):
+                lengths.append(kwargs.get("infer_schema_length"))
+                return read_ndjson(*args, **kwargs)
+
+            monkeypatch.setattr(pl, "read_ndjson", recorded_read_ndjson)
+            with contextlib.suppress(pl.exceptions.ComputeError):
+                MetaGen.from_path(
+                    path=path, loading_mode=mode, infer_schema_length=1
+                )
+            assert lengths == [1]
+
     def test_unsupported_path(
         self,
         tmp_dir_path: Path,
@@ -290,6 +1630,30 @@ def test_file_extension_none_for_parquet_directories(test_data_dir: Path):
     )
 
 
+@pytest.mark.parametrize(
+    "execution",
+    [
+        MetaGenExecutionMode.SEQUENTIAL,
+        MetaGenExecutionMode.FOOTER,
+        MetaGenExecutionMode.STREAMING,
+    ],
+)
+def test_from_path_partitions(
+    test_data_dir: Path, tmp_dir_path: Path, execution: MetaGenExecutionMode
+):
+    metagen = MetaGen.from_path(
+        test_data_dir / "input_ab_partition",
+        execution=execution,
+        result_cache_dir=tmp_dir_path,
+        partitions={"a": PartitionRange(4), "b": [5, 2]},
+    )
+    metadata = metagen.compute_metadata()
+
+    assert float(metadata.loc["c", MetaGenMetadataColumn.MIN.value]) == 6
+    assert float(metadata.loc["c", MetaGenMetadataColumn.MAX.value]) == 6
+    assert metagen.column_statistics.row_count() == 1
+
+
 def test_file_extension_none_for_directories_with_no_parquet_files(
     test_data_dir: Path,
 ):
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import polars as pl
+import pyarrow.parquet as pq
+import pytest
+
+from pymetagen.parquet_statistics import (
+    footer_partial_statistics,
+    hive_partitions,
+    parquet_files,
+)
+from pymetagen.utils import get_data_schema
+
+
+@pytest.fixture
+def df() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "integer": [3, -1, 0, None, 7, 2],
+            "string": ["a", "bb", None, "ccc", "a", ""],
+            "all_nulls": pl.Series([None] * 6, dtype=pl.Int64),
+            "nested": [[1], [2, 3], None, [], [4], [5]],
+        }
+    )
+
+
+def expected_statistics(df: pl.DataFrame, column: str):
+    series = df[column]
+    minimum = None if series.dtype.is_nested() else series.min()
+    maximum = None if series.dtype.is_nested() else series.max()
+    return df.height, series.null_count(), minimum, maximum
+
+
+def statistics(partial):
+    return partial.count, partial.null_count, partial.minimum, partial.maximum
+
+
+@pytest.mark.parametrize("write_statistics", [True, False])
+def test_footer_partial_statistics(
+    df: pl.DataFrame, tmp_dir_path: Path, write_statistics: bool
+):
+    path = tmp_dir_path / "data.parquet"
+    pq.write_table(
+        df.to_arrow(),
+        path,
+        row_group_size=2,
+        write_statistics=write_statistics,
+    )
+
+    partials = footer_partial_statistics(path, get_data_schema(df))
+
+    for column in df.columns:
+        assert statistics(partials[column]) == expected_statistics(df, column)
+        assert partials[column].std is None
+        assert partials[column].number_of_unique is None
+
+
+def test_footer_statistics_only_read_missing_columns(
+    df: pl.DataFrame, tmp_dir_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    path = tmp_dir_path / "data.parquet"
+    pq.write_table(
+        df.to_arrow(),
+        path,
+        row_group_size=2,
+        write_statistics=["integer", "all_nulls"],
+    )
+    read_row_group = pq.ParquetFile.read_row_group
+    read_columns: list[str] = []
+
+    def counted_read_row_group(self, index, columns=None, **kwargs):
+        read_columns.extend(columns)
+        return read_row_group(self, index, columns=columns, **kwargs)
+
+    monkeypatch.setattr(
+        pq.ParquetFile, "read_row_group", counted_read_row_group
+    )
+    footer_partial_statistics(path, get_data_schema(df))
+
+    assert set(read_columns) == {"string", "nested"}
+    assert len(read_columns) == 2 * 3
+
+
+def test_footer_partial_statistics_hive_partitions(tmp_dir_path: Path):
+    df = pl.DataFrame(
+        {
+            "value": [1, 2, 3, 4, 5],
+            "year": [2023, 2023, 2024, 2024, None],
+        }
+    )
+    path = tmp_dir_path / "partitioned"
+    df.write_parquet(path, partition_by="year")
+
+    lazy_df = pl.scan_parquet(
+        str(path / "*" / "*.parquet"), hive_partitioning=True
+    )
+    partials = footer_partial_statistics(path, get_data_schema(lazy_df))
+
+    collected = lazy_df.collect()
+    for column in collected.columns:
+        assert statistics(partials[column]) == expected_statistics(
+            collected, column
+        )
+
+
+def test_hive_partitions():
+    assert hive_partitions("/data/year=2024/month=01/part-0.parquet") == {
+        "year": "2024",
+        "month": "01",
+    }
+    assert hive_partitions(
+        "/data/key=__HIVE_DEFAULT_PARTITION__/part-0.parquet"
+    ) == {"key": None}
+
+
+def test_parquet_files_not_found(tmp_dir_path: Path):
+    assert parquet_files(tmp_dir_path / "missing.parquet") == []
+    with pytest.raises(FileNotFoundError):
+        footer_partial_statistics(
+            tmp_dir_path / "missing.parquet",
+            get_data_schema(pl.DataFrame({"a": [1]})),
+        )
@@ -0,0 +1,227 @@
+import shutil
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import pytest
+
+from pymetagen import partition_index as partition_index_module
+from pymetagen.dataloader import DataLoader, LazyDataLoader
+from pymetagen.exceptions import FileTypeUnsupportedError
+from pymetagen.partition_index import (
+    PartitionIndex,
+    PartitionRange,
+    is_hidden,
+    partition_filter,
+    partition_index,
+    partition_index_path,
+)
+
+
+@pytest.fixture
+def dataset(tmp_dir_path: Path, test_data_dir: Path) -> Path:
+    """
+    A copy of the hive partitioned test dataset, with hidden and non parquet
+    files.
+    """
+    root = tmp_dir_path / "dataset"
+    shutil.copytree(test_data_dir / "input_ab_partition", root)
+    (root / "_SUCCESS").touch()
+    (root / "a=1" / "b=2" / ".part-0.parquet.crc").touch()
+    (root / "a=1" / "b=2" / "notes.txt").touch()
+    (root / "_temporary" / "a=9").mkdir(parents=True)
+    pl.DataFrame({"c": [0]}).write_parquet(
+        root / "_temporary" / "a=9" / "part-0.parquet"
+    )
+    return root
+
+
+@pytest.fixture
+def listed_directories(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """
+    Records the directories listed by the partition index.
+    """
+    listed: list[Path] = []
+    list_directory = partition_index_module._list_directory
+
+    def record(path: Path, mtime_ns: int):
+        listed.append(path)
+        return list_directory(path, mtime_ns)
+
+    monkeypatch.setattr(partition_index_module, "_list_directory", record)
+    return listed
+
+
+def test_is_hidden():
+    assert is_hidden("_SUCCESS")
+    assert is_hidden(".part-0.parquet.crc")
+    assert not is_hidden("a=1")
+
+
+def test_partition_index(dataset: Path):
+    index = PartitionIndex.build(dataset)
+    paths = index.paths()
+
+    assert [path.relative_to(dataset).parent.as_posix() for path in paths] == [
+        "a=1/b=2",
+        "a=4/b=5",
+        "a=7/b=8",
+    ]
+    files = index.files()
+    assert files.columns == ["file", "size", "mtime_ns"]
+    assert files["file"].to_list() == [str(path) for path in paths]
+    assert files["size"].to_list() == [path.stat().st_size for path in paths]
+    assert index.partition_values().to_dict(as_series=False) == {
+        "a": ["1", "4", "7"],
+        "b": ["2", "5", "8"],
+    }
+
+
+@pytest.mark.parametrize(
+    "partitions, expected",
+    [
+        ({"a": 4}, ["a=4/b=5"]),
+        ({"a": "4", "b": [5, 8]}, ["a=4/b=5"]),
+        ({"a": ["1", "7"]}, ["a=1/b=2", "a=7/b=8"]),
+        ({"a": []}, []),
+        ({"a": PartitionRange(2, 7)}, ["a=4/b=5", "a=7/b=8"]),
+        ({"b": PartitionRange(high="5")}, ["a=1/b=2", "a=4/b=5"]),
+        ({"a": PartitionRange(low=10)}, []),
+    ],
+)
+def test_partition_index_select_partitions(
+    dataset: Path, partitions: dict[str, Any], expected: list[str]
+):
+    paths = PartitionIndex.build(dataset).paths(partitions)
+    assert [
+        path.relative_to(dataset).parent.as_posix() for path in paths
+    ] == expected
+
+
+def test_partition_filter():
+    values = pl.DataFrame(
+        {
+            "month": ["01", "02", "10", None],
+            "day": ["2024-10-09", "2024-10-10", "2024-10-16", "2024-10-17"],
+        }
+    )
+
+    def selected(partitions: dict[str, Any]) -> list[bool]:
+        return (
+            values.select(partition_filter(partitions)).to_series().to_list()
+        )
+
+    # numbers are compared as numbers, other values as strings
+    assert selected({"month": 1}) == [True, False, False, False]
+    assert selected({"month": PartitionRange("2", "12")}) == [
+        False,
+        True,
+        True,
+        False,
+    ]
+    assert selected({"day": PartitionRange("2024-10-10", "2024-10-16")}) == [
+        False,
+        True,
+        True,
+        False,
+    ]
+
+
+def test_partition_index_unknown_partition(dataset: Path):
+    with pytest.raises(ValueError, match="Unknown partition keys"):
+        PartitionIndex.build(dataset).paths({"year": 2024})
+
+
+def test_partition_index_without_files(tmp_dir_path: Path):
+    files = PartitionIndex.build(tmp_dir_path).files()
+    assert files.is_empty()
+    assert files.columns == ["file", "size", "mtime_ns"]
+
+
+def test_partition_index_refresh(
+    dataset: Path, tmp_dir_path: Path, listed_directories: list[Path]
+):
+    index_dir = tmp_dir_path / "index"
+    index = partition_index(dataset, index_dir)
+    assert partition_index_path(dataset, index_dir).exists()
+    number_of_directories = len(index.directories)
+    assert len(listed_directories) == number_of_directories
+
+    listed_directories.clear()
+    assert partition_index(dataset, index_dir).paths() == index.paths()
+    assert listed_directories == []
+
+    (dataset / "a=4" / "b=6").mkdir()
+    pl.DataFrame({"c": [0]}).write_parquet(
+        dataset / "a=4" / "b=6" / "part-0.parquet"
+    )
+    (dataset / "a=7" / "b=8" / "extra.parquet").write_bytes(b"data")
+    listed_directories.clear()
+    refreshed = partition_index(dataset, index_dir)
+    assert sorted(listed_directories) == [
+        dataset / "a=4",
+        dataset / "a=4" / "b=6",
+        dataset / "a=7" / "b=8",
+    ]
+    assert len(refreshed.paths()) == len(index.paths()) + 2
+
+    listed_directories.clear()
+    partition_index(dataset, index_dir, rebuild=True)
+    assert len(listed_directories) == number_of_directories + 1
+
+
+def test_partition_index_unreadable_manifest(
+    dataset: Path, tmp_dir_path: Path
+):
+    index_dir = tmp_dir_path / "index"
+    index_dir.mkdir()
+    partition_index_path(dataset, index_dir).write_text("not a manifest")
+
+    index = partition_index(dataset, index_dir)
+    assert len(index.paths()) == 3
+    manifest = PartitionIndex.read(
+        dataset, partition_index_path(dataset, index_dir)
+    )
+    assert manifest is not None
+    assert manifest.directories == index.directories
+
+
+@pytest.mark.parametrize("loader_class", [DataLoader, LazyDataLoader])
+def test_load_partitioned_parquet_from_index(
+    loader_class: type[DataLoader],
+    dataset: Path,
+    tmp_dir_path: Path,
+    listed_directories: list[Path],
+):
+    index_dir = tmp_dir_path / "index"
+    partition_index(dataset, index_dir)
+    listed_directories.clear()
+
+    data = loader_class(dataset, partition_index_dir=index_dir)()
+    if isinstance(data, pl.LazyFrame):
+        data = data.collect()
+    assert listed_directories == []
+    assert data.sort("a").to_dict(as_series=False) == {
+        "c": [3, 6, 9],
+        "a": [1, 4, 7],
+        "b": [2, 5, 8],
+    }
+
+
+@pytest.mark.parametrize("loader_class", [DataLoader, LazyDataLoader])
+def test_load_selected_partitions(
+    loader_class: type[DataLoader],
+    dataset: Path,
+    input_csv_path: Path,
+    input_parquet_path: Path,
+):
+    data = loader_class(dataset, partitions={"a": PartitionRange(4)})()
+    if isinstance(data, pl.LazyFrame):
+        data = data.collect()
+    assert sorted(data["a"].to_list()) == [4, 7]
+
+    with pytest.raises(ValueError):
+        loader_class(dataset, partitions={"a": 2})()
+    for path in (input_csv_path, input_parquet_path):
+        with pytest.raises(FileTypeUnsupportedError):
+            loader_class(path, partitions={"a": 4})()
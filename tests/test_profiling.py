@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from pymetagen.profiling import MetaGenProfiler, process_peak_memory
+
+
+def test_process_peak_memory():
+    memory = process_peak_memory()
+    assert memory is None or memory > 0
+
+
+def test_profile():
+    profiler = MetaGenProfiler(number_of_rows=3)
+    query = pl.LazyFrame({"a": [1, 2, 3]}).select(pl.col("a").max())
+    with profiler.profile("Max", ["a"], query) as record:
+        query.collect()
+
+    assert profiler.records == [record]
+    assert record.metric == "Max"
+    assert record.columns == ["a"]
+    assert record.wall_time > 0
+    assert record.rows_scanned == 3
+    assert "SELECT" in record.plan
+    assert record.process_peak_memory is None or (
+        record.process_peak_memory > 0
+    )
+
+
+def test_profile_rows_scanned_and_callback():
+    recorded = []
+    profiler = MetaGenProfiler(callback=recorded.append, number_of_rows=3)
+    with profiler.profile("Min", ["a", "b"], rows_scanned=0) as record:
+        assert recorded == []
+    with profiler.profile("Max", ["a"]) as other_record:
+        other_record.rows_scanned = 2
+
+    assert recorded == [record, other_record]
+    assert [record.rows_scanned for record in recorded] == [0, 2]
+    assert record.plan is None
+
+
+def test_profile_error_is_not_recorded():
+    profiler = MetaGenProfiler()
+    with pytest.raises(ZeroDivisionError):
+        with profiler.profile("Max", ["a"]):
+            1 / 0
+    assert profiler.records == []
+
+
+def test_wall_time_by_metric_and_write(tmp_path: Path):
+    profiler = MetaGenProfiler(explain=False)
+    for metric in ("Min", "Max", "Min"):
+        with profiler.profile(metric, ["a"], pl.LazyFrame({"a": [1]})):
+            pass
+    profiler.records[1].wall_time = 10.0
+
+    assert list(profiler.wall_time_by_metric()) == ["Max", "Min"]
+    assert profiler.wall_time_by_metric()["Min"] == pytest.approx(
+        profiler.records[0].wall_time + profiler.records[2].wall_time
+    )
+
+    path = tmp_path / "profile.json"
+    profiler.write(path)
+    profile = json.loads(path.read_text())
+    assert profile["wall_time_by_metric"]["Max"] == 10.0
+    assert [record["metric"] for record in profile["records"]] == [
+        "Min",
+        "Max",
+        "Min",
+    ]
@@ -0,0 +1,121 @@
+import os
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from pymetagen.result_cache import (
+    MetadataResultCache,
+    default_result_cache_dir,
+    input_fingerprint,
+    result_cache_key,
+)
+
+
+@pytest.fixture
+def metadata() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "Name": ["a", "b"],
+            "Type": ["integer", "string"],
+            "Values": ["[1, 2]", None],
+        }
+    )
+
+
+def test_default_result_cache_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("PYMETAGEN_CACHE_DIR", str(tmp_path))
+    assert default_result_cache_dir() == tmp_path
+
+    monkeypatch.delenv("PYMETAGEN_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_result_cache_dir() == tmp_path / "pymetagen"
+
+
+def test_input_fingerprint(tmp_path: Path):
+    file = tmp_path / "data.csv"
+    file.write_text("a\n1\n")
+    fingerprint = input_fingerprint(file)
+    hashed_fingerprint = input_fingerprint(file, hash_content=True)
+
+    assert [key["size"] for key in fingerprint] == [4]
+    assert "sha256" not in fingerprint[0]
+    assert len(hashed_fingerprint[0]["sha256"]) == 64
+
+    stat = file.stat()
+    file.write_text("a\n2\n")
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    # same size and modification time, only the content hash changes
+    assert input_fingerprint(file) == fingerprint
+    assert input_fingerprint(file, hash_content=True) != hashed_fingerprint
+
+
+def test_input_fingerprint_partitioned(tmp_path: Path):
+    for partition in ("a=1", "a=2"):
+        (tmp_path / partition).mkdir()
+        (tmp_path / partition / "part-0.parquet").write_bytes(b"data")
+
+    fingerprint = input_fingerprint(tmp_path)
+    assert [Path(key["file"]).parent.name for key in fingerprint] == [
+        "a=1",
+        "a=2",
+    ]
+
+
+def test_result_cache_key():
+    fingerprint = [{"file": "data.csv", "size": 4, "mtime_ns": 1}]
+    key = result_cache_key(fingerprint, {"metrics": None})
+
+    assert key == result_cache_key(fingerprint, {"metrics": None})
+    assert key != result_cache_key(fingerprint, {"metrics": ["Min"]})
+    assert key != result_cache_key(
+        [{**fingerprint[0], "mtime_ns": 2}], {"metrics": None}
+    )
+
+
+class TestMetadataResultCache:
+    def test_get_put(self, tmp_path: Path, metadata: pl.DataFrame):
+        cache = MetadataResultCache(tmp_path / "cache")
+        assert cache.get("key") is None
+
+        cache.put("key", metadata)
+        assert cache.get("key").equals(metadata)
+        assert (
+            MetadataResultCache(tmp_path / "cache").get("key").equals(metadata)
+        )
+
+    def test_corrupted_entry(self, tmp_path: Path, metadata: pl.DataFrame):
+        cache = MetadataResultCache(tmp_path)
+        cache.put("key", metadata)
+        (tmp_path / "key.arrow").write_bytes(b"corrupted")
+        assert cache.get("key") is None
+
+    def test_evicts_least_recently_used(
+        self, tmp_path: Path, metadata: pl.DataFrame
+    ):
+        cache = MetadataResultCache(tmp_path)
+        for index, key in enumerate(["first", "second"]):
+            cache.put(key, metadata)
+            os.utime(tmp_path / f"{key}.arrow", ns=(index, index))
+        entry_size = (tmp_path / "first.arrow").stat().st_size
+
+        # reading "first" makes "second" the least recently used
+        cache.get("first")
+        cache.max_size = 2 * entry_size
+        cache.put("third", metadata)
+
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.get("third") is not None
+
+    def test_clear(self, tmp_path: Path, metadata: pl.DataFrame):
+        cache = MetadataResultCache(tmp_path)
+        cache.put("key", metadata)
+        cache.clear()
+        assert cache.get("key") is None
+
+    def test_invalid_max_size(self, tmp_path: Path):
+        with pytest.raises(ValueError):
+            MetadataResultCache(tmp_path, max_size=0)
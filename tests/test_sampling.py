@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from pymetagen.datatypes import MetaGenMetadataColumn
+from pymetagen.sampling import (
+    count_confidence_interval,
+    sample_size,
+    scale_sampled_metadata,
+    scaled_count,
+)
+
+
+@pytest.mark.parametrize(
+    "sample, expected",
+    [
+        (10, 10),
+        (2_000, 1_000),
+        (0.1, 100),
+        (1.0, 1_000),
+        (0.0001, 1),
+    ],
+)
+def test_sample_size(sample: int | float, expected: int):
+    assert sample_size(1_000, sample) == expected
+
+
+@pytest.mark.parametrize("sample", [0, -1, 0.0, 1.5, True, "10"])
+def test_sample_size_invalid(sample):
+    with pytest.raises(ValueError):
+        sample_size(1_000, sample)
+
+
+def test_scaled_count():
+    assert scaled_count(5, 100, 1_000) == 50
+    assert scaled_count(0, 0, 0) == 0
+
+
+def test_confidence_interval_whole_table():
+    assert count_confidence_interval(42, 100, 100) == (42, 42)
+
+
+def test_confidence_interval_bounds():
+    # 10 of the 990 rows left out of the sample can be counted at most
+    lower, upper = count_confidence_interval(989, 990, 1_000)
+    assert 989 <= lower <= upper <= 999
+
+    lower, upper = count_confidence_interval(0, 100, 1_000)
+    assert lower == 0
+    assert upper > 0
+
+
+def test_confidence_interval_coverage():
+    number_of_rows, size, proportion = 100_000, 1_000, 0.2
+    rng = np.random.default_rng(0)
+    population = rng.random(number_of_rows) < proportion
+    true_count = int(population.sum())
+
+    number_of_trials = 400
+    covered = 0
+    for _ in range(number_of_trials):
+        sample = rng.choice(population, size=size, replace=False)
+        lower, upper = count_confidence_interval(
+            int(sample.sum()), size, number_of_rows
+        )
+        covered += lower <= true_count <= upper
+    assert covered / number_of_trials == pytest.approx(0.95, abs=0.03)
+
+
+def test_scale_sampled_metadata():
+    metadata = {
+        MetaGenMetadataColumn.NUMBER_NULLS: {"a": 1, "b": 0},
+        MetaGenMetadataColumn.NUMBER_EMPTY_ZERO: {"a": 2, "b": 0},
+        MetaGenMetadataColumn.NUMBER_POSITIVE: {"a": 5, "b": None},
+        MetaGenMetadataColumn.NUMBER_NEGATIVE: {"a": 3, "b": None},
+        MetaGenMetadataColumn.NUMBER_UNIQUE: {"a": 7, "b": 2},
+    }
+    scaled = scale_sampled_metadata(metadata, 10, 100)
+
+    assert scaled[MetaGenMetadataColumn.NUMBER_NULLS] == {"a": 10, "b": 0}
+    assert scaled[MetaGenMetadataColumn.NUMBER_POSITIVE] == {
+        "a": 50,
+        "b": None,
+    }
+    assert scaled[MetaGenMetadataColumn.NUMBER_UNIQUE] == {"a": 7, "b": 2}
+    lower, upper = scaled[MetaGenMetadataColumn.NUMBER_POSITIVE_CI]["a"]
+    assert lower < 50 < upper
+    assert scaled[MetaGenMetadataColumn.NUMBER_POSITIVE_CI]["b"] is None
+    assert metadata[MetaGenMetadataColumn.NUMBER_NULLS] == {"a": 1, "b": 0}
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+import pytest
+
+from pymetagen.sketches import KLL, HyperLogLog, hyperloglog_precision, kll_k
+
+
+@pytest.mark.parametrize(
+    ["relative_error", "expected_precision"],
+    [[0.1, 7], [0.01, 14], [0.005, 16], [0.5, 4], [0.0001, 18]],
+)
+def test_hyperloglog_precision(relative_error: float, expected_precision: int):
+    assert hyperloglog_precision(relative_error) == expected_precision
+
+
+@pytest.mark.parametrize("relative_error", [0, 1, -0.1])
+def test_hyperloglog_precision_invalid_error(relative_error: float):
+    with pytest.raises(ValueError):
+        hyperloglog_precision(relative_error)
+
+
+class TestHyperLogLog:
+    @pytest.mark.parametrize("number_of_values", [0, 1, 7, 100])
+    def test_small_cardinalities_are_exact(self, number_of_values: int):
+        values = pl.Series("values", np.arange(number_of_values))
+        sketch = HyperLogLog().update(values)
+        assert sketch.estimate() == number_of_values
+
+    @pytest.mark.parametrize("precision", [10, 14])
+    def test_estimate_within_error(self, precision: int):
+        number_of_values = 200_000
+        values = pl.Series("values", np.arange(number_of_values))
+        sketch = HyperLogLog(precision=precision).update(values)
+        assert sketch.estimate() == pytest.approx(
+            number_of_values, rel=3 * sketch.relative_error
+        )
+
+    def test_ignores_nulls_and_duplicates(self):
+        values = pl.Series("values", ["a", "b", None, "a", None, "c"])
+        assert HyperLogLog().update(values).estimate() == 3
+
+    def test_merge(self):
+        left = HyperLogLog().update(pl.Series("values", np.arange(0, 60_000)))
+        right = HyperLogLog().update(
+            pl.Series("values", np.arange(40_000, 100_000))
+        )
+        union = HyperLogLog().update(pl.Series("values", np.arange(100_000)))
+
+        merged = left.merge(right)
+
+        np.testing.assert_array_equal(merged.registers, union.registers)
+        assert merged.estimate() == union.estimate()
+
+    def test_merge_different_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+    @pytest.mark.parametrize("precision", [3, 19])
+    def test_invalid_precision(self, precision: int):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=precision)
+
+
+def test_hyperloglog_bytes_round_trip():
+    sketch = HyperLogLog(precision=8).update(pl.Series("values", range(500)))
+    restored = HyperLogLog.from_bytes(sketch.to_bytes())
+    assert restored.precision == 8
+    assert restored.estimate() == sketch.estimate()
+
+
+@pytest.mark.parametrize(
+    ["rank_error", "expected_k"], [[0.01, 330], [0.05, 66], [0.9, 8]]
+)
+def test_kll_k(rank_error: float, expected_k: int):
+    assert kll_k(rank_error) == expected_k
+
+
+@pytest.mark.parametrize("rank_error", [0, 1, 2])
+def test_kll_k_invalid_error(rank_error: float):
+    with pytest.raises(ValueError):
+        kll_k(rank_error)
+
+
+class TestKLL:
+    quantiles = [0.01, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+    def ranks(self, values: np.ndarray, estimates: list) -> np.ndarray:
+        return np.searchsorted(np.sort(values), estimates) / len(values)
+
+    def test_small_inputs_are_exact(self):
+        values = np.arange(100, dtype=np.float64)
+        sketch = KLL(k=200).update(values)
+        assert sketch.quantiles(self.quantiles) == [
+            float(np.quantile(values, q, method="inverted_cdf"))
+            for q in self.quantiles
+        ]
+
+    @pytest.mark.parametrize("rank_error", [0.05, 0.01])
+    def test_rank_error(self, rank_error: float):
+        values = np.random.default_rng(0).lognormal(size=200_000)
+        sketch = KLL(k=kll_k(rank_error))
+        for chunk in np.array_split(values, 10):
+            sketch.update(chunk)
+
+        assert sketch.count == len(values)
+        assert sum(map(len, sketch.compactors)) < 4 * sketch.k
+        np.testing.assert_allclose(
+            self.ranks(values, sketch.quantiles(self.quantiles)),
+            self.quantiles,
+            atol=rank_error,
+        )
+
+    def test_merge(self):
+        values = np.random.default_rng(1).normal(size=100_000)
+        sketches = [
+            KLL(k=kll_k(0.01)).update(chunk)
+            for chunk in np.array_split(values, 7)
+        ]
+        merged = sketches[0]
+        for sketch in sketches[1:]:
+            merged.merge(sketch)
+
+        assert merged.count == len(values)
+        np.testing.assert_allclose(
+            self.ranks(values, merged.quantiles(self.quantiles)),
+            self.quantiles,
+            atol=0.01,
+        )
+
+    def test_merge_different_k(self):
+        with pytest.raises(ValueError):
+            KLL(k=10).merge(KLL(k=20))
+
+    def test_empty_and_nan(self):
+        assert KLL().quantile(0.5) is None
+        assert KLL().update([np.nan, 1.0, np.nan]).quantile(0.5) == 1.0
+
+    def test_bytes_round_trip(self):
+        sketch = KLL(k=20).update(np.arange(1_000))
+        restored = KLL.from_bytes(sketch.to_bytes())
+        assert restored.k == 20
+        assert restored.quantiles(self.quantiles) == sketch.quantiles(
+            self.quantiles
+        )
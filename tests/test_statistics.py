@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from pymetagen.statistics import (
+    PartialColumnStatistics,
+    merge_partial_statistics,
+    partial_statistics,
+    streaming_partial_statistics,
+)
+from pymetagen.utils import get_data_schema
+
+PRECISION = 12
+
+
+@pytest.fixture
+def df() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "integer": [3, -1, 0, None, 7, 2, 2, -5],
+            "float": [0.5, None, 1.5, -2.0, 0.0, 4.25, None, 3.0],
+            "string": ["a", "bb", None, "ccc", "a", "", "bb", "a"],
+            "all_nulls": [None] * 8,
+        }
+    )
+
+
+def chunks(df: pl.DataFrame, size: int) -> list[pl.DataFrame]:
+    return list(df.iter_slices(size))
+
+
+class TestPartialColumnStatistics:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 5])
+    def test_merge_matches_whole_data(self, df: pl.DataFrame, chunk_size):
+        schema = get_data_schema(df)
+        whole = partial_statistics(df, schema, PRECISION)
+        merged = merge_partial_statistics(
+            partial_statistics(chunk, schema, PRECISION)
+            for chunk in chunks(df, chunk_size)
+        )
+
+        for column in df.columns:
+            expected, result = whole[column], merged[column]
+            assert result.count == expected.count
+            assert result.null_count == expected.null_count
+            assert result.minimum == expected.minimum
+            assert result.maximum == expected.maximum
+            assert result.zero_count == expected.zero_count
+            assert result.positive_count == expected.positive_count
+            assert result.negative_count == expected.negative_count
+            assert result.min_length == expected.min_length
+            assert result.max_length == expected.max_length
+            assert result.number_of_unique == expected.number_of_unique
+            assert result.std == pytest.approx(expected.std)
+
+    def test_welford_variance(self, df: pl.DataFrame):
+        merged = merge_partial_statistics(
+            partial_statistics(chunk, get_data_schema(df), PRECISION)
+            for chunk in chunks(df, 2)
+        )
+        for column in ["integer", "float"]:
+            assert merged[column].mean == pytest.approx(df[column].mean())
+            assert merged[column].std == pytest.approx(df[column].std())
+
+    def test_values_overflow(self):
+        first = PartialColumnStatistics(values=[1, 2], max_values=3)
+        second = PartialColumnStatistics(values=[2, None], max_values=3)
+        assert first.merge(second).values is None
+
+    def test_values_are_merged(self):
+        first = PartialColumnStatistics(values=[1, 2], max_values=4)
+        second = PartialColumnStatistics(values=[2, None], max_values=4)
+        assert first.merge(second).values == [1, 2, None]
+
+    def test_nan_values_are_merged(self):
+        nan = float("nan")
+        df = pl.DataFrame({"float": [1.0, nan, 2.0] * 4})
+        schema = get_data_schema(df)
+        merged = merge_partial_statistics(
+            partial_statistics(chunk, schema, PRECISION)
+            for chunk in chunks(df, 3)
+        )["float"]
+
+        assert merged.number_of_unique == 3
+        assert merged.values is not None
+        assert len(merged.values) == 3
+        assert sum(value != value for value in merged.values) == 1
+
+    def test_std_needs_two_values(self):
+        statistics = PartialColumnStatistics(count=1, mean=1.0, m2=0.0)
+        assert statistics.std is None
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_streaming_partial_statistics(df: pl.DataFrame, lazy: bool):
+    schema = get_data_schema(df)
+    partials = streaming_partial_statistics(
+        df.lazy() if lazy else df, schema, PRECISION, chunk_size=3
+    )
+    assert partials["integer"].count == df.height
+    assert partials["integer"].negative_count == 2
+    assert partials["string"].values is not None
+    assert sorted(partials["string"].values, key=str) == sorted(
+        df["string"].unique().to_list(), key=str
+    )
+    assert partials["all_nulls"].null_count == df.height
+
+
+def test_streaming_partial_statistics_empty_data(df: pl.DataFrame):
+    empty = df.clear()
+    partials = streaming_partial_statistics(
+        empty, get_data_schema(empty), PRECISION
+    )
+    assert set(partials) == set(df.columns)
+    assert all(partial.count == 0 for partial in partials.values())
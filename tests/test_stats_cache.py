@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import datetime
+import os
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from pymetagen.statistics import partial_statistics
+from pymetagen.stats_cache import PartialStatisticsCache
+from pymetagen.utils import get_data_schema
+
+PRECISION = 10
+
+
+@pytest.fixture
+def df() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "integer": [3, -1, None, 7],
+            "string": ["a", "bb", None, "a"],
+            "category": pl.Series(["x", "y", "x", None], dtype=pl.Categorical),
+            "date": [
+                datetime.date(2024, 1, 1),
+                None,
+                datetime.date(2023, 5, 6),
+                datetime.date(2024, 2, 3),
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def data_file(df: pl.DataFrame, tmp_dir_path: Path) -> Path:
+    path = tmp_dir_path / "data.parquet"
+    df.write_parquet(path)
+    return path
+
+
+def test_round_trip(df: pl.DataFrame, data_file: Path, tmp_dir_path: Path):
+    schema = get_data_schema(df)
+    cache_path = tmp_dir_path / "cache.parquet"
+    partials = partial_statistics(df, schema, PRECISION, quantile_k=20)
+
+    cache = PartialStatisticsCache(
+        cache_path, schema, PRECISION, quantile_k=20
+    )
+    assert cache.get(data_file) is None
+    cache.put(data_file, partials)
+    cache.save()
+
+    cached = PartialStatisticsCache(
+        cache_path, schema, PRECISION, quantile_k=20
+    ).get(data_file)
+    assert cached is not None
+    for column in df.columns:
+        assert cached[column].to_dict() == partials[column].to_dict()
+        assert cached[column].sketch.registers.tolist() == (
+            partials[column].sketch.registers.tolist()
+        )
+    assert cached["integer"].quantile_sketch.quantile(0.5) == 3.0
+
+
+def test_changed_file_is_not_cached(
+    df: pl.DataFrame, data_file: Path, tmp_dir_path: Path
+):
+    schema = get_data_schema(df)
+    cache = PartialStatisticsCache(
+        tmp_dir_path / "cache.parquet", schema, PRECISION
+    )
+    cache.put(data_file, partial_statistics(df, schema, PRECISION))
+
+    stat = os.stat(data_file)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.get(data_file) is None
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"precision": PRECISION + 1},
+        {"max_number_of_unique_to_show": 3},
+        {"quantile_k": 100},
+    ],
+)
+def test_other_settings_are_not_cached(
+    df: pl.DataFrame, data_file: Path, tmp_dir_path: Path, settings
+):
+    schema = get_data_schema(df)
+    cache_path = tmp_dir_path / "cache.parquet"
+    cache = PartialStatisticsCache(cache_path, schema, PRECISION)
+    cache.put(data_file, partial_statistics(df, schema, PRECISION))
+    cache.save()
+
+    arguments = {"precision": PRECISION, **settings}
+    assert (
+        PartialStatisticsCache(cache_path, schema, **arguments).get(data_file)
+        is None
+    )
+
+
+def test_other_schema_is_ignored(
+    df: pl.DataFrame, data_file: Path, tmp_dir_path: Path
+):
+    schema = get_data_schema(df)
+    cache_path = tmp_dir_path / "cache.parquet"
+    cache = PartialStatisticsCache(cache_path, schema, PRECISION)
+    cache.put(data_file, partial_statistics(df, schema, PRECISION))
+    cache.save()
+
+    other_schema = get_data_schema(df.with_columns(pl.col("integer") * 1.0))
+    assert (
+        PartialStatisticsCache(cache_path, other_schema, PRECISION).get(
+            data_file
+        )
+        is None
+    )
+
+
+def test_deleted_files_are_dropped(
+    df: pl.DataFrame, data_file: Path, tmp_dir_path: Path
+):
+    schema = get_data_schema(df)
+    cache_path = tmp_dir_path / "cache.parquet"
+    other_file = tmp_dir_path / "other.parquet"
+    deleted_file = tmp_dir_path / "deleted.parquet"
+
+    cache = PartialStatisticsCache(cache_path, schema, PRECISION)
+    for path in [data_file, other_file, deleted_file]:
+        df.write_parquet(path)
+        cache.put(path, partial_statistics(df, schema, PRECISION))
+    cache.save()
+
+    # a run reading only some of the files keeps the entries of the others
+    deleted_file.unlink()
+    cache = PartialStatisticsCache(cache_path, schema, PRECISION)
+    assert cache.get(data_file) is not None
+    cache.save()
+
+    cache = PartialStatisticsCache(cache_path, schema, PRECISION)
+    assert cache.get(other_file) is not None
+    assert str(deleted_file.resolve()) not in cache.entries
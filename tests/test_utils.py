@@ -13,10 +13,12 @@ from pymetagen.utils import (
     CustomDecoder,
     CustomEncoder,
     InspectionMode,
+    for_each_batch,
     get_data_schema,
     get_nested_path,
     map_inspection_modes,
     map_string_to_list_inspection_modes,
+    select_columns,
     selectively_update_dict,
 )
 
@@ -259,3 +261,35 @@ class TestMetaGenUtilsFunctions:
         schema = get_data_schema(df=df)
         assert schema.columns == ["a", "b", "c"]
         assert schema.dtypes == [pl.Int64, pl.Int64, pl.Int64]
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    @pytest.mark.parametrize("chunk_size", [1, 3, 4, 100])
+    def test_for_each_batch(self, lazy: bool, chunk_size: int):
+        df = pl.DataFrame({"a": range(10), "b": [str(i) for i in range(10)]})
+        batches: list[pl.DataFrame] = []
+        for_each_batch(df.lazy() if lazy else df, batches.append, chunk_size)
+
+        assert all(batch.height <= chunk_size for batch in batches)
+        assert pl.concat(batches).equals(df)
+
+    def test_for_each_batch_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            for_each_batch(pl.DataFrame({"a": [1]}), print, chunk_size=0)
+
+    @pytest.mark.parametrize(
+        "patterns, expected",
+        [
+            (["price_eur"], ["price_eur"]),
+            (["price_*"], ["price_eur", "price_usd"]),
+            (["^.*_usd$"], ["price_usd", "cost_usd"]),
+            (["cost_usd", "id"], ["id", "cost_usd"]),
+            (["price_[e]ur", "price_*"], ["price_eur", "price_usd"]),
+        ],
+    )
+    def test_select_columns(self, patterns: list[str], expected: list[str]):
+        columns = ["id", "price_eur", "price_usd", "cost_usd"]
+        assert select_columns(columns, patterns) == expected
+
+    def test_select_columns_no_match(self):
+        with pytest.raises(ValueError, match="missing"):
+            select_columns(["a", "b"], ["a", "missing"])
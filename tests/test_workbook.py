@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import openpyxl
+import polars as pl
+import pytest
+
+from pymetagen import MetaGen
+from pymetagen.dataloader import DataLoader, default_excel_engine
+from pymetagen.datatypes import MetaGenExcelEngine, MetaGenExecutionMode
+from pymetagen.exceptions import FileTypeUnsupportedError
+from pymetagen.workbook import (
+    profile_workbook,
+    sheet_metadata_path,
+    write_workbook_metadata,
+)
+
+
+def test_default_excel_engine(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "pymetagen.dataloader.find_spec", lambda name: object()
+    )
+    assert default_excel_engine() == MetaGenExcelEngine.CALAMINE
+    monkeypatch.setattr("pymetagen.dataloader.find_spec", lambda name: None)
+    assert default_excel_engine() == MetaGenExcelEngine.OPENPYXL
+    assert (
+        DataLoader("data.xlsx").polars_read_excel_options["engine"]
+        == "openpyxl"
+    )
+
+
+def test_load_excel_sheets(
+    input_workbook_path: Path, eager_data: pl.DataFrame
+):
+    loader = DataLoader(input_workbook_path, excel_engine="openpyxl")
+    sheets = loader.load_excel_sheets()
+
+    assert list(sheets) == ["Sales 2024", "Empty", "Stock"]
+    assert sheets["Sales 2024"].equals(eager_data)
+    assert sheets["Empty"].width == 0
+    assert list(loader.load_excel_sheets(["Stock"])) == ["Stock"]
+
+
+@pytest.mark.parametrize(
+    "execution",
+    [MetaGenExecutionMode.SEQUENTIAL, MetaGenExecutionMode.FUSED],
+)
+def test_profile_workbook(
+    input_workbook_path: Path,
+    eager_data: pl.DataFrame,
+    execution: MetaGenExecutionMode,
+):
+    metagens = profile_workbook(
+        input_workbook_path,
+        excel_engine=MetaGenExcelEngine.OPENPYXL,
+        workers=2,
+        execution=execution,
+    )
+
+    # the empty sheet has no columns to describe
+    assert list(metagens) == ["Sales 2024", "Stock"]
+    assert metagens["Sales 2024"].polars_metadata.equals(
+        MetaGen(data=eager_data, execution=execution).compute_polars_metadata()
+    )
+    assert metagens["Stock"].polars_metadata["Name"].to_list() == [
+        "integer",
+        "float",
+        "string",
+    ]
+
+
+def test_profile_workbook_sheet_names(input_workbook_path: Path):
+    metagens = profile_workbook(
+        input_workbook_path, sheet_names=["Stock"], excel_engine="openpyxl"
+    )
+    assert list(metagens) == ["Stock"]
+
+
+def test_profile_workbook_unsupported(input_csv_path: Path):
+    with pytest.raises(FileTypeUnsupportedError):
+        profile_workbook(input_csv_path)
+
+
+def test_sheet_metadata_path():
+    assert sheet_metadata_path(Path("out/meta.csv"), "Sales 2024") == Path(
+        "out/meta_Sales_2024.csv"
+    )
+
+
+def test_write_workbook_metadata(
+    input_workbook_path: Path, tmp_dir_path: Path
+):
+    metagens = profile_workbook(input_workbook_path, excel_engine="openpyxl")
+
+    paths = write_workbook_metadata(metagens, tmp_dir_path / "meta.xlsx")
+    assert paths == [tmp_dir_path / "meta.xlsx"]
+    assert openpyxl.load_workbook(paths[0]).sheetnames == [
+        "Sales 2024",
+        "Stock",
+    ]
+
+    paths = write_workbook_metadata(metagens, tmp_dir_path / "meta.json")
+    assert paths == [
+        tmp_dir_path / "meta_Sales_2024.json",
+        tmp_dir_path / "meta_Stock.json",
+    ]
+    assert list(json.loads(paths[1].read_text())["fields"]) == [
+        "integer",
+        "float",
+        "string",
+    ]